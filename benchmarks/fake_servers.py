@@ -0,0 +1,783 @@
+#!/usr/bin/env python3
+"""
+Local stand-in servers for the Socrata, Census and GridStatus APIs.
+
+Each fake answers the endpoints the example helpers call, with responses
+shaped like the real services (strings for Socrata numbers, a header row for
+Census, `meta.cursor` paging for GridStatus), over a generated dataset of
+configurable size. Latency, jitter, random or rate-based 429 throttling and
+gzip are configurable, and every server counts requests, throttled
+responses, body bytes and per-request service time:
+
+    from fake_servers import StandInServers
+
+    with StandInServers(rows=200_000, latency=0.05, throttle=0.02) as servers:
+        os.environ["HTTP_HOST_OVERRIDES"] = servers.overrides()
+        ...                                   # run any example helper
+        print(servers.stats("socrata"))
+
+Or run this file to serve in the foreground and print the overrides line:
+
+    python benchmarks/fake_servers.py --rows 100000 --latency 0.1
+
+Pass `socrata_sample` (a JSON array saved from a real `/resource/<id>.json`
+response) to replay recorded rows instead of the synthetic crimes table;
+the sample is tiled up to `rows` with fresh `:id`s.
+
+Socrata queries run through `soql_local.execute`, so `$where`, `$group`,
+`$order` and the rest behave like the portal for the subset it supports.
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import multiprocessing
+import os
+import random
+import re
+import signal
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOCRATA_EXAMPLES = os.path.join(ROOT, "skills", "chicago-data-portal", "examples")
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULTS = {
+    "latency": 0.05,         # seconds before the first byte of every response
+    "jitter": 0.0,           # extra uniform random latency, seconds
+    "throttle": 0.0,         # probability that a request gets a 429
+    "rate_limit": 0.0,       # requests/second per server before 429s (0 = unlimited)
+    "retry_after": 1.0,      # Retry-After on 429 responses, seconds
+    "offset_penalty": 0.01,  # extra Socrata latency per 10,000 rows skipped with $offset
+    "gzip": False,           # compress bodies for clients that accept gzip
+    "rows": 100_000,         # Socrata dataset rows
+    "socrata_sample": None,  # JSON array of recorded rows to tile instead of synthetic rows
+    "states": 52,            # Census states (max 52)
+    "counties": 10,          # Census counties per state
+    "tracts": 20,            # Census tracts per county
+    "grid_locations": 50,    # GridStatus settlement points
+    "grid_page_size": 50_000,
+    "grid_quota": -1,        # GridStatus monthly row limit (-1 = unlimited)
+    "seed": 0,
+}
+
+# Real hosts each fake stands in for
+HOSTS = {
+    "socrata": ["data.cityofchicago.org", "datacatalog.cookcountyil.gov"],
+    "census": ["api.census.gov"],
+    "gridstatus": ["api.gridstatus.io"],
+}
+
+SOCRATA_DATASET = "bnch-0001"
+SOCRATA_MAX_LIMIT = 50_000
+SOCRATA_DEFAULT_LIMIT = 1000
+
+# A bare `*` in $select (not the one in count(*))
+STAR_RE = re.compile(r"(?<![(\w])\*(?!\s*\))")
+
+BLOCK = 64 * 1024
+
+
+def soql_engine():
+    """`soql_local` from the Chicago skill, imported only in the server process."""
+    if SOCRATA_EXAMPLES not in sys.path:
+        sys.path.insert(0, SOCRATA_EXAMPLES)
+    import soql_local
+    return soql_local
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class Stats:
+    """Request counters and service times for one server."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests = 0
+            self.throttled = 0
+            self.bytes_sent = 0
+            self.durations: List[float] = []
+
+    def record(self, seconds: float, sent: int, throttled: bool) -> None:
+        with self.lock:
+            self.requests += 1
+            self.throttled += int(throttled)
+            self.bytes_sent += sent
+            self.durations.append(seconds)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "bytes_sent": self.bytes_sent,
+                "durations": list(self.durations),
+            }
+
+
+class RateLimit:
+    """Server-side token bucket: requests beyond `rate` per second are refused."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+# --- Socrata ---------------------------------------------------------------
+
+PRIMARY_TYPES = ["THEFT", "BATTERY", "CRIMINAL DAMAGE", "ASSAULT", "DECEPTIVE PRACTICE",
+                 "OTHER OFFENSE", "NARCOTICS", "BURGLARY", "MOTOR VEHICLE THEFT", "ROBBERY"]
+PRIMARY_WEIGHTS = [0.22, 0.18, 0.11, 0.09, 0.08, 0.07, 0.07, 0.06, 0.06, 0.06]
+DESCRIPTIONS = ["SIMPLE", "$500 AND UNDER", "OVER $500", "TO VEHICLE", "DOMESTIC BATTERY SIMPLE",
+                "FINANCIAL IDENTITY THEFT", "POSS: CANNABIS 30GMS OR LESS", "FORCIBLE ENTRY"]
+STREETS = ["W MADISON ST", "N STATE ST", "S HALSTED ST", "W 63RD ST", "N CLARK ST",
+           "S COTTAGE GROVE AVE", "W CHICAGO AVE", "N MILWAUKEE AVE"]
+
+SYNTHETIC_COLUMNS = [
+    ("id", "ID", "number"),
+    ("case_number", "Case Number", "text"),
+    ("date", "Date", "calendar_date"),
+    ("block", "Block", "text"),
+    ("primary_type", "Primary Type", "text"),
+    ("description", "Description", "text"),
+    ("arrest", "Arrest", "checkbox"),
+    ("ward", "Ward", "number"),
+    ("community_area", "Community Area", "number"),
+    ("latitude", "Latitude", "number"),
+    ("longitude", "Longitude", "number"),
+    ("location", "Location", "point"),
+]
+
+
+def synthetic_crimes(rows: int, seed: int = 0) -> pd.DataFrame:
+    """A crimes-like table with Chicago's column names and value distributions."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2015-01-01")
+    seconds = np.sort(rng.integers(0, 10 * 365 * 86400, rows))
+    date = start + pd.to_timedelta(seconds, unit="s")
+    updated = date + pd.to_timedelta(rng.integers(3600, 30 * 86400, rows), unit="s")
+
+    lat = rng.uniform(41.65, 42.02, rows).round(9)
+    lon = rng.uniform(-87.94, -87.52, rows).round(9)
+    missing = rng.random(rows) < 0.01
+    lat[missing] = np.nan
+    lon[missing] = np.nan
+    location = [None if m else {"type": "Point", "coordinates": [float(x), float(y)]}
+                for m, x, y in zip(missing, lon, lat)]
+
+    ward = pd.array(rng.integers(1, 51, rows), dtype="Int64")
+    ward[rng.random(rows) < 0.005] = pd.NA
+    block_numbers = rng.integers(0, 120, rows)
+    return pd.DataFrame({
+        "id": np.arange(10_000_000, 10_000_000 + rows),
+        "case_number": [f"J{n:06d}" for n in rng.integers(0, 999_999, rows)],
+        "date": date,
+        "block": [f"{n:03d}XX {s}" for n, s in zip(block_numbers, rng.choice(STREETS, rows))],
+        "primary_type": rng.choice(PRIMARY_TYPES, rows, p=PRIMARY_WEIGHTS),
+        "description": rng.choice(DESCRIPTIONS, rows),
+        "arrest": rng.random(rows) < 0.2,
+        "ward": ward,
+        "community_area": rng.integers(1, 78, rows),
+        "latitude": lat,
+        "longitude": lon,
+        "location": location,
+        ":updated_at": updated,
+    })
+
+
+def _datatype(values: pd.Series) -> str:
+    """Guess a recorded column's Socrata datatype (the sample carries no schema)."""
+    present = values.dropna()
+    if present.map(lambda v: isinstance(v, bool)).all() and len(present):
+        return "checkbox"
+    if present.map(lambda v: isinstance(v, dict)).any():
+        return "point"
+    text = present.astype(str)
+    # Zero-padded codes (beat "0111", district "001") stay text, as on the portal
+    if len(text) and pd.to_numeric(text, errors="coerce").notna().all() and not text.str.match(r"^-?0\d").any():
+        return "number"
+    if len(text) and text.str.match(r"^\d{4}-\d{2}-\d{2}T").all():
+        return "calendar_date"
+    return "text"
+
+
+def recorded_rows(path: str, rows: int) -> Tuple[pd.DataFrame, List[Tuple[str, str, str]]]:
+    """Rows saved from a real response, tiled to `rows`, with decoded types and inferred metadata."""
+    with open(path) as f:
+        sample = pd.DataFrame(json.load(f))
+    if sample.empty:
+        raise ValueError(f"{path} has no rows")
+    sample = sample.drop(columns=[c for c in sample.columns if c.startswith(":")])
+    datatypes = {c: _datatype(sample[c]) for c in sample.columns}
+    tiled = sample.iloc[np.resize(np.arange(len(sample)), rows)].reset_index(drop=True)
+    frame = soql_engine().infer_types(tiled, datatypes)
+    columns = [(c, c.replace("_", " ").title(), datatypes[c]) for c in frame.columns]
+    frame[":updated_at"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(rows), unit="s")
+    return frame, columns
+
+
+def _json_column(values: pd.Series) -> list:
+    """A result column as Socrata's JSON renders it: numbers and dates as strings, nulls as None."""
+    missing = values.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(values):
+        out = values.astype(object)
+    elif pd.api.types.is_datetime64_any_dtype(values):
+        out = values.dt.strftime("%Y-%m-%dT%H:%M:%S.000")
+    elif pd.api.types.is_integer_dtype(values):
+        out = values.astype("string")
+    elif pd.api.types.is_numeric_dtype(values):
+        # Whole numbers print without a decimal point, like "12" rather than "12.0"
+        out = values.astype(str)
+        whole = (values % 1 == 0).fillna(False).to_numpy()
+        out[whole] = values[whole].astype("int64").astype(str)
+    else:
+        out = values
+    out = out.to_numpy(dtype=object, copy=True)
+    out[missing] = None
+    return out.tolist()
+
+
+def _csv_column(values: pd.Series, datatype: str) -> pd.Series:
+    """A column as the rows.csv export renders it."""
+    if datatype == "calendar_date":
+        return values.dt.strftime("%m/%d/%Y %I:%M:%S %p")
+    if datatype == "checkbox":
+        return values.map({True: "true", False: "false"})
+    if datatype == "point":
+        return values.map(lambda v: f"({v['coordinates'][1]}, {v['coordinates'][0]})" if isinstance(v, dict) else None)
+    return values
+
+
+class SocrataApp:
+    """`/resource/<id>.json`, `/api/views/<id>` and `/api/views/<id>/rows.csv` for one dataset."""
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.engine = soql_engine()
+        if config["socrata_sample"]:
+            table, self.columns = recorded_rows(config["socrata_sample"], config["rows"])
+        else:
+            table, self.columns = synthetic_crimes(config["rows"], config["seed"]), SYNTHETIC_COLUMNS
+        table.insert(0, ":id", [f"row-{i:08x}" for i in range(len(table))])
+        table.insert(1, ":created_at", table[":updated_at"])
+        # Rows are stored in :id order, like the portal's primary index
+        self.table = table
+        # Rendered once up front so the first export isn't slower than the rest
+        out = pd.DataFrame({name: _csv_column(table[field], datatype) for field, name, datatype in self.columns})
+        self._csv = out.to_csv(index=False).encode()
+
+    def extra_latency(self, query: Dict[str, str]) -> float:
+        """Deep `$offset`s cost the portal a scan over the skipped rows."""
+        offset = int(query.get("$offset", 0) or 0)
+        return self.config["offset_penalty"] * offset / 10_000
+
+    def respond(self, path: str, query: Dict[str, str]) -> Tuple[str, bytes]:
+        parts = path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "resource" and parts[1] == f"{SOCRATA_DATASET}.json":
+            return "application/json", self.resource(query)
+        if parts[:2] == ["api", "views"] and len(parts) >= 3 and parts[2] == SOCRATA_DATASET:
+            if len(parts) == 3:
+                return "application/json", self.metadata()
+            if parts[3:] == ["rows.csv"]:
+                return "text/csv", self.export()
+        raise NotFound(path)
+
+    def resource(self, query: Dict[str, str]) -> bytes:
+        params = {k: v for k, v in query.items() if k.startswith("$")}
+        # `*` means the dataset's columns; system fields only come back when named
+        fields = ", ".join(field for field, _, _ in self.columns)
+        params["$select"] = STAR_RE.sub(fields, params.get("$select", "*"))
+        limit = int(params.get("$limit", SOCRATA_DEFAULT_LIMIT))
+        params["$limit"] = min(limit, SOCRATA_MAX_LIMIT)
+        if params.get("$order", "").strip() == ":id":
+            del params["$order"]     # already stored in :id order
+        try:
+            result = self.engine.execute(self.table, params)
+        except (ValueError, KeyError) as exc:
+            raise BadRequest(f"query.soql.invalid: {exc}") from None
+        names = list(result.columns)
+        columns = [_json_column(result[c]) for c in names]
+        rows = [{k: v for k, v in zip(names, values) if v is not None} for values in zip(*columns)]
+        return dumps(rows)
+
+    def metadata(self) -> bytes:
+        return dumps({
+            "id": SOCRATA_DATASET,
+            "name": "Benchmark - Crimes",
+            "rowsUpdatedAt": int(self.table[":updated_at"].max().timestamp()),
+            "columns": [{"name": name, "fieldName": field, "dataTypeName": datatype}
+                        for field, name, datatype in self.columns],
+        })
+
+    def export(self) -> bytes:
+        return self._csv
+
+
+# --- Census ----------------------------------------------------------------
+
+STATES = [
+    ("01", "Alabama"), ("02", "Alaska"), ("04", "Arizona"), ("05", "Arkansas"), ("06", "California"),
+    ("08", "Colorado"), ("09", "Connecticut"), ("10", "Delaware"), ("11", "District of Columbia"),
+    ("12", "Florida"), ("13", "Georgia"), ("15", "Hawaii"), ("16", "Idaho"), ("17", "Illinois"),
+    ("18", "Indiana"), ("19", "Iowa"), ("20", "Kansas"), ("21", "Kentucky"), ("22", "Louisiana"),
+    ("23", "Maine"), ("24", "Maryland"), ("25", "Massachusetts"), ("26", "Michigan"), ("27", "Minnesota"),
+    ("28", "Mississippi"), ("29", "Missouri"), ("30", "Montana"), ("31", "Nebraska"), ("32", "Nevada"),
+    ("33", "New Hampshire"), ("34", "New Jersey"), ("35", "New Mexico"), ("36", "New York"),
+    ("37", "North Carolina"), ("38", "North Dakota"), ("39", "Ohio"), ("40", "Oklahoma"), ("41", "Oregon"),
+    ("42", "Pennsylvania"), ("44", "Rhode Island"), ("45", "South Carolina"), ("46", "South Dakota"),
+    ("47", "Tennessee"), ("48", "Texas"), ("49", "Utah"), ("50", "Vermont"), ("51", "Virginia"),
+    ("53", "Washington"), ("54", "West Virginia"), ("55", "Wisconsin"), ("56", "Wyoming"), ("72", "Puerto Rico"),
+]
+
+AGE_BANDS = ["Under 5 years", "5 to 9 years", "10 to 14 years", "15 to 17 years", "18 and 19 years",
+             "20 years", "21 years", "22 to 24 years", "25 to 29 years", "30 to 34 years", "35 to 39 years",
+             "40 to 44 years", "45 to 49 years", "50 to 54 years", "55 to 59 years", "60 and 61 years",
+             "62 to 64 years", "65 and 66 years", "67 to 69 years", "70 to 74 years", "75 to 79 years",
+             "80 to 84 years", "85 years and over"]
+
+CENSUS_TABLES = {
+    "B01001": ("SEX BY AGE", ["Total:", "Total:!!Male:"] + [f"Total:!!Male:!!{a}" for a in AGE_BANDS]
+               + ["Total:!!Female:"] + [f"Total:!!Female:!!{a}" for a in AGE_BANDS]),
+    "B01003": ("TOTAL POPULATION", ["Total"]),
+    "B19013": ("MEDIAN HOUSEHOLD INCOME IN THE PAST 12 MONTHS (IN 2022 INFLATION-ADJUSTED DOLLARS)",
+               ["Median household income in the past 12 months (in 2022 inflation-adjusted dollars)"]),
+    "B25064": ("MEDIAN GROSS RENT (DOLLARS)", ["Median gross rent"]),
+}
+
+CENSUS_DATASETS = {"acs/acs5", "acs/acs1"}
+
+# Parents a level must be requested in, as the API enforces
+CENSUS_PARENTS = {"state": [], "county": ["state"], "tract": ["state", "county"]}
+CENSUS_REQUIRED = {"tract": ["state"]}
+SUMMARY_LEVELS = {"state": "0400000US", "county": "0500000US", "tract": "1400000US"}
+
+
+def census_variables() -> dict:
+    """A `variables.json` mapping with estimate and margin-of-error variables for each table."""
+    variables = {
+        "for": {"label": "Census API FIPS 'for' clause", "concept": "Census API Geography Specification",
+                "predicateType": "fips-for", "group": "N/A"},
+        "in": {"label": "Census API FIPS 'in' clause", "concept": "Census API Geography Specification",
+               "predicateType": "fips-in", "group": "N/A"},
+        "NAME": {"label": "Geographic Area Name", "concept": "", "predicateType": "string", "group": "N/A"},
+        "GEO_ID": {"label": "Geography", "concept": "", "predicateType": "string", "group": "N/A"},
+    }
+    for table, (concept, labels) in CENSUS_TABLES.items():
+        for i, label in enumerate(labels, start=1):
+            variables[f"{table}_{i:03d}E"] = {"label": f"Estimate!!{label}", "concept": concept,
+                                               "predicateType": "int", "group": table}
+            variables[f"{table}_{i:03d}M"] = {"label": f"Margin of Error!!{label}", "concept": concept,
+                                               "predicateType": "int", "group": table}
+    return variables
+
+
+class CensusApp:
+    """`/data/<year>/<dataset>` and its `variables.json` over generated states, counties and tracts."""
+
+    def __init__(self, config: dict):
+        self.variables = census_variables()
+        self.measures = [v for v in self.variables if v[-1] in "EM" and "_" in v]
+        self.position = {v: i for i, v in enumerate(self.measures)}
+        self._variables_json = dumps({"variables": self.variables})
+
+        states = pd.DataFrame(STATES[:max(1, min(config["states"], len(STATES)))], columns=["state", "state_name"])
+        counties = states.merge(pd.DataFrame({"county": [f"{2 * k + 1:03d}" for k in range(config["counties"])]}),
+                                how="cross")
+        tracts = counties.merge(pd.DataFrame({"tract": [f"{(k + 1) * 100:06d}" for k in range(config["tracts"])]}),
+                                how="cross")
+        self.levels = {"state": states, "county": counties, "tract": tracts}
+
+    def respond(self, path: str, query: Dict[str, List[str]]) -> Tuple[str, bytes]:
+        parts = path.strip("/").split("/")
+        if len(parts) < 3 or parts[0] != "data" or not parts[1].isdigit():
+            raise NotFound(path)
+        if parts[-1] == "variables.json":
+            if "/".join(parts[2:-1]) not in CENSUS_DATASETS:
+                raise NotFound(path)
+            return "application/json", self._variables_json
+        if "/".join(parts[2:]) not in CENSUS_DATASETS:
+            raise NotFound(path)
+        return "application/json", self.data(query)
+
+    def _expand(self, names: List[str]) -> List[str]:
+        expanded = []
+        for name in names:
+            if name.startswith("group(") and name.endswith(")"):
+                table = name[6:-1]
+                if table not in CENSUS_TABLES:
+                    raise BadRequest(f"error: unknown/unsupported group '{table}'")
+                expanded += ["GEO_ID", "NAME"] + [v for v in self.measures if v.startswith(f"{table}_")]
+            elif name in self.variables and name not in ("for", "in"):
+                expanded.append(name)
+            else:
+                raise BadRequest(f"error: unknown variable '{name}'")
+        return list(dict.fromkeys(expanded))
+
+    def _geographies(self, query: Dict[str, List[str]]) -> Tuple[str, pd.DataFrame]:
+        level, _, codes = query.get("for", [""])[0].partition(":")
+        if level not in self.levels:
+            raise BadRequest(f"error: unknown/unsupported geography hierarchy '{level}'")
+        frame = self.levels[level]
+        filters = {}
+        for clause in query.get("in", []):
+            for part in clause.split():
+                parent, _, value = part.partition(":")
+                if parent not in CENSUS_PARENTS[level]:
+                    raise BadRequest(f"error: unknown/unsupported geography hierarchy '{parent}' for {level}")
+                filters[parent] = value
+        for parent in CENSUS_REQUIRED.get(level, []):
+            if filters.get(parent, "*") == "*":
+                raise BadRequest(f"error: {level} requires a specific '{parent}' in the 'in' clause")
+        filters[level] = codes or "*"
+        for column, value in filters.items():
+            if value != "*":
+                frame = frame[frame[column].isin(value.split(","))]
+        return level, frame.reset_index(drop=True)
+
+    def data(self, query: Dict[str, List[str]]) -> bytes:
+        names = self._expand(",".join(query.get("get", [""])).split(","))
+        if len([n for n in names if n in self.position]) > 50:
+            raise BadRequest("error: You can include up to 50 variables in a single query")
+        level, geos = self._geographies(query)
+        geo_columns = CENSUS_PARENTS[level] + [level]
+        geoid = geos[geo_columns].astype(str).agg("".join, axis=1) if len(geos) else pd.Series(dtype=str)
+        seed = pd.to_numeric(geoid, errors="coerce").fillna(0).to_numpy(dtype="int64") % 1_000_003
+
+        columns = []
+        for name in names:
+            if name == "NAME":
+                if level == "state":
+                    columns.append(geos["state_name"].tolist())
+                elif level == "county":
+                    columns.append((("County " + geos["county"]) + "; " + geos["state_name"]).tolist())
+                else:
+                    tract = (geos["tract"].astype(int) / 100).map("{:g}".format)
+                    columns.append(("Census Tract " + tract + "; County " + geos["county"] + "; "
+                                    + geos["state_name"]).tolist())
+            elif name == "GEO_ID":
+                columns.append((SUMMARY_LEVELS[level] + geoid).tolist())
+            else:
+                k = self.position[name] + 1
+                values = (seed * 7919 + k * 104729) % (50_000 if name.endswith("E") else 2_500) + 10
+                text = values.astype(str).astype(object)
+                # Suppressed cells, as the API reports them
+                text[(seed + k) % 211 == 0] = "-666666666"
+                columns.append(text.tolist())
+        for column in geo_columns:
+            columns.append(geos[column].tolist())
+        return dumps([names + geo_columns] + [list(row) for row in zip(*columns)])
+
+
+# --- GridStatus ------------------------------------------------------------
+
+GRID_DATASETS = {
+    "ercot_spp_real_time_15_min": {"name": "ERCOT SPP Real Time 15 Minute", "freq": "15min", "value": "spp"},
+    "ercot_load": {"name": "ERCOT Load", "freq": "5min", "value": "load"},
+}
+
+
+class GridStatusApp:
+    """`/v1/datasets[/<id>[/query]]` and `/v1/api_usage` with cursor paging over generated intervals."""
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.locations = [f"HB_{i:03d}" if i < 4 else f"LZ_{i:03d}" for i in range(config["grid_locations"])]
+        self.served = 0
+        self.lock = threading.Lock()
+
+    def respond(self, path: str, query: Dict[str, str]) -> Tuple[str, bytes]:
+        parts = path.strip("/").split("/")
+        if parts == ["v1", "api_usage"]:
+            with self.lock:
+                served = self.served
+            return "application/json", dumps({"limit": self.config["grid_quota"], "usage": served,
+                                              "period": "monthly"})
+        if parts == ["v1", "datasets"]:
+            return "application/json", dumps({"data": [self._describe(d) for d in GRID_DATASETS]})
+        if len(parts) >= 3 and parts[:2] == ["v1", "datasets"] and parts[2] in GRID_DATASETS:
+            if len(parts) == 3:
+                return "application/json", dumps(self._describe(parts[2]))
+            if parts[3:] == ["query"]:
+                return "application/json", self.query(parts[2], query)
+        raise NotFound(path)
+
+    def _columns(self, dataset: str) -> List[str]:
+        spec = GRID_DATASETS[dataset]
+        if spec["value"] == "load":
+            return ["interval_start_utc", "interval_end_utc", "load"]
+        return ["interval_start_utc", "interval_end_utc", "location", "location_type", "market", spec["value"]]
+
+    def _describe(self, dataset: str) -> dict:
+        return {"id": dataset, "name": GRID_DATASETS[dataset]["name"],
+                "all_columns": [{"name": c} for c in self._columns(dataset)]}
+
+    def query(self, dataset: str, query: Dict[str, str]) -> bytes:
+        spec = GRID_DATASETS[dataset]
+        try:
+            start = pd.Timestamp(query.get("start") or query["start_time"])
+            end = pd.Timestamp(query.get("end") or query.get("end_time") or start + pd.Timedelta(days=1))
+        except KeyError:
+            raise BadRequest("start is required") from None
+        start = start.tz_localize("UTC") if start.tzinfo is None else start.tz_convert("UTC")
+        end = end.tz_localize("UTC") if end.tzinfo is None else end.tz_convert("UTC")
+        times = pd.date_range(start.ceil(spec["freq"]), end, freq=spec["freq"], inclusive="left")
+
+        locations = self.locations if spec["value"] != "load" else [None]
+        if query.get("filter_column") == "location" and spec["value"] != "load":
+            wanted = set(query.get("filter_value", "").split(","))
+            locations = [loc for loc in locations if loc in wanted]
+
+        total = len(times) * len(locations)
+        if query.get("limit"):
+            total = min(total, int(query["limit"]))
+        page_size = min(int(query.get("page_size") or self.config["grid_page_size"]), self.config["grid_page_size"])
+        if query.get("cursor"):
+            offset = int(base64.urlsafe_b64decode(query["cursor"]).decode())
+        else:
+            offset = (int(query.get("page", 1)) - 1) * page_size
+        stop = min(total, offset + page_size)
+
+        index = np.arange(offset, max(offset, stop))
+        t = times[index // max(1, len(locations))]
+        loc = index % max(1, len(locations))
+        hours = t.hour.to_numpy() + t.minute.to_numpy() / 60
+        values = 30 + 15 * np.sin(2 * np.pi * (hours - 8) / 24) + (loc * 0.37) + (index % 7) * 0.11
+        starts = t.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        ends = (t + pd.Timedelta(spec["freq"])).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+        if spec["value"] == "load":
+            columns = [starts.tolist(), ends.tolist(), (40_000 + values * 300).round(2).tolist()]
+        else:
+            names = [locations[i] for i in loc]
+            columns = [starts.tolist(), ends.tolist(), names,
+                       ["Trading Hub" if n.startswith("HB_") else "Load Zone" for n in names],
+                       ["REAL_TIME_15_MIN"] * len(index), values.round(2).tolist()]
+        names = self._columns(dataset)
+        if query.get("json_schema") == "array-of-arrays":
+            data = [names] + [list(row) for row in zip(*columns)]
+        else:
+            data = [dict(zip(names, row)) for row in zip(*columns)]
+
+        with self.lock:
+            self.served += len(index)
+        has_next = stop < total
+        return dumps({
+            "status_code": 200,
+            "data": data,
+            "meta": {
+                "page": offset // page_size + 1,
+                "limit": int(query["limit"]) if query.get("limit") else None,
+                "page_size": page_size,
+                "hasNextPage": has_next,
+                "cursor": base64.urlsafe_b64encode(str(stop).encode()).decode() if has_next else None,
+            },
+            "dataset_metadata": self._describe(dataset),
+        })
+
+
+# --- HTTP plumbing ---------------------------------------------------------
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, app, config: dict, multi_valued: bool = False):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.app = app
+        self.config = config
+        self.multi_valued = multi_valued
+        self.stats = Stats()
+        self.rate_limit = RateLimit(config["rate_limit"])
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandInServer
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        if parts.path == "/__stats":
+            return self._send(200, "application/json", dumps(self.server.stats.snapshot()))
+        if parts.path == "/__reset":
+            self.server.stats.reset()
+            return self._send(200, "application/json", b"{}")
+
+        started = time.perf_counter()
+        config = self.server.config
+        delay = config["latency"] + random.uniform(0, config["jitter"])
+        throttled = random.random() < config["throttle"] or not self.server.rate_limit.allow()
+        headers = {}
+        if throttled:
+            status, ctype = 429, "application/json"
+            body = dumps({"error": True, "message": "Too many requests, please slow down"})
+            headers["Retry-After"] = f"{config['retry_after']:g}"
+        else:
+            query = parse_qs(parts.query, keep_blank_values=True)
+            if not self.server.multi_valued:
+                query = {k: v[-1] for k, v in query.items()}
+            try:
+                status = 200
+                ctype, body = self.server.app.respond(parts.path, query)
+                if hasattr(self.server.app, "extra_latency"):
+                    delay += self.server.app.extra_latency(query)
+            except NotFound as exc:
+                status, ctype, body = 404, "application/json", dumps({"error": True, "message": f"Not found: {exc}"})
+            except BadRequest as exc:
+                status, ctype, body = 400, "application/json", dumps({"error": True, "message": str(exc)})
+
+        time.sleep(max(0.0, delay - (time.perf_counter() - started)))
+        if config["gzip"] and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            headers["Content-Encoding"] = "gzip"
+        sent = self._send(status, ctype, body, headers)
+        self.server.stats.record(time.perf_counter() - started, sent, throttled)
+
+    def _send(self, status: int, ctype: str, body: bytes, headers: Optional[dict] = None) -> int:
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        view = memoryview(body)
+        try:
+            for start in range(0, len(body), BLOCK):
+                self.wfile.write(view[start:start + BLOCK])
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        return len(body)
+
+
+APPS: Dict[str, Tuple[Callable[[dict], object], bool]] = {
+    "socrata": (SocrataApp, False),
+    "census": (CensusApp, True),
+    "gridstatus": (GridStatusApp, False),
+}
+
+
+def serve(config: dict, ready, names: Optional[List[str]] = None) -> None:
+    """Start the stand-ins in this process and report their base URLs on `ready`; runs until killed."""
+    # Ctrl-C reaches the whole process group; the parent stops us with terminate()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    servers = {}
+    for name in names or list(APPS):
+        factory, multi_valued = APPS[name]
+        servers[name] = StandInServer(factory(config), config, multi_valued)
+    threads = [threading.Thread(target=s.serve_forever, daemon=True) for s in servers.values()]
+    for thread in threads:
+        thread.start()
+    ready.put({name: f"http://127.0.0.1:{s.server_address[1]}" for name, s in servers.items()})
+    for thread in threads:
+        thread.join()
+
+
+class StandInServers:
+    """The stand-ins in a child process, so their CPU time doesn't count against the client."""
+
+    def __init__(self, names: Optional[List[str]] = None, **config):
+        unknown = set(config) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown stand-in options: {', '.join(sorted(unknown))}")
+        self.config = {**DEFAULTS, **config}
+        self.names = names or list(APPS)
+        self.urls: Dict[str, str] = {}
+        self._process = None
+
+    def __enter__(self) -> "StandInServers":
+        context = multiprocessing.get_context("spawn")
+        ready = context.Queue()
+        self._process = context.Process(target=serve, args=(self.config, ready, self.names), daemon=True)
+        self._process.start()
+        self.urls = ready.get(timeout=300)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def overrides(self) -> str:
+        """HTTP_HOST_OVERRIDES value routing every real host to its stand-in."""
+        return ",".join(f"{host}={self.urls[name]}" for name in self.names for host in HOSTS[name])
+
+    def stats(self, name: str) -> dict:
+        with urllib.request.urlopen(f"{self.urls[name]}/__stats") as resp:
+            return json.load(resp)
+
+    def reset(self) -> None:
+        for url in self.urls.values():
+            urllib.request.urlopen(f"{url}/__reset").close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    for key, default in DEFAULTS.items():
+        flag = "--" + key.replace("_", "-")
+        if isinstance(default, bool):
+            parser.add_argument(flag, action="store_true")
+        else:
+            parser.add_argument(flag, type=type(default) if default is not None else str, default=default)
+    config = vars(parser.parse_args())
+
+    with StandInServers(**config) as servers:
+        for name, url in servers.urls.items():
+            print(f"{name:<11} {url}")
+        print(f"\nexport HTTP_HOST_OVERRIDES=\"{servers.overrides()}\"")
+        print("\nCtrl-C to stop", flush=True)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the example helpers, against local stand-in servers.
+
+Starts the fakes in `fake_servers.py`, routes the real hostnames to them with
+HTTP_HOST_OVERRIDES (see `http_client.py`), and runs each access pattern in a
+fresh process with an empty query cache. For every scenario it reports rows,
+wall time, rows/sec, requests and 429s, p50/p99 server latency, bytes sent
+and peak RSS:
+
+    python benchmarks/run.py                                  # everything, defaults
+    python benchmarks/run.py --scenarios socrata --rows 500000 --latency 0.1
+    python benchmarks/run.py --throttle 0.05 --workers 16     # size a worker pool
+    python benchmarks/run.py --json bench.json                # save results
+    python benchmarks/run.py --baseline bench.json            # exit 1 on regressions
+
+Scenarios come in pairs so one run answers "which pattern?": offset vs
+keyset paging, serial vs concurrent, JSON pages vs the CSV export, cold vs
+cached. `--list` prints them.
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Optional
+
+from fake_servers import DEFAULTS, HOSTS, SOCRATA_DATASET, StandInServers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKILL_DIRS = {
+    "socrata": os.path.join(ROOT, "skills", "chicago-data-portal", "examples"),
+    "census": os.path.join(ROOT, "skills", "us-census-data", "examples"),
+    "gridstatus": os.path.join(ROOT, "skills", "gridstatus-api", "examples"),
+}
+
+RESULT_COLUMNS = ["rows", "seconds", "rows_per_sec", "requests", "throttled",
+                  "p50_ms", "p99_ms", "mb_sent", "peak_rss_mb", "rss_growth_mb"]
+
+GRID_DATASET = "ercot_spp_real_time_15_min"
+GRID_START = "2024-01-01"
+
+SCENARIOS: Dict[str, dict] = {}
+
+
+def scenario(name: str, skill: str, description: str) -> Callable:
+    def register(func: Callable) -> Callable:
+        SCENARIOS[name] = {"func": func, "skill": skill, "description": description}
+        return func
+    return register
+
+
+class Timer:
+    """Marks the measured part of a scenario; server counters restart when it begins."""
+
+    def __init__(self, urls: Dict[str, str]):
+        self.urls = urls
+        self.seconds = 0.0
+
+    def __enter__(self) -> "Timer":
+        for url in self.urls.values():
+            urllib.request.urlopen(f"{url}/__reset").close()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.seconds = time.perf_counter() - self._start
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# --- Socrata ---------------------------------------------------------------
+
+def _domain() -> str:
+    import socrata
+    return socrata.CHICAGO
+
+
+@scenario("socrata-offset", "socrata", "query_dataset pages with $limit/$offset (ordered by :id)")
+def socrata_offset(timer: Timer, opts: dict) -> int:
+    import socrata
+    rows = 0
+    with timer:
+        offset = 0
+        while True:
+            df = socrata.query_dataset(_domain(), SOCRATA_DATASET, {
+                "$order": ":id", "$limit": opts["page_size"], "$offset": offset,
+            }, use_cache=False)
+            rows += len(df)
+            offset += opts["page_size"]
+            if len(df) < opts["page_size"]:
+                break
+    return rows
+
+
+@scenario("socrata-keyset", "socrata", "socrata.get_all_pages (keyset on :id)")
+def socrata_keyset(timer: Timer, opts: dict) -> int:
+    import socrata
+    with timer:
+        df = socrata.get_all_pages(_domain(), SOCRATA_DATASET, page_size=opts["page_size"])
+    return len(df)
+
+
+@scenario("socrata-keyset-typed", "socrata", "socrata.get_all_pages(typed=True), batch-decoded pages")
+def socrata_keyset_typed(timer: Timer, opts: dict) -> int:
+    import socrata
+    with timer:
+        df = socrata.get_all_pages(_domain(), SOCRATA_DATASET, page_size=opts["page_size"], typed=True)
+    return len(df)
+
+
+@scenario("socrata-parallel", "socrata", "socrata_parallel.fetch_parallel, ranges on :id")
+def socrata_parallel(timer: Timer, opts: dict) -> int:
+    import socrata_parallel
+    with timer:
+        df = socrata_parallel.fetch_parallel(_domain(), SOCRATA_DATASET, partitions=opts["workers"],
+                                             max_workers=opts["workers"], page_size=opts["page_size"])
+    return len(df)
+
+
+@scenario("socrata-json-max-page", "socrata", "get_all_pages with 50,000-row pages (JSON)")
+def socrata_json_max_page(timer: Timer, opts: dict) -> int:
+    import socrata
+    with timer:
+        df = socrata.get_all_pages(_domain(), SOCRATA_DATASET, page_size=socrata.MAX_PAGE_SIZE)
+    return len(df)
+
+
+@scenario("socrata-csv", "socrata", "socrata.stream_export(typed=False), CSV export in chunks")
+def socrata_csv(timer: Timer, opts: dict) -> int:
+    import socrata
+    with timer:
+        rows = sum(len(chunk) for chunk in socrata.stream_export(_domain(), SOCRATA_DATASET, typed=False))
+    return rows
+
+
+@scenario("socrata-csv-typed", "socrata", "socrata.stream_export(typed=True)")
+def socrata_csv_typed(timer: Timer, opts: dict) -> int:
+    import socrata
+    with timer:
+        rows = sum(len(chunk) for chunk in socrata.stream_export(_domain(), SOCRATA_DATASET))
+    return rows
+
+
+def _ward_queries() -> Dict[str, tuple]:
+    return {
+        f"ward_{ward}": (SOCRATA_DATASET, {
+            "$select": "primary_type, date_trunc_y(date) AS year, count(*)",
+            "$where": f"ward = {ward}",
+            "$group": "primary_type, year",
+        })
+        for ward in range(1, 51)
+    }
+
+
+@scenario("socrata-query-cold", "socrata", "50 aggregate query_dataset calls, empty cache")
+def socrata_query_cold(timer: Timer, opts: dict) -> int:
+    import socrata
+    with timer:
+        rows = sum(len(socrata.query_dataset(_domain(), dataset, params))
+                   for dataset, params in _ward_queries().values())
+    return rows
+
+
+@scenario("socrata-query-cached", "socrata", "the same 50 calls again, served from query_cache")
+def socrata_query_cached(timer: Timer, opts: dict) -> int:
+    import socrata
+    for dataset, params in _ward_queries().values():
+        socrata.query_dataset(_domain(), dataset, params)
+    with timer:
+        rows = sum(len(socrata.query_dataset(_domain(), dataset, params))
+                   for dataset, params in _ward_queries().values())
+    return rows
+
+
+@scenario("socrata-batch-serial", "socrata", "socrata_batch.run_batch, 50 queries, max_workers=1")
+def socrata_batch_serial(timer: Timer, opts: dict) -> int:
+    import socrata_batch
+    with timer:
+        results, _ = socrata_batch.run_batch(_domain(), _ward_queries(), max_workers=1, use_cache=False)
+    return sum(len(df) for df in results.values())
+
+
+@scenario("socrata-batch-concurrent", "socrata", "socrata_batch.run_batch, 50 queries, max_workers=--workers")
+def socrata_batch_concurrent(timer: Timer, opts: dict) -> int:
+    import socrata_batch
+    with timer:
+        results, _ = socrata_batch.run_batch(_domain(), _ward_queries(), max_workers=opts["workers"],
+                                             use_cache=False)
+    return sum(len(df) for df in results.values())
+
+
+# --- Census ----------------------------------------------------------------
+
+CENSUS_VARIABLES = ["NAME", "B01003_001E", "B19013_001E", "B19013_001M", "B25064_001E"]
+
+
+def _states() -> List[str]:
+    import census
+    listing = census.get_census_data(2022, "acs/acs5", ["NAME"], "state:*", use_cache=False, typed=False)
+    return sorted(listing["state"])
+
+
+@scenario("census-serial", "census", "get_census_data, counties state by state, one at a time")
+def census_serial(timer: Timer, opts: dict) -> int:
+    import census
+    census.get_census_data(2022, "acs/acs5", ["NAME"], "state:*", use_cache=False)  # loads the catalog
+    states = _states()
+    with timer:
+        frames = [census.get_census_data(2022, "acs/acs5", CENSUS_VARIABLES, "county:*", {"state": s},
+                                         use_cache=False) for s in states]
+    return sum(len(df) for df in frames)
+
+
+@scenario("census-concurrent", "census", "get_census_data, counties for all states on --workers threads")
+def census_concurrent(timer: Timer, opts: dict) -> int:
+    import census
+    census.get_census_data(2022, "acs/acs5", ["NAME"], "state:*", use_cache=False)
+    states = _states()
+    with timer:
+        with ThreadPoolExecutor(max_workers=opts["workers"]) as pool:
+            frames = list(pool.map(lambda s: census.get_census_data(
+                2022, "acs/acs5", CENSUS_VARIABLES, "county:*", {"state": s}, use_cache=False), states))
+    return sum(len(df) for df in frames)
+
+
+@scenario("census-planned-tracts", "census", "census_planner.get_census_data_planned, group(B01001) for every tract")
+def census_planned_tracts(timer: Timer, opts: dict) -> int:
+    import census_planner
+    with timer:
+        df = census_planner.get_census_data_planned(2022, "acs/acs5", ["NAME", "group(B01001)"], "tract:*",
+                                                    max_workers=opts["workers"])
+    return len(df)
+
+
+# --- GridStatus ------------------------------------------------------------
+
+class RestGridStatusClient:
+    """
+    The two `GridStatusClient` methods the wrappers use, over the documented REST API.
+
+    Requests go through `http_client`, so they share its pooling, retries and
+    rate limiting. Used unless `--gridstatus-client gridstatusio` is given.
+    """
+
+    base_url = "https://api.gridstatus.io/v1"
+
+    def __init__(self, api_key: str = "bench"):
+        self.headers = {"x-api-key": api_key}
+
+    def _get(self, path: str, params: Optional[dict] = None) -> dict:
+        import http_client
+        resp = http_client.get(f"{self.base_url}{path}", params=params, headers=self.headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    def get_api_usage(self) -> dict:
+        return self._get("/api_usage")
+
+    def get_dataset(self, dataset: str, start=None, end=None, limit: Optional[int] = None,
+                    page_size: Optional[int] = None, **query):
+        import pandas as pd
+        params = {k: str(v) for k, v in {"start": start, "end": end, "limit": limit,
+                                         "page_size": page_size, **query}.items() if v is not None}
+        frames = []
+        while True:
+            body = self._get(f"/datasets/{dataset}/query", params)
+            frames.append(pd.DataFrame(body["data"]))
+            cursor = body["meta"].get("cursor")
+            if not body["meta"].get("hasNextPage") or not cursor:
+                break
+            params["cursor"] = cursor
+        df = pd.concat(frames, ignore_index=True)
+        for col in df.columns:
+            if col.endswith("_utc"):
+                df[col] = pd.to_datetime(df[col], utc=True)
+        return df
+
+
+def _grid_client(opts: dict):
+    if opts["gridstatus_client"] == "gridstatusio":
+        from gridstatusio import GridStatusClient
+        return GridStatusClient(api_key="bench", host=f"{opts['urls']['gridstatus']}/v1")
+    return RestGridStatusClient()
+
+
+def _grid_end(opts: dict) -> str:
+    import pandas as pd
+    return str((pd.Timestamp(GRID_START) + pd.Timedelta(days=opts["grid_days"])).date())
+
+
+@scenario("gridstatus-single", "gridstatus", "one get_dataset call over the whole range (cursor paging)")
+def gridstatus_single(timer: Timer, opts: dict) -> int:
+    client = _grid_client(opts)
+    with timer:
+        df = client.get_dataset(dataset=GRID_DATASET, start=GRID_START, end=_grid_end(opts))
+    return len(df)
+
+
+@scenario("gridstatus-windows-serial", "gridstatus", "gridstatus_windows.fetch_windowed, 1-day windows, max_workers=1")
+def gridstatus_windows_serial(timer: Timer, opts: dict) -> int:
+    import gridstatus_windows
+    client = _grid_client(opts)
+    with timer:
+        df = gridstatus_windows.fetch_windowed(client, GRID_DATASET, GRID_START, _grid_end(opts), max_workers=1)
+    return len(df)
+
+
+@scenario("gridstatus-windows-concurrent", "gridstatus", "gridstatus_windows.fetch_windowed, max_workers=--workers")
+def gridstatus_windows_concurrent(timer: Timer, opts: dict) -> int:
+    import gridstatus_windows
+    client = _grid_client(opts)
+    with timer:
+        df = gridstatus_windows.fetch_windowed(client, GRID_DATASET, GRID_START, _grid_end(opts),
+                                               max_workers=opts["workers"])
+    return len(df)
+
+
+@scenario("gridstatus-store-warm", "gridstatus", "gridstatus_store.get_dataset_cached with every day already stored")
+def gridstatus_store_warm(timer: Timer, opts: dict) -> int:
+    import gridstatus_store
+    client = _grid_client(opts)
+    store = os.path.join(os.environ["QUERY_CACHE_DIR"], "gridstatus_store")
+    gridstatus_store.get_dataset_cached(client, GRID_DATASET, GRID_START, _grid_end(opts), store_dir=store)
+    with timer:
+        df = gridstatus_store.get_dataset_cached(client, GRID_DATASET, GRID_START, _grid_end(opts), store_dir=store)
+    return len(df)
+
+
+# --- runner ----------------------------------------------------------------
+
+def run_scenario(name: str, opts: dict) -> dict:
+    """Run one scenario; called in a fresh process so caches and peak RSS start clean."""
+    spec = SCENARIOS[name]
+    cache_dir = tempfile.mkdtemp(prefix="bench_cache_")
+    os.environ["QUERY_CACHE_DIR"] = cache_dir
+    os.environ["HTTP_HOST_OVERRIDES"] = ",".join(
+        f"{host}={url}" for service, url in opts["urls"].items() for host in HOSTS[service]
+    )
+    if opts["http_rate"]:
+        os.environ["HTTP_RATE"] = str(opts["http_rate"])
+    sys.path.insert(0, SKILL_DIRS[spec["skill"]])
+
+    import pandas  # noqa: F401  (counted in the baseline, not the scenario)
+    import requests  # noqa: F401
+    baseline_rss = peak_rss_mb()
+    timer = Timer({spec["skill"]: opts["urls"][spec["skill"]]})
+    try:
+        rows = spec["func"](timer, opts)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    peak = peak_rss_mb()
+
+    with urllib.request.urlopen(f"{opts['urls'][spec['skill']]}/__stats") as resp:
+        stats = json.load(resp)
+    durations = sorted(stats["durations"]) or [0.0]
+    return {
+        "scenario": name,
+        "rows": rows,
+        "seconds": round(timer.seconds, 3),
+        "rows_per_sec": round(rows / timer.seconds, 1) if timer.seconds else 0.0,
+        "requests": stats["requests"],
+        "throttled": stats["throttled"],
+        "p50_ms": round(1000 * statistics.median(durations), 1),
+        "p99_ms": round(1000 * durations[min(len(durations) - 1, int(0.99 * len(durations)))], 1),
+        "mb_sent": round(stats["bytes_sent"] / 1e6, 2),
+        "peak_rss_mb": round(peak, 1),
+        "rss_growth_mb": round(peak - baseline_rss, 1),
+    }
+
+
+def select(patterns: Optional[str]) -> List[str]:
+    """Scenario names matching comma-separated names or prefixes (e.g. "socrata,census-serial")."""
+    if not patterns:
+        return list(SCENARIOS)
+    wanted = [p.strip() for p in patterns.split(",") if p.strip()]
+    names = [n for n in SCENARIOS if any(n == p or n.startswith(p) for p in wanted)]
+    if not names:
+        raise SystemExit(f"No scenarios match {patterns!r}; see --list")
+    return names
+
+
+def print_table(results: List[dict]) -> None:
+    header = ["scenario"] + RESULT_COLUMNS
+    rows = [[str(r[c]) for c in header] for r in results]
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(header)]
+    print("  ".join(h.ljust(w) if i == 0 else h.rjust(w) for i, (h, w) in enumerate(zip(header, widths))))
+    for row in rows:
+        print("  ".join(v.ljust(w) if i == 0 else v.rjust(w) for i, (v, w) in enumerate(zip(row, widths))))
+
+
+def compare(results: List[dict], baseline_path: str, tolerance: float) -> List[str]:
+    """Scenarios whose rows/sec dropped more than `tolerance` below the baseline run."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {r["scenario"]: r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = before.get(result["scenario"])
+        if not old or not old["rows_per_sec"]:
+            continue
+        change = result["rows_per_sec"] / old["rows_per_sec"] - 1
+        if change < -tolerance:
+            regressions.append(f"{result['scenario']}: {old['rows_per_sec']:,.0f} -> "
+                               f"{result['rows_per_sec']:,.0f} rows/sec ({change:+.0%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmarks against local stand-in servers")
+    parser.add_argument("--scenarios", help="Comma-separated scenario names or prefixes (default: all)")
+    parser.add_argument("--list", action="store_true", help="List scenarios and exit")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario; the median run is reported")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrency for the concurrent scenarios")
+    parser.add_argument("--page-size", type=int, default=10_000, help="Socrata rows per page")
+    parser.add_argument("--grid-days", type=int, default=14, help="Days of GridStatus data to fetch")
+    parser.add_argument("--http-rate", type=float, help="HTTP_RATE for the client (requests/sec per host to start at)")
+    parser.add_argument("--gridstatus-client", choices=["rest", "gridstatusio"], default="rest",
+                        help="Client passed to the GridStatus wrappers")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Earlier --json output to compare rows/sec against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed rows/sec drop vs the baseline")
+    for key, default in DEFAULTS.items():
+        flag = "--" + key.replace("_", "-")
+        if isinstance(default, bool):
+            parser.add_argument(flag, action="store_true", help="Stand-in option")
+        else:
+            parser.add_argument(flag, type=type(default) if default is not None else str, default=default,
+                                help=f"Stand-in option (default: {default})")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, spec in SCENARIOS.items():
+            print(f"{name:<30} {spec['description']}")
+        return
+
+    names = select(args.scenarios)
+    server_config = {key: getattr(args, key) for key in DEFAULTS}
+    services = list(dict.fromkeys(SCENARIOS[n]["skill"] for n in names))
+    opts = {key: getattr(args, key) for key in ("workers", "page_size", "grid_days", "http_rate", "gridstatus_client")}
+
+    results = []
+    with StandInServers(services, **server_config) as servers:
+        opts["urls"] = servers.urls
+        for name in names:
+            runs = []
+            for _ in range(args.repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    runs.append(pool.submit(run_scenario, name, opts).result())
+            runs.sort(key=lambda r: r["seconds"])
+            results.append(runs[len(runs) // 2])
+            print(f"{name}: {results[-1]['rows']:,} rows in {results[-1]['seconds']:.2f}s", file=sys.stderr)
+
+    print()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": {**server_config, **{k: v for k, v in opts.items() if k != "urls"}},
+                       "results": results}, f, indent=2)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
-"""Chicago Data Portal query examples using requests + pandas."""
+"""Chicago Data Portal query examples using pandas and the shared HTTP client."""
 
-import requests
 import pandas as pd
 
+import http_client
+import socrata
+
 # Optional: Set your app token for higher rate limits
 APP_TOKEN = None  # or "your-token-here"
 HEADERS = {"X-App-Token": APP_TOKEN} if APP_TOKEN else {}
@@ -13,7 +15,7 @@ BASE_URL = "https://data.cityofchicago.org/resource"
 def query_dataset(dataset_id: str, params: dict) -> pd.DataFrame:
     """Query a Chicago dataset and return as DataFrame."""
     url = f"{BASE_URL}/{dataset_id}.json"
-    resp = requests.get(url, params=params, headers=HEADERS)
+    resp = http_client.get(url, params=params, headers=HEADERS)
     resp.raise_for_status()
     return pd.DataFrame(resp.json())
 
@@ -21,7 +23,7 @@ def query_dataset(dataset_id: str, params: dict) -> pd.DataFrame:
 def get_metadata(dataset_id: str) -> dict:
     """Fetch dataset metadata including columns."""
     url = f"https://data.cityofchicago.org/api/views/{dataset_id}"
-    resp = requests.get(url, headers=HEADERS)
+    resp = http_client.get(url, headers=HEADERS)
     resp.raise_for_status()
     return resp.json()
 
@@ -44,15 +46,9 @@ requests_by_type = query_dataset("v6vf-nfxy", {
 })
 
 # Example 3: Paginate through large results
+# Keyset pagination on :id (see socrata.py) keeps every page equally cheap,
+# unlike $offset which gets slower the deeper the pull goes.
+
 def get_all_pages(dataset_id: str, base_params: dict, page_size: int = 1000):
-    """Fetch all rows with pagination."""
-    all_data = []
-    offset = 0
-    while True:
-        params = {**base_params, "$limit": page_size, "$offset": offset}
-        df = query_dataset(dataset_id, params)
-        if df.empty:
-            break
-        all_data.append(df)
-        offset += page_size
-    return pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame()
+    """Fetch all rows with keyset pagination on :id."""
+    return socrata.get_all_pages(socrata.CHICAGO, dataset_id, base_params, page_size=page_size)
@@ -0,0 +1,180 @@
+"""Local Parquet cache for API query results.
+
+Results are stored as one Parquet file per query, keyed on a hash of
+(endpoint, dataset, normalized params), so identical calls within the TTL
+reload from disk in milliseconds instead of spending rate-limit budget:
+
+    from query_cache import cached
+
+    df = cached("census", "2022/acs/acs5", params, fetch=lambda: run_query(params))
+
+Entries older than the TTL are refetched, and the least recently used files
+are evicted once the cache grows past its size limit. Requires pyarrow
+(`pip install pyarrow`); without it queries still run, just uncached.
+
+Settings can be overridden with QUERY_CACHE_DIR, QUERY_CACHE_TTL (seconds)
+and QUERY_CACHE_MAX_MB environment variables.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+import pandas as pd
+
+CACHE_DIR = os.environ.get("QUERY_CACHE_DIR", ".query_cache")
+DEFAULT_TTL = int(os.environ.get("QUERY_CACHE_TTL", 3600))
+MAX_CACHE_BYTES = int(os.environ.get("QUERY_CACHE_MAX_MB", 500)) * 1024 * 1024
+
+_warned = False
+
+
+def normalize_params(params: Optional[dict]) -> dict:
+    """Canonical form of query params: sorted keys, trimmed string values."""
+    normalized = {}
+    for key, value in sorted((params or {}).items()):
+        if value is None:
+            continue
+        if isinstance(value, dict):
+            value = normalize_params(value)
+        elif isinstance(value, (list, tuple)):
+            value = [str(v).strip() for v in value]
+        else:
+            value = str(value).strip()
+        normalized[str(key).strip()] = value
+    return normalized
+
+
+def cache_key(endpoint: str, dataset: str, params: Optional[dict]) -> str:
+    """Stable hash identifying a query."""
+    payload = json.dumps(
+        {"endpoint": endpoint, "dataset": dataset, "params": normalize_params(params)},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _path(key: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"{key}.parquet")
+
+
+def get(key: str, ttl: int = DEFAULT_TTL, cache_dir: str = CACHE_DIR) -> Optional[pd.DataFrame]:
+    """Return the cached DataFrame for a key, or None if missing or expired."""
+    path = _path(key, cache_dir)
+    try:
+        written = os.path.getmtime(path)
+    except OSError:
+        return None
+    if time.time() - written > ttl:
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception:
+        return None
+    # Access time drives LRU eviction; keep mtime as the write time for the TTL
+    try:
+        os.utime(path, (time.time(), written))
+    except FileNotFoundError:
+        pass  # evicted by another thread or process since the read
+    return df
+
+
+def put(key: str, df: pd.DataFrame, cache_dir: str = CACHE_DIR) -> None:
+    """Store a DataFrame under a key; silently skipped if it can't be written as Parquet."""
+    global _warned
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _path(key, cache_dir)
+    # Unique per thread as well as per process: pools may write the same key at once
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df.to_parquet(tmp, index=False)
+    except ImportError:
+        if not _warned:
+            print("Warning: pyarrow not installed; query results will not be cached")
+            _warned = True
+        return
+    except (ValueError, TypeError):
+        # Mixed-type columns Parquet can't represent; just don't cache this one
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return
+    os.replace(tmp, path)
+    evict(cache_dir=cache_dir)
+
+
+def evict(max_bytes: int = MAX_CACHE_BYTES, cache_dir: str = CACHE_DIR) -> int:
+    """Delete least recently used entries until the cache fits in max_bytes; returns files removed."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(".parquet"):
+            # Concurrent evictions and `put` renames can remove or replace files under us
+            try:
+                stat = os.stat(os.path.join(cache_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, name))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+        except FileNotFoundError:
+            pass  # already evicted elsewhere; it no longer counts either way
+        total -= size
+    return removed
+
+
+def clear(cache_dir: str = CACHE_DIR) -> None:
+    """Remove every cached entry."""
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith(".parquet"):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except FileNotFoundError:
+                    pass
+
+
+def cached(
+    endpoint: str,
+    dataset: str,
+    params: Optional[dict],
+    fetch: Callable[[], pd.DataFrame],
+    ttl: int = DEFAULT_TTL,
+    refresh: bool = False,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Return a query result from the cache, calling `fetch` on a miss.
+
+    Args:
+        endpoint: API the query goes to (e.g., "census" or a portal domain)
+        dataset: Dataset identifier (e.g., "2022/acs/acs5" or "ijzp-q8t2")
+        params: Query parameters (credentials should be left out)
+        fetch: Zero-argument function that runs the query
+        ttl: Maximum age in seconds of a reusable entry
+        refresh: Skip the lookup but store the fresh result
+        use_cache: Bypass the cache entirely
+
+    Returns:
+        DataFrame from the cache or from `fetch`
+    """
+    if not use_cache:
+        return fetch()
+
+    key = cache_key(endpoint, dataset, params)
+    if not refresh:
+        hit = get(key, ttl)
+        if hit is not None:
+            return hit
+
+    df = fetch()
+    put(key, df)
+    return df
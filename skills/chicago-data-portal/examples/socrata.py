@@ -0,0 +1,274 @@
+"""Shared Socrata (SODA) helpers for the Chicago and Cook County data portals.
+
+Both portals run on Socrata, so every function takes the portal domain as its
+first argument and works against either one:
+
+    from socrata import CHICAGO, COOK_COUNTY, get_all_pages
+
+    crimes = get_all_pages(CHICAGO, "ijzp-q8t2", {"$where": "year = 2024"})
+    sales = get_all_pages(COOK_COUNTY, "wvhk-k5uv", {"$where": "sale_date >= '2024-01-01'"})
+
+Requests go through the shared client in `http_client.py` (pooled sessions,
+retries on 429/5xx, adaptive rate limiting). Run from the `examples/`
+directory (or put it on `sys.path`) to import.
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+import http_client
+import query_cache
+import socrata_decode
+from socrata_decode import convert_column
+
+CHICAGO = "data.cityofchicago.org"
+COOK_COUNTY = "datacatalog.cookcountyil.gov"
+
+# App token variables checked per portal, in order (Socrata tokens work on any portal)
+TOKEN_ENV_VARS = {
+    CHICAGO: ["CHICAGO_DATA_PORTAL_TOKEN"],
+    COOK_COUNTY: ["COOK_COUNTY_DATA_PORTAL_TOKEN", "CHICAGO_DATA_PORTAL_TOKEN"],
+}
+
+# Largest page the SODA 2.1 resource endpoints will return
+MAX_PAGE_SIZE = 50000
+
+# Socrata's cross-portal Discovery API
+CATALOG_URL = "https://api.us.socrata.com/api/catalog/v1"
+
+
+@lru_cache(maxsize=None)
+def load_app_token(domain: str) -> Optional[str]:
+    """Load the portal's app token from the environment or a .env file."""
+    names = TOKEN_ENV_VARS.get(domain, ["CHICAGO_DATA_PORTAL_TOKEN"])
+    for name in names:
+        if os.environ.get(name):
+            return os.environ[name]
+
+    env_path = os.path.join(os.getcwd(), ".env")
+    if os.path.exists(env_path):
+        with open(env_path) as f:
+            values = dict(
+                line.strip().split("=", 1) for line in f if "=" in line and not line.startswith("#")
+            )
+        for name in names:
+            if values.get(name):
+                return values[name]
+    return None
+
+
+def get_headers(domain: str) -> Dict[str, str]:
+    """Request headers for a portal, including the app token when available."""
+    token = load_app_token(domain)
+    return {"X-App-Token": token} if token else {}
+
+
+def query_dataset(
+    domain: str,
+    dataset_id: str,
+    params: dict,
+    refresh: bool = False,
+    use_cache: bool = True,
+    typed: bool = False,
+) -> pd.DataFrame:
+    """Query a dataset on a Socrata portal and return as DataFrame.
+
+    Results are cached locally (see `query_cache.py`); pass `refresh=True` to
+    re-download or `use_cache=False` to bypass the cache. With `typed=True`
+    the response is decoded in batches into numeric, datetime, boolean and
+    categorical columns using the dataset's datatypes (see `socrata_decode.py`).
+    """
+    def fetch() -> pd.DataFrame:
+        url = f"https://{domain}/resource/{dataset_id}.json"
+        if not typed:
+            resp = http_client.get(url, params=params, headers=get_headers(domain))
+            resp.raise_for_status()
+            return pd.DataFrame(resp.json())
+        datatypes = column_types(domain, dataset_id)
+        with http_client.get(url, params=params, headers=get_headers(domain), stream=True) as resp:
+            resp.raise_for_status()
+            return socrata_decode.decode_rows(socrata_decode.iter_json_rows(resp), datatypes)
+
+    # Typed and raw results of the same query are cached separately
+    endpoint = f"{domain}#typed" if typed else domain
+    return query_cache.cached(endpoint, dataset_id, params, fetch, refresh=refresh, use_cache=use_cache)
+
+
+def get_metadata(domain: str, dataset_id: str) -> dict:
+    """Fetch dataset metadata including columns."""
+    url = f"https://{domain}/api/views/{dataset_id}"
+    resp = http_client.get(url, headers=get_headers(domain))
+    resp.raise_for_status()
+    return resp.json()
+
+
+@lru_cache(maxsize=None)
+def column_types(domain: str, dataset_id: str) -> Dict[str, str]:
+    """{fieldName: dataTypeName} for a dataset, looked up once per process."""
+    columns = get_metadata(domain, dataset_id).get("columns", [])
+    return {c["fieldName"]: c.get("dataTypeName", "text") for c in columns}
+
+
+def search_datasets(domain: str, query: str, limit: int = 10) -> List[dict]:
+    """Search a portal's datasets by keyword via the Socrata Discovery API."""
+    params = {"domains": domain, "q": query, "limit": limit}
+    resp = http_client.get(CATALOG_URL, params=params, headers=get_headers(domain))
+    resp.raise_for_status()
+
+    results = []
+    for item in resp.json().get("results", []):
+        resource = item.get("resource", {})
+        results.append({
+            "name": resource.get("name"),
+            "id": resource.get("id"),
+            "description": resource.get("description") or "",
+        })
+    return results
+
+
+def stream_export(
+    domain: str,
+    dataset_id: str,
+    chunksize: int = 100000,
+    typed: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a full-table CSV export as DataFrame chunks.
+
+    Reads `/api/views/<id>/rows.csv?accessType=DOWNLOAD` incrementally, so only
+    one chunk is held in memory at a time. Column headers are renamed from
+    display names to API field names using the dataset metadata.
+
+    Args:
+        domain: Portal domain (e.g., CHICAGO or COOK_COUNTY)
+        dataset_id: 4x4 dataset ID (e.g., "uzyt-m557")
+        chunksize: Rows per yielded DataFrame
+        typed: Convert numbers, dates and checkboxes using metadata datatypes
+
+    Returns:
+        Iterator of DataFrames with at most `chunksize` rows each
+    """
+    columns = get_metadata(domain, dataset_id).get("columns", [])
+    field_names = {c["name"]: c["fieldName"] for c in columns}
+    datatypes = {c["fieldName"]: c.get("dataTypeName", "text") for c in columns}
+
+    url = f"https://{domain}/api/views/{dataset_id}/rows.csv"
+    with http_client.get(
+        url, params={"accessType": "DOWNLOAD"}, headers=get_headers(domain), stream=True
+    ) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        # Read everything as strings so chunks agree on dtypes and PINs keep leading zeros
+        for chunk in pd.read_csv(resp.raw, chunksize=chunksize, dtype=str, keep_default_na=False, na_values=[""]):
+            chunk = chunk.rename(columns=field_names)
+            if typed:
+                for col in chunk.columns:
+                    chunk[col] = convert_column(chunk[col], datatypes.get(col, "text"))
+            yield chunk
+
+
+def download_export(domain: str, dataset_id: str, path: str, chunk_bytes: int = 1 << 20) -> int:
+    """Write a full-table CSV export straight to disk; returns bytes written."""
+    url = f"https://{domain}/api/views/{dataset_id}/rows.csv"
+    written = 0
+    with http_client.get(
+        url, params={"accessType": "DOWNLOAD"}, headers=get_headers(domain), stream=True
+    ) as resp:
+        resp.raise_for_status()
+        with open(path, "wb") as f:
+            for block in resp.iter_content(chunk_size=chunk_bytes):
+                written += f.write(block)
+    return written
+
+
+def soql_quote(value: str) -> str:
+    """Quote a string literal for SoQL, escaping embedded single quotes."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def iter_pages(
+    domain: str,
+    dataset_id: str,
+    params: Optional[dict] = None,
+    page_size: int = 1000,
+    max_rows: Optional[int] = None,
+    typed: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield pages of a query using keyset pagination on the `:id` system field.
+
+    Instead of `$offset`, each request is ordered by `:id` and continues with
+    `$where=:id > '<last id>'`, so page 1,000 costs the server the same as
+    page 1. Rows are yielded in `:id` order.
+
+    Args:
+        domain: Portal domain (e.g., CHICAGO or COOK_COUNTY)
+        dataset_id: 4x4 dataset ID (e.g., "ijzp-q8t2")
+        params: SoQL parameters; `$select` and `$where` are honored
+        page_size: Rows per request (max 50,000)
+        max_rows: Stop after this many rows (default: no limit)
+        typed: Decode pages to typed columns (see `socrata_decode.py`)
+
+    Returns:
+        Iterator of DataFrames, one per page
+    """
+    params = dict(params or {})
+    for key in ("$order", "$offset", "$group", "$having"):
+        if key in params and not (key == "$order" and params[key].strip() == ":id"):
+            raise ValueError(f"Keyset pagination orders by :id and cannot be combined with {key}")
+    if not 0 < page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+    params.pop("$limit", None)
+
+    # :id must come back with every row to know where the next page starts
+    select = params.pop("$select", None)
+    keep_id = select is not None and ":id" in [c.strip() for c in select.split(",")]
+    if select is None:
+        select = ":id, *"
+    elif not keep_id:
+        select = f":id, {select}"
+
+    base_where = params.pop("$where", None)
+    last_id = None
+    fetched = 0
+
+    while max_rows is None or fetched < max_rows:
+        limit = page_size if max_rows is None else min(page_size, max_rows - fetched)
+        where = base_where
+        if last_id is not None:
+            cursor = f":id > {soql_quote(last_id)}"
+            where = f"({base_where}) AND {cursor}" if base_where else cursor
+
+        page_params = {**params, "$select": select, "$order": ":id", "$limit": limit}
+        if where:
+            page_params["$where"] = where
+
+        # Pages are one-off and large; keep them out of the query cache
+        df = query_dataset(domain, dataset_id, page_params, use_cache=False, typed=typed)
+        if df.empty:
+            break
+
+        last_id = df[":id"].iloc[-1]
+        fetched += len(df)
+        yield df if keep_id else df.drop(columns=":id")
+
+        if len(df) < limit:
+            break
+
+
+def get_all_pages(
+    domain: str,
+    dataset_id: str,
+    params: Optional[dict] = None,
+    page_size: int = 1000,
+    max_rows: Optional[int] = None,
+    typed: bool = False,
+) -> pd.DataFrame:
+    """Fetch all rows of a query with keyset pagination (see `iter_pages`)."""
+    pages = list(iter_pages(domain, dataset_id, params, page_size, max_rows, typed))
+    if typed:
+        return socrata_decode.concat_typed(pages)
+    return pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
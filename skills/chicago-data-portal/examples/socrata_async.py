@@ -0,0 +1,93 @@
+"""Async versions of the `socrata.py` helpers for asyncio applications.
+
+Same names and signatures as `socrata.py`, as coroutines. Requests share the
+pooled client in `http_async.py` (per-host concurrency limits, retries,
+adaptive rate limiting), and results use the same local query cache, so a
+service can fan out many portal lookups per request without blocking its
+event loop or paying for a thread per call:
+
+    import asyncio
+    import socrata_async
+    from socrata import CHICAGO, COOK_COUNTY
+
+    crimes, sales = await asyncio.gather(
+        socrata_async.query_dataset(CHICAGO, "ijzp-q8t2", {"$where": "year = 2024", "$limit": 1000}),
+        socrata_async.query_dataset(COOK_COUNTY, "wvhk-k5uv", {"$order": "sale_date DESC"}),
+    )
+
+Cancelling a task cancels its request; nothing is written to the cache for it.
+Requires httpx (`pip install httpx`).
+"""
+
+import asyncio
+from typing import Dict, List
+
+import pandas as pd
+
+import http_async
+import query_cache
+import socrata_decode
+from socrata import CATALOG_URL, get_headers
+
+_column_types: Dict[tuple, Dict[str, str]] = {}
+
+
+async def query_dataset(
+    domain: str,
+    dataset_id: str,
+    params: dict,
+    refresh: bool = False,
+    use_cache: bool = True,
+    typed: bool = False,
+) -> pd.DataFrame:
+    """Query a dataset on a Socrata portal and return as DataFrame (see `socrata.query_dataset`)."""
+    # Typed and raw results of the same query are cached separately, as in socrata.py
+    key = query_cache.cache_key(f"{domain}#typed" if typed else domain, dataset_id, params)
+    if use_cache and not refresh:
+        hit = await asyncio.to_thread(query_cache.get, key)
+        if hit is not None:
+            return hit
+
+    url = f"https://{domain}/resource/{dataset_id}.json"
+    resp = await http_async.get(url, params=params, headers=get_headers(domain))
+    resp.raise_for_status()
+    if typed:
+        df = socrata_decode.decode_rows(resp.json(), await column_types(domain, dataset_id))
+    else:
+        df = pd.DataFrame(resp.json())
+
+    if use_cache:
+        await asyncio.to_thread(query_cache.put, key, df)
+    return df
+
+
+async def get_metadata(domain: str, dataset_id: str) -> dict:
+    """Fetch dataset metadata including columns."""
+    resp = await http_async.get(f"https://{domain}/api/views/{dataset_id}", headers=get_headers(domain))
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def column_types(domain: str, dataset_id: str) -> Dict[str, str]:
+    """{fieldName: dataTypeName} for a dataset, looked up once per process."""
+    if (domain, dataset_id) not in _column_types:
+        columns = (await get_metadata(domain, dataset_id)).get("columns", [])
+        _column_types[domain, dataset_id] = {c["fieldName"]: c.get("dataTypeName", "text") for c in columns}
+    return _column_types[domain, dataset_id]
+
+
+async def search_datasets(domain: str, query: str, limit: int = 10) -> List[dict]:
+    """Search a portal's datasets by keyword via the Socrata Discovery API."""
+    params = {"domains": domain, "q": query, "limit": limit}
+    resp = await http_async.get(CATALOG_URL, params=params, headers=get_headers(domain))
+    resp.raise_for_status()
+
+    results = []
+    for item in resp.json().get("results", []):
+        resource = item.get("resource", {})
+        results.append({
+            "name": resource.get("name"),
+            "id": resource.get("id"),
+            "description": resource.get("description") or "",
+        })
+    return results
@@ -0,0 +1,107 @@
+"""Run many small Socrata queries at once.
+
+Reports made of dozens of `$group` / `count(*)` queries spend almost all of
+their time waiting on round trips. `run_batch` drops duplicate specs, runs
+the distinct ones concurrently over the shared pooled client, and returns
+results keyed by name with per-query timings, so the whole batch takes about
+as long as its slowest query:
+
+    from socrata import COOK_COUNTY
+    from socrata_batch import run_batch
+
+    results, timings = run_batch(COOK_COUNTY, {
+        "deaths_by_manner": ("cjeq-bs86", {"$select": "manner, count(*) as count", "$group": "manner"}),
+        "payroll_by_bureau": ("xu6t-uvny", {"$select": "bureau, sum(base_pay) as total_pay",
+                                            "$group": "bureau"}),
+    })
+    results["deaths_by_manner"]          # DataFrame
+    timings.sort_values("seconds")       # name, dataset_id, rows, seconds, shared, error
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+import query_cache
+import socrata
+
+QuerySpec = Tuple[str, dict]
+
+
+def run_batch(
+    domain: str,
+    queries: Dict[str, QuerySpec],
+    max_workers: int = 8,
+    use_cache: bool = True,
+    raise_errors: bool = True,
+) -> Tuple[Dict[str, Optional[pd.DataFrame]], pd.DataFrame]:
+    """
+    Run named (dataset_id, params) queries concurrently.
+
+    Specs that normalize to the same query (same dataset, same params after
+    trimming and key sorting) are sent once and share the result.
+
+    Args:
+        domain: Portal domain (e.g., CHICAGO or COOK_COUNTY)
+        queries: {name: (dataset_id, params)}
+        max_workers: Concurrent requests (keep <= http_client.POOL_SIZE)
+        use_cache: Read and fill the local query cache (see `query_cache.py`)
+        raise_errors: Raise after the batch if any query failed; otherwise
+            failed names map to None and the error is in `timings`
+
+    Returns:
+        (results, timings): {name: DataFrame} and a DataFrame with one row per
+        name (dataset_id, rows, seconds, shared, error)
+    """
+    columns = ["name", "dataset_id", "rows", "seconds", "shared", "error"]
+    if not queries:
+        return {}, pd.DataFrame(columns=columns)
+
+    # One request per distinct query; remember which names asked for it
+    distinct: Dict[str, QuerySpec] = {}
+    names_by_key: Dict[str, list] = {}
+    for name, (dataset_id, params) in queries.items():
+        key = query_cache.cache_key(domain, dataset_id, params)
+        distinct.setdefault(key, (dataset_id, params))
+        names_by_key.setdefault(key, []).append(name)
+
+    def run(key: str):
+        dataset_id, params = distinct[key]
+        started = time.perf_counter()
+        try:
+            df = socrata.query_dataset(domain, dataset_id, params, use_cache=use_cache)
+            return key, df, time.perf_counter() - started, None
+        except Exception as exc:
+            return key, None, time.perf_counter() - started, exc
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        outcomes = list(pool.map(run, distinct))
+
+    results: Dict[str, Optional[pd.DataFrame]] = {}
+    rows = []
+    errors = {}
+    for key, df, seconds, exc in outcomes:
+        names = names_by_key[key]
+        for name in names:
+            results[name] = df
+            rows.append({
+                "name": name,
+                "dataset_id": distinct[key][0],
+                "rows": None if df is None else len(df),
+                "seconds": round(seconds, 3),
+                "shared": len(names) > 1,
+                "error": None if exc is None else str(exc),
+            })
+            if exc is not None:
+                errors[name] = exc
+
+    # Report in the caller's order
+    order = {name: i for i, name in enumerate(queries)}
+    timings = pd.DataFrame(rows, columns=columns).sort_values("name", key=lambda s: s.map(order), ignore_index=True)
+    if errors and raise_errors:
+        raise RuntimeError(
+            f"{len(errors)} of {len(queries)} queries failed: {', '.join(errors)}"
+        ) from next(iter(errors.values()))
+    return {name: results[name] for name in queries}, timings
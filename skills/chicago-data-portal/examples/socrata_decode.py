@@ -0,0 +1,187 @@
+"""Typed, memory-compact decoding of Socrata JSON responses.
+
+SODA returns every value as a string, so `pd.DataFrame(resp.json())` builds
+a list of row dicts and then all-object columns. Decoding here reads the
+response in batches of rows and converts each batch straight to typed
+columns using the dataset's datatypes from the metadata:
+
+    number, money, percent, double        -> float64
+    calendar_date, *_timestamp, date      -> datetime64
+    checkbox                              -> nullable boolean
+    low-cardinality text (primary_type)   -> category
+    other text, PINs and codes            -> string (leading zeros kept)
+    point, location, ...                  -> left as parsed JSON
+
+With `ijson` installed (`pip install ijson`) the body is parsed incrementally,
+so only one batch of row dicts exists at a time; without it the body is
+parsed in one go and then decoded batch by batch.
+
+`socrata.query_dataset`, `iter_pages` and `get_all_pages` apply this with
+`typed=True`.
+"""
+
+import json
+import re
+from typing import Dict, Iterable, Iterator, List
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+NUMBER_TYPES = {"number", "money", "percent", "double"}
+DATE_TYPES = {"calendar_date", "floating_timestamp", "fixed_timestamp", "date"}
+TEXT_TYPES = {"text", "url", "email", "phone"}
+
+# Identifiers are always kept as plain strings, never numbers or categories
+ID_COLUMN_RE = re.compile(r"^(:id|id|pin\d*|.*_pin\d*|.*_id|.*_number|.*_code)$")
+
+# Text becomes categorical when it has at most this many distinct values
+# and fewer distinct values than half the rows
+MAX_CATEGORIES = 1000
+
+BATCH_ROWS = 50000
+
+_warned = False
+
+
+def convert_column(values: pd.Series, datatype: str) -> pd.Series:
+    """Convert a column of strings to the dtype matching its Socrata datatype.
+
+    Text (including PINs and codes) is left as strings so leading zeros survive.
+    """
+    if datatype in NUMBER_TYPES:
+        cleaned = values.str.replace(r"[$,%]", "", regex=True)
+        return pd.to_numeric(cleaned, errors="coerce").astype("float64")
+    if datatype in DATE_TYPES:
+        # rows.csv uses US format; the JSON endpoints use ISO 8601
+        parsed = pd.to_datetime(values, format="%m/%d/%Y %I:%M:%S %p", errors="coerce")
+        if parsed.isna().all() and values.notna().any():
+            parsed = pd.to_datetime(values, format="ISO8601", errors="coerce")
+        return parsed
+    if datatype == "checkbox":
+        return values.str.lower().map({"true": True, "false": False}).astype("boolean")
+    return values
+
+
+def _decode_batch(rows: List[dict], columns: List[str], datatypes: Dict[str, str]) -> Dict[str, pd.Series]:
+    """Typed columns for one batch of row dicts."""
+    out = {}
+    for col in columns:
+        values = [row.get(col) for row in rows]
+        datatype = datatypes.get(col)
+        if datatype in NUMBER_TYPES or datatype in DATE_TYPES or datatype == "checkbox":
+            strings = pd.Series([None if v is None else str(v) for v in values], dtype=object)
+            out[col] = convert_column(strings, datatype)
+        elif datatype is None or datatype in TEXT_TYPES:
+            strings = pd.Series([None if v is None else str(v) for v in values], dtype="string")
+            out[col] = strings if ID_COLUMN_RE.match(col) else strings.astype("category")
+        else:
+            out[col] = pd.Series(values, dtype=object)
+    return out
+
+
+def _compact_text(values: pd.Series) -> pd.Series:
+    """Keep a categorical only while it is low-cardinality; otherwise plain strings."""
+    n_categories = len(values.cat.categories)
+    if n_categories <= MAX_CATEGORIES and n_categories * 2 < max(len(values), 2):
+        return values.cat.remove_unused_categories()
+    return values.astype("string")
+
+
+def _combine(parts: List) -> pd.Series:
+    """
+    Concatenate one column's batches, merging categoricals without going through object.
+
+    An int in `parts` stands for that many missing values (batches or frames
+    that didn't have the column).
+    """
+    typed = next((p for p in parts if not isinstance(p, int)), None)
+    parts = [
+        pd.Series([None] * p, dtype=object).astype(typed.dtype) if isinstance(p, int) else p
+        for p in parts
+        if not isinstance(p, int) or p
+    ]
+    if len(parts) == 1:
+        part = parts[0]
+        return _compact_text(part) if isinstance(part.dtype, pd.CategoricalDtype) else part
+    if any(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+        cats = [p.astype("category") if not isinstance(p.dtype, pd.CategoricalDtype) else p for p in parts]
+        cats = [p.cat.set_categories(p.cat.categories.astype("string")) for p in cats]
+        return _compact_text(pd.Series(union_categoricals(cats, ignore_order=True)))
+    return pd.concat(parts, ignore_index=True)
+
+
+def decode_rows(rows: Iterable[dict], datatypes: Dict[str, str], batch_rows: int = BATCH_ROWS) -> pd.DataFrame:
+    """
+    Build a typed DataFrame from an iterable of SODA row dicts.
+
+    Args:
+        rows: Row dicts (a list, or a generator such as `iter_json_rows`)
+        datatypes: {fieldName: dataTypeName}; columns not listed (aggregate
+            aliases, system fields) are treated as text
+        batch_rows: Rows converted per batch
+
+    Returns:
+        DataFrame with typed columns, in first-seen column order
+    """
+    columns: List[str] = []
+    parts: Dict[str, list] = {}
+    total = 0
+    batch: List[dict] = []
+
+    def flush():
+        nonlocal total
+        for row in batch:
+            for col in row:
+                if col not in parts:
+                    columns.append(col)
+                    # Earlier batches had no value for a column first seen now
+                    parts[col] = [total]
+        decoded = _decode_batch(batch, columns, datatypes)
+        for col in columns:
+            parts[col].append(decoded[col])
+        total += len(batch)
+        batch.clear()
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_rows:
+            flush()
+    if batch:
+        flush()
+    if not total:
+        return pd.DataFrame()
+
+    out = {}
+    for col in columns:
+        out[col] = _combine(parts.pop(col)).reset_index(drop=True)
+    return pd.DataFrame(out, columns=columns)
+
+
+def iter_json_rows(resp) -> Iterator[dict]:
+    """Row dicts from a streamed SODA JSON response (incremental with ijson)."""
+    global _warned
+    try:
+        import ijson
+    except ImportError:
+        if not _warned:
+            _warned = True
+            print("Warning: ijson not installed; responses are parsed whole before decoding")
+        yield from json.loads(resp.content)
+        return
+    resp.raw.decode_content = True
+    yield from ijson.items(resp.raw, "item", use_float=True)
+
+
+def concat_typed(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate typed frames (e.g. pages), merging per-page categoricals."""
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    columns = list(dict.fromkeys(col for df in frames for col in df.columns))
+    out = {}
+    for col in columns:
+        parts = [df[col].reset_index(drop=True) if col in df.columns else len(df) for df in frames]
+        out[col] = _combine(parts).reset_index(drop=True)
+    return pd.DataFrame(out, columns=columns)
@@ -0,0 +1,401 @@
+"""Incrementally maintained rollup cubes for recurring aggregate queries.
+
+Dashboards keep asking the portal for the same group-bys (counts by
+`sr_type`, by `primary_type` x ward x day, ...). A `Cube` declares the
+dimensions (columns or SoQL expressions such as `date_trunc_ymd(date)`) and
+value columns to keep per group. `build` pulls just those columns once;
+`refresh` fetches only rows changed since (by `:updated_at`) and re-aggregates
+the groups they touch. `query` answers `$select ... $group` requests from a
+covering cube and only goes to the API when no cube can:
+
+    from socrata import CHICAGO
+    from socrata_rollup import Cube, query
+
+    Cube(CHICAGO, "ijzp-q8t2", "type_ward_day",
+         dimensions=["primary_type", "ward", "date_trunc_ymd(date) AS day"]).build()
+
+    Cube.load(CHICAGO, "ijzp-q8t2", "type_ward_day").refresh()      # nightly
+
+    query(CHICAGO, "ijzp-q8t2", {           # answered from the cube
+        "$select": "primary_type, count(*) AS n",
+        "$where": "ward = '42' AND day >= '2024-01-01'",
+        "$group": "primary_type",
+        "$order": "n DESC",
+    })
+
+A cube covers a query when every `$where` / `$group` / `$having` / `$order` /
+selected expression is built from its dimensions and every aggregate is
+`count(*)` or `count`, `sum`, `avg`, `min`, `max` of one of its value
+columns. Answers come back typed (numbers, timestamps), and `query` asks the
+API for `typed=True` results when no cube covers a query. As with `socrata_sync.py`,
+deleted rows are not reported through `:updated_at`; `build` again now and
+then to drop them.
+"""
+
+import glob
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import socrata
+import socrata_sync
+import soql_local
+from soql_local import Evaluator, Node, ParsedQuery, output_name, parse_select
+
+DEFAULT_STORE = "rollup_store"
+
+# Aggregates a cube can answer, and how each is rolled up from stored group values
+ROLLUPS = {"count", "sum", "avg", "min", "max"}
+
+# Socrata's default $limit, applied when a cube answers a query without one
+DEFAULT_LIMIT = 1000
+
+_tables: Dict[str, tuple] = {}
+
+
+def _write_atomic(df: pd.DataFrame, path: str) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+class Cube:
+    """
+    Group-level aggregates of one dataset, kept on disk and updated incrementally.
+
+    Per group the cube stores the row count and, for each value column, its
+    non-null count, sum, min and max. Alongside it a compact ledger keeps
+    each row's `:id`, dimension values and value columns, so a changed row's
+    old group can be corrected exactly.
+    """
+
+    def __init__(
+        self,
+        domain: str,
+        dataset_id: str,
+        name: str,
+        dimensions: Sequence[str],
+        values: Sequence[str] = (),
+        store_dir: str = DEFAULT_STORE,
+    ):
+        """
+        Args:
+            domain: Portal domain (e.g., CHICAGO or COOK_COUNTY)
+            dataset_id: 4x4 dataset ID (e.g., "ijzp-q8t2")
+            name: Cube name, unique per dataset
+            dimensions: Columns or SoQL expressions, optionally `AS alias`
+                (e.g., ["primary_type", "date_trunc_ymd(date) AS day"])
+            values: Numeric columns to keep count/sum/min/max of
+            store_dir: Directory holding cubes and ledgers
+        """
+        self.domain = domain
+        self.dataset_id = dataset_id
+        self.name = name
+        self.dimension_specs = list(dimensions)
+        self.values = list(values)
+        self.store_dir = store_dir
+
+        if not self.dimension_specs:
+            raise ValueError("A cube needs at least one dimension")
+        _, items = parse_select(", ".join(self.dimension_specs))
+        self.dimensions: Dict[Node, str] = {node: alias or output_name(node) for node, alias in items}
+        self.columns = list(dict.fromkeys(
+            [c for node in self.dimensions for c in soql_local.referenced_columns(node)] + self.values
+        ))
+        # Queries can refer to an aliased dimension by its alias
+        self._aliases = {("col", name): node for node, name in self.dimensions.items() if ("col", name) != node}
+
+        base = os.path.join(store_dir, domain, dataset_id, name)
+        self.paths = {"cube": f"{base}.parquet", "ledger": f"{base}.ledger.parquet", "state": f"{base}.json"}
+
+    @classmethod
+    def load(cls, domain: str, dataset_id: str, name: str, store_dir: str = DEFAULT_STORE) -> "Cube":
+        """A cube previously built with `build`."""
+        with open(os.path.join(store_dir, domain, dataset_id, f"{name}.json")) as f:
+            state = json.load(f)
+        return cls(domain, dataset_id, name, state["dimensions"], state["values"], store_dir)
+
+    def state(self) -> dict:
+        if not os.path.exists(self.paths["state"]):
+            return {}
+        with open(self.paths["state"]) as f:
+            return json.load(f)
+
+    @property
+    def table(self) -> pd.DataFrame:
+        """The stored aggregates, kept in memory until the file changes."""
+        path = self.paths["cube"]
+        mtime = os.path.getmtime(path)
+        cached = _tables.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = _tables[path] = (mtime, pd.read_parquet(path))
+        return cached[1]
+
+    # --- maintenance ---------------------------------------------------
+
+    def _ledger_rows(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """Dimension values and numeric value columns for fetched rows."""
+        if rows.empty:
+            return pd.DataFrame(columns=[":id", *self.dimensions.values(), *(f"value_{c}" for c in self.values)])
+        for col in self.columns:
+            if col not in rows.columns:
+                rows[col] = None
+        scope = Evaluator(rows.reset_index(drop=True))
+        out = {":id": scope.frame[":id"]}
+        for node, name in self.dimensions.items():
+            value = scope.eval(node)
+            out[name] = value if isinstance(value, pd.Series) else pd.Series(value, index=scope.frame.index)
+        for col in self.values:
+            out[f"value_{col}"] = pd.to_numeric(scope.frame[col], errors="coerce")
+        return pd.DataFrame(out)
+
+    def _aggregate(self, ledger: pd.DataFrame) -> pd.DataFrame:
+        dims = list(self.dimensions.values())
+        grouped = ledger.groupby(dims, dropna=False, sort=False, observed=True)
+        parts = [grouped.size().rename("count")]
+        for col in self.values:
+            values = grouped[f"value_{col}"]
+            parts += [values.count().rename(f"count_{col}"), values.sum(min_count=1).rename(f"sum_{col}"),
+                      values.min().rename(f"min_{col}"), values.max().rename(f"max_{col}")]
+        return pd.concat(parts, axis=1).reset_index()
+
+    def _pull(self, where: Optional[str], page_size: int) -> pd.DataFrame:
+        select = ", ".join([":id", ":updated_at", *self.columns])
+        params = {"$select": select, **({"$where": where} if where else {})}
+        pages = list(socrata.iter_pages(self.domain, self.dataset_id, params, page_size))
+        return pd.concat(pages, ignore_index=True) if pages else pd.DataFrame(columns=[":id", ":updated_at"])
+
+    def _write_state(self, rows: int, groups: int, watermark: Optional[str]) -> dict:
+        state = {
+            "dimensions": self.dimension_specs,
+            "values": self.values,
+            "watermark": watermark,
+            "rows": rows,
+            "groups": groups,
+            "updated_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        }
+        with open(self.paths["state"], "w") as f:
+            json.dump(state, f, indent=2)
+        return state
+
+    def _save(self, cube: pd.DataFrame, ledger: pd.DataFrame, watermark: Optional[str]) -> dict:
+        os.makedirs(os.path.dirname(self.paths["cube"]), exist_ok=True)
+        # Cube and ledger go first; an interrupted refresh re-applies the same rows next time
+        _write_atomic(ledger, self.paths["ledger"])
+        _write_atomic(cube, self.paths["cube"])
+        return self._write_state(len(ledger), len(cube), watermark)
+
+    def build(self, snapshot_dir: Optional[str] = None, page_size: int = 50000) -> dict:
+        """
+        Build the cube from a full pull of the columns it needs.
+
+        Args:
+            snapshot_dir: Read rows (and the watermark) from the `socrata_sync`
+                snapshot in this directory instead of the API (e.g.,
+                socrata_sync.DEFAULT_STORE); it must include `:id`,
+                `:updated_at` and the cube's columns
+            page_size: Rows per request (keyset pages over `:id`)
+
+        Returns:
+            Dict with rows, groups and the watermark
+        """
+        if snapshot_dir:
+            rows = socrata_sync.load_snapshot(self.domain, self.dataset_id, snapshot_dir,
+                                              columns=[":id", ":updated_at", *self.columns])
+            watermark = socrata_sync.load_state(self.domain, self.dataset_id, snapshot_dir).get("watermark")
+        else:
+            rows = self._pull(None, page_size)
+            watermark = rows[":updated_at"].max() if not rows.empty else None
+        ledger = self._ledger_rows(rows)
+        state = self._save(self._aggregate(ledger), ledger, watermark)
+        return {"rows": state["rows"], "groups": state["groups"], "watermark": watermark}
+
+    def refresh(self, page_size: int = 10000) -> dict:
+        """
+        Apply rows changed since the last build or refresh.
+
+        Rows with `:updated_at >= <watermark>` replace their ledger entries by
+        `:id`; every group an old or new version of those rows belongs to is
+        re-aggregated from the ledger, so counts, sums, minimums and maximums
+        stay exact.
+
+        Returns:
+            Dict with rows_fetched, groups_updated and the new watermark
+        """
+        state = self.state()
+        if not state.get("watermark"):
+            build = self.build(page_size=page_size)
+            return {"rows_fetched": build["rows"], "groups_updated": build["groups"], "watermark": build["watermark"]}
+
+        watermark = state["watermark"]
+        rows = self._pull(f":updated_at >= {socrata.soql_quote(watermark)}", page_size)
+        if rows.empty:
+            return {"rows_fetched": 0, "groups_updated": 0, "watermark": watermark}
+
+        ledger = pd.read_parquet(self.paths["ledger"])
+        changed = self._ledger_rows(rows)
+        if not ledger.empty:
+            changed = changed.astype(ledger.dtypes.to_dict())
+        replaced = ledger[":id"].isin(changed[":id"])
+
+        # Rows re-fetched at the watermark, or updated in columns the cube doesn't use, change nothing
+        previous = pd.Index(ledger.loc[replaced, ":id"]).get_indexer(changed[":id"])
+        before = np.append(pd.util.hash_pandas_object(ledger[replaced], index=False).to_numpy(), 0)[previous]
+        after = pd.util.hash_pandas_object(changed, index=False).to_numpy()
+        changed = changed[(previous < 0) | (before != after)]
+        replaced = ledger[":id"].isin(changed[":id"])
+        watermark = max(watermark, rows[":updated_at"].max())
+        if changed.empty:
+            self._write_state(len(ledger), len(self.table), watermark)
+            return {"rows_fetched": len(rows), "groups_updated": 0, "watermark": watermark}
+
+        touched = np.union1d(self._group_hash(ledger[replaced]), self._group_hash(changed))
+        ledger = pd.concat([ledger[~replaced], changed], ignore_index=True)
+        cube = self.table
+        kept = cube[~np.isin(self._group_hash(cube), touched)]
+        updated = self._aggregate(ledger[np.isin(self._group_hash(ledger), touched)])
+        cube = pd.concat([kept, updated.astype(cube[updated.columns].dtypes.to_dict())], ignore_index=True)
+        self._save(cube, ledger, watermark)
+        return {"rows_fetched": len(rows), "groups_updated": len(updated), "watermark": watermark}
+
+    def _group_hash(self, df: pd.DataFrame) -> np.ndarray:
+        """One uint64 per row identifying its group (nulls included)."""
+        dims = list(self.dimensions.values())
+        return pd.util.hash_pandas_object(df[dims], index=False).to_numpy()
+
+    # --- answering -----------------------------------------------------
+
+    def _covered(self, node: Node) -> bool:
+        """Whether an expression can be evaluated from dimension values alone."""
+        if node in self.dimensions or node[0] == "lit":
+            return True
+        if node[0] in ("col", "star") or (node[0] == "call" and node[1] in soql_local.AGGREGATES):
+            return False
+        return all(self._covered(child) for child in soql_local.children(node))
+
+    def _rollup_only(self, node: Node, group: set) -> bool:
+        """Whether a select item is built only from aggregates, literals and group expressions."""
+        if node in group or node[0] == "lit" or (node[0] == "call" and node[1] in soql_local.AGGREGATES):
+            return True
+        if node[0] in ("col", "star"):
+            return False
+        return all(self._rollup_only(child, group) for child in soql_local.children(node))
+
+    def covers(self, query: ParsedQuery) -> bool:
+        """Whether this cube can answer a parsed query (with dimension aliases already replaced) exactly."""
+        if not query.grouped or query.distinct:
+            return False
+        if query.where is not None and not self._covered(query.where):
+            return False
+        if not all(self._covered(g) for g in query.group):
+            return False
+        for agg in query.aggregates:
+            name, args = agg[1], agg[2]
+            if name not in ROLLUPS or len(args) != 1:
+                return False
+            if args[0] == ("star",):
+                if name != "count":
+                    return False
+            elif not (args[0][0] == "col" and args[0][1] in self.values):
+                return False
+        group = set(query.group)
+        if not all(node != ("star",) and self._rollup_only(node, group) for node, _ in query.items):
+            return False
+        if query.having is not None and not self._rollup_only(query.having, group):
+            return False
+        return all(self._rollup_only(node, group) for node, _ in query.order)
+
+    def _rollup(self, agg: Node, evaluator: Evaluator, codes: np.ndarray, n_groups: int) -> pd.Series:
+        """Roll an aggregate up from stored group values (e.g. avg = sum of sums / sum of counts)."""
+        frame = evaluator.frame
+        name, arg = agg[1], agg[2][0]
+
+        def total(column: str, how: str = "sum") -> pd.Series:
+            return soql_local.aggregate_values(frame[column], how, codes, n_groups)
+
+        if arg == ("star",):
+            return total("count")
+        col = arg[1]
+        if name == "count":
+            return total(f"count_{col}")
+        if name == "sum":
+            return total(f"sum_{col}")
+        if name == "avg":
+            return total(f"sum_{col}") / total(f"count_{col}").replace(0, np.nan)
+        return total(f"{name}_{col}", name)
+
+    def _parse(self, params: dict) -> ParsedQuery:
+        """Parse a query, replacing select aliases and cube dimension aliases (e.g. `day`) with their expressions."""
+        # Select aliases resolve like on the portal: anywhere in $group/$having/$order, but never over a real column
+        query = ParsedQuery(params, self.columns)
+        mapping = self._aliases
+
+        def sub(node: Node) -> Node:
+            return soql_local.replace_nodes(node, mapping)
+
+        query.items = [(sub(node), alias or (node[1] if node in mapping else None)) for node, alias in query.items]
+        query.group = [sub(g) for g in query.group]
+        query.order = [(sub(node), desc) for node, desc in query.order]
+        query.where = sub(query.where) if query.where is not None else None
+        query.having = sub(query.having) if query.having is not None else None
+        query.aggregates = [sub(a) for a in query.aggregates]
+        return query
+
+    def answer(self, params: dict) -> Optional[pd.DataFrame]:
+        """Result of a `$select ... $group` query from the cube, or None if it doesn't cover it."""
+        query = self._parse(params)
+        if not self.covers(query):
+            return None
+        if query.limit is None:
+            query.limit = DEFAULT_LIMIT
+
+        cube = self.table
+        if query.where is not None:
+            keep = Evaluator(cube, {node: cube[name] for node, name in self.dimensions.items()}).mask(query.where)
+            cube = cube[keep.to_numpy()].reset_index(drop=True)
+        scope = Evaluator(cube, {node: cube[name] for node, name in self.dimensions.items()})
+        return soql_local.project(
+            soql_local.group_scope(scope, query.group, query.aggregates, query.having, aggregate=self._rollup),
+            query,
+        )
+
+
+def load_cubes(domain: str, dataset_id: str, store_dir: str = DEFAULT_STORE) -> List[Cube]:
+    """Every cube built for a dataset, smallest (fewest groups) first."""
+    cubes = []
+    for path in glob.glob(os.path.join(store_dir, domain, dataset_id, "*.json")):
+        cube = Cube.load(domain, dataset_id, os.path.basename(path)[:-len(".json")], store_dir)
+        if os.path.exists(cube.paths["cube"]):
+            cubes.append((cube.state().get("groups", 0), cube))
+    return [cube for _, cube in sorted(cubes, key=lambda item: item[0])]
+
+
+def query(
+    domain: str,
+    dataset_id: str,
+    params: dict,
+    store_dir: str = DEFAULT_STORE,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Answer a query from the smallest covering cube, or from the API if none covers it.
+
+    Args:
+        domain: Portal domain (e.g., CHICAGO or COOK_COUNTY)
+        dataset_id: 4x4 dataset ID (e.g., "ijzp-q8t2")
+        params: SoQL parameters
+        store_dir: Directory holding cubes
+        **kwargs: Passed to `socrata.query_dataset` on fallback (refresh, use_cache)
+
+    Returns:
+        DataFrame of results, typed whether it came from a cube or the API
+    """
+    for cube in load_cubes(domain, dataset_id, store_dir):
+        result = cube.answer(params)
+        if result is not None:
+            return result
+    # Cube answers are typed, so the fallback must be too
+    return socrata.query_dataset(domain, dataset_id, params, **{**kwargs, "typed": True})
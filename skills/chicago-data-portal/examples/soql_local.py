@@ -0,0 +1,930 @@
+"""Run SoQL locally against Parquet snapshots and cached results.
+
+Every tweak to a `$where` or `$group` is another round trip to the portal.
+`LocalEngine` runs the SoQL subset in `references/soql-quick-ref.md`
+(comparisons, AND/OR/NOT, IN, BETWEEN, LIKE, IS NULL, aggregates with
+`$group`/`$having`, `date_trunc_*`/`date_extract_*`, text functions and
+`within_circle`/`within_box`/`within_polygon`/`distance_in_meters`) on local
+DataFrames with vectorized column operations, and joins datasets through
+cached hash indexes:
+
+    from socrata import COOK_COUNTY
+    from soql_local import LocalEngine
+
+    engine = LocalEngine()
+    engine.register_snapshot(COOK_COUNTY, "uzyt-m557", name="values")   # from socrata_sync.py
+    engine.register_snapshot(COOK_COUNTY, "wvhk-k5uv", name="sales")
+    engine.join("values", "sales", on="pin", normalize="pin", name="values_sales")
+
+    engine.query("values_sales", {
+        "$select": "township_code, date_trunc_y(sale_date) AS sale_year, avg(sale_price) AS avg_price, count(*)",
+        "$where": "year = 2024 AND sale_price > 10000",
+        "$group": "township_code, sale_year",
+        "$order": "avg_price DESC",
+    })
+
+Tables are registered once (snapshots via `socrata_sync.load_snapshot`, or
+any DataFrame such as a `query_dataset` or `get_census_data` result); queries
+and joins then never touch the network. Unlike the portal, there is no
+default `$limit`.
+"""
+
+import json
+import math
+import operator
+import os
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import socrata_sync
+import socrata_catalog
+from socrata_decode import DATE_TYPES, ID_COLUMN_RE, NUMBER_TYPES, convert_column
+from socrata_tiles import haversine_m
+
+AGGREGATES = {
+    "count": "count", "sum": "sum", "avg": "mean", "min": "min", "max": "max",
+    "stddev_pop": "std_pop", "stddev_samp": "std",
+}
+
+COMPARISONS = {
+    "=": operator.eq, "!=": operator.ne, "<": operator.lt,
+    "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+ARITHMETIC = {
+    "+": operator.add, "-": operator.sub, "*": operator.mul,
+    "/": operator.truediv, "%": operator.mod,
+}
+
+KEYWORDS = {
+    "AND", "OR", "NOT", "IS", "NULL", "IN", "BETWEEN", "LIKE", "AS", "ASC", "DESC",
+    "DISTINCT", "TRUE", "FALSE",
+}
+
+TOKEN_RE = re.compile(r"""
+    \s*(?:
+      (?P<string>'(?:[^']|'')*')
+    | (?P<number>\d+\.\d*|\.\d+|\d+)
+    | (?P<name>`[^`]+`|:?[A-Za-z_@][A-Za-z0-9_]*)
+    | (?P<op><>|!=|<=|>=|\|\||[=<>+\-*/%(),])
+    )""", re.VERBOSE)
+
+ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$")
+
+Node = tuple
+
+
+# --- parsing ---------------------------------------------------------------
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """(kind, value) tokens of a SoQL expression; keywords are upper-cased."""
+    tokens, pos = [], 0
+    text = text.strip()
+    while pos < len(text):
+        match = TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Cannot parse SoQL near {text[pos:pos + 20]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "name":
+            if value.startswith("`"):
+                value = value[1:-1]
+            elif value.upper() in KEYWORDS:
+                kind, value = "keyword", value.upper()
+        tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing hashable tuple ASTs."""
+
+    def __init__(self, text: str):
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> Tuple[str, str]:
+        i = self.pos + offset
+        return self.tokens[i] if i < len(self.tokens) else ("end", "")
+
+    def accept(self, *values: str) -> Optional[str]:
+        kind, value = self.peek()
+        if kind in ("keyword", "op") and value in values:
+            self.pos += 1
+            return value
+        return None
+
+    def expect(self, value: str) -> None:
+        if not self.accept(value):
+            raise ValueError(f"Expected {value!r}, found {self.peek()[1]!r}")
+
+    def done(self) -> bool:
+        return self.peek()[0] == "end"
+
+    # expr := or
+    def expr(self) -> Node:
+        node = self.and_()
+        while self.accept("OR"):
+            node = ("or", node, self.and_())
+        return node
+
+    def and_(self) -> Node:
+        node = self.not_()
+        while self.accept("AND"):
+            node = ("and", node, self.not_())
+        return node
+
+    def not_(self) -> Node:
+        if self.accept("NOT"):
+            return ("not", self.not_())
+        return self.predicate()
+
+    def predicate(self) -> Node:
+        node = self.additive()
+        if self.accept("IS"):
+            negated = bool(self.accept("NOT"))
+            self.expect("NULL")
+            return ("isnull", node, negated)
+        negated = bool(self.accept("NOT"))
+        if self.accept("IN"):
+            self.expect("(")
+            values = [self.additive()]
+            while self.accept(","):
+                values.append(self.additive())
+            self.expect(")")
+            return ("in", node, tuple(values), negated)
+        if self.accept("BETWEEN"):
+            lo = self.additive()
+            self.expect("AND")
+            return ("between", node, lo, self.additive(), negated)
+        if self.accept("LIKE"):
+            return ("like", node, self.additive(), negated)
+        if negated:
+            raise ValueError("NOT must be followed by IN, BETWEEN or LIKE here")
+        op = self.accept("=", "!=", "<>", "<", "<=", ">", ">=")
+        if op:
+            return ("cmp", "!=" if op == "<>" else op, node, self.additive())
+        return node
+
+    def additive(self) -> Node:
+        node = self.term()
+        while True:
+            op = self.accept("+", "-", "||")
+            if not op:
+                return node
+            node = ("arith", op, node, self.term())
+
+    def term(self) -> Node:
+        node = self.unary()
+        while True:
+            op = self.accept("*", "/", "%")
+            if not op:
+                return node
+            node = ("arith", op, node, self.unary())
+
+    def unary(self) -> Node:
+        if self.accept("-"):
+            return ("arith", "-", ("lit", 0), self.unary())
+        return self.primary()
+
+    def primary(self) -> Node:
+        kind, value = self.peek()
+        if self.accept("("):
+            node = self.expr()
+            self.expect(")")
+            return node
+        self.pos += 1
+        if kind == "string":
+            return ("lit", value[1:-1].replace("''", "'"))
+        if kind == "number":
+            return ("lit", float(value) if "." in value else int(value))
+        if kind == "keyword" and value in ("TRUE", "FALSE"):
+            return ("lit", value == "TRUE")
+        if kind == "keyword" and value == "NULL":
+            return ("lit", None)
+        if kind == "op" and value == "*":
+            return ("star",)
+        if kind == "name":
+            if self.accept("("):
+                name = value.lower()
+                args: List[Node] = []
+                if self.accept("*"):
+                    args.append(("star",))
+                elif self.peek() != ("op", ")"):
+                    args.append(self.expr())
+                    while self.accept(","):
+                        args.append(self.expr())
+                self.expect(")")
+                return ("call", name, tuple(args))
+            return ("col", value)
+        if kind == "end":
+            raise ValueError("Unexpected end of SoQL expression")
+        raise ValueError(f"Unexpected {value!r} in SoQL expression")
+
+
+def parse_expression(text: str) -> Node:
+    """Parse one SoQL expression (e.g. a `$where` or `$having` value)."""
+    parser = _Parser(text)
+    node = parser.expr()
+    if not parser.done():
+        raise ValueError(f"Unexpected {parser.peek()[1]!r} in {text!r}")
+    return node
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split a comma-separated clause ($select, $group, $order) outside parentheses and quotes."""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(text):
+        if ch == "'":
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and ch == ",":
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def parse_select(text: str) -> Tuple[bool, List[Tuple[Node, Optional[str]]]]:
+    """(distinct, [(expression, alias)]) of a `$select` value."""
+    text = text.strip()
+    distinct = bool(re.match(r"(?i)distinct\s", text))
+    if distinct:
+        text = text[len("distinct"):].strip()
+    items = []
+    for part in _split_top_level(text):
+        parser = _Parser(part)
+        node = parser.expr()
+        alias = None
+        if parser.accept("AS"):
+            alias = parser.peek()[1]
+            parser.pos += 1
+        if not parser.done():
+            raise ValueError(f"Unexpected {parser.peek()[1]!r} in select item {part!r}")
+        items.append((node, alias))
+    return distinct, items
+
+
+def parse_order(text: str) -> List[Tuple[Node, bool]]:
+    """[(expression, descending)] of an `$order` value."""
+    items = []
+    for part in _split_top_level(text):
+        parser = _Parser(part)
+        node = parser.expr()
+        desc = parser.accept("DESC") == "DESC"
+        parser.accept("ASC")
+        if not parser.done():
+            raise ValueError(f"Unexpected {parser.peek()[1]!r} in order item {part!r}")
+        items.append((node, desc))
+    return items
+
+
+def output_name(node: Node) -> str:
+    """Column name Socrata gives an unaliased select item (e.g. count(*) -> count)."""
+    if node[0] == "col":
+        return node[1]
+    if node[0] == "call":
+        args = [output_name(a) for a in node[2] if a != ("star",)]
+        return "_".join([node[1], *args])
+    return "expr"
+
+
+def children(node: Node) -> List[Node]:
+    """Direct sub-expressions of a node (operands, function arguments, IN lists)."""
+    out = []
+    for child in node[1:]:
+        if isinstance(child, tuple):
+            out.extend([child] if child and isinstance(child[0], str) else child)
+    return out
+
+
+def replace_nodes(node: Node, mapping: Dict[Node, Node]) -> Node:
+    """Copy of an expression with sub-expressions found in `mapping` replaced."""
+    if node in mapping:
+        return mapping[node]
+    out = []
+    for child in node:
+        if isinstance(child, tuple) and child and isinstance(child[0], str):
+            child = replace_nodes(child, mapping)
+        elif isinstance(child, tuple):
+            child = tuple(replace_nodes(item, mapping) for item in child)
+        out.append(child)
+    return tuple(out)
+
+
+def _walk(node: Node):
+    yield node
+    for child in children(node):
+        yield from _walk(child)
+
+
+def referenced_columns(node: Node) -> List[str]:
+    """Column names an expression reads, in order of appearance."""
+    return list(dict.fromkeys(n[1] for n in _walk(node) if n[0] == "col"))
+
+
+def _aggregates(node: Node) -> List[Node]:
+    return [n for n in _walk(node) if n[0] == "call" and n[1] in AGGREGATES]
+
+
+# --- evaluation ------------------------------------------------------------
+
+def _as_number(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values
+    return pd.to_numeric(values, errors="coerce")
+
+
+def _as_datetime(values):
+    if isinstance(values, pd.Series) and pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, errors="coerce", format="ISO8601")
+
+
+def _unknown_if_null(result, *operands):
+    """A comparison result as nullable booleans, NA wherever an operand is NULL."""
+    if not isinstance(result, pd.Series):
+        return result
+    unknown = pd.Series(False, index=result.index)
+    for operand in operands:
+        if isinstance(operand, pd.Series):
+            unknown |= operand.isna().to_numpy()
+        elif operand is None:
+            unknown[:] = True
+    return result.astype("boolean").mask(unknown)
+
+
+def _coerce_pair(left, right):
+    """Make a column and a literal comparable (numeric, datetime or text)."""
+    for a, b, swap in ((left, right, False), (right, left, True)):
+        if isinstance(a, pd.Series) and not isinstance(b, pd.Series) and b is not None:
+            if pd.api.types.is_datetime64_any_dtype(a):
+                b = pd.Timestamp(b)
+            elif pd.api.types.is_numeric_dtype(a) and not pd.api.types.is_bool_dtype(a) and isinstance(b, str):
+                b = float(b)
+            elif isinstance(b, (int, float)) and not isinstance(b, bool):
+                a = _as_number(a)
+            return (b, a) if swap else (a, b)
+    return left, right
+
+
+def _points(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitude and longitude of a point column (GeoJSON dicts, JSON strings or WKT)."""
+    def point(value):
+        if isinstance(value, str):
+            value = value.strip()
+            if value.upper().startswith("POINT"):
+                lon, lat = map(float, value[value.index("(") + 1:value.index(")")].split())
+                return lat, lon
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return math.nan, math.nan
+        if isinstance(value, dict):
+            if "coordinates" in value:
+                lon, lat = value["coordinates"][:2]
+                return float(lat), float(lon)
+            if "latitude" in value:
+                return float(value["latitude"]), float(value["longitude"])
+        return math.nan, math.nan
+
+    pts = np.array([point(v) for v in values], dtype="float64").reshape(-1, 2)
+    return pts[:, 0], pts[:, 1]
+
+
+def _wkt_rings(text: str) -> List[np.ndarray]:
+    """Every ring of a WKT POLYGON or MULTIPOLYGON as (n, 2) lon/lat arrays."""
+    return [
+        np.array([[float(x) for x in pair.split()[:2]] for pair in ring.split(",")], dtype="float64")
+        for ring in re.findall(r"\(([^()]+)\)", text)
+    ]
+
+
+def _within_polygon(lat: np.ndarray, lon: np.ndarray, wkt: str) -> np.ndarray:
+    """Even-odd point-in-polygon test over all rings (holes and multi-part shapes work)."""
+    rings = _wkt_rings(wkt)
+    if not rings:
+        raise ValueError(f"Cannot read polygon {wkt[:40]!r}")
+    edges = np.concatenate([np.hstack([r[:-1], r[1:]]) for r in rings])
+    points = np.concatenate(rings)
+    inside = np.zeros(len(lat), dtype=bool)
+    candidates = np.flatnonzero(
+        (lon >= points[:, 0].min()) & (lon <= points[:, 0].max())
+        & (lat >= points[:, 1].min()) & (lat <= points[:, 1].max())
+    )
+    x0, y0, x1, y1 = edges.T
+    step = max(1, 4_000_000 // len(edges))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, len(candidates), step):
+            rows = candidates[start:start + step]
+            px, py = lon[rows, None], lat[rows, None]
+            crosses = (y0 > py) != (y1 > py)
+            x_cross = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+            inside[rows] = np.count_nonzero(crosses & (px < x_cross), axis=1) % 2 == 1
+    return inside
+
+
+def _like(values: pd.Series, pattern: str) -> pd.Series:
+    regex = "(?s)^" + "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern) + "$"
+    return values.astype("string").str.match(regex)
+
+
+DATE_TRUNC = {"date_trunc_y": "Y", "date_trunc_ym": "M", "date_trunc_ymd": "D"}
+DATE_EXTRACT = {
+    "date_extract_y": "year", "date_extract_m": "month", "date_extract_d": "day",
+    "date_extract_hh": "hour", "date_extract_mm": "minute", "date_extract_ss": "second",
+}
+
+
+class Evaluator:
+    """Vectorized evaluation of ASTs over a frame; `resolved` maps nodes to precomputed columns."""
+
+    def __init__(self, frame: pd.DataFrame, resolved: Optional[Dict[Node, pd.Series]] = None):
+        self.frame = frame
+        self.resolved = resolved or {}
+        self._points: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def column(self, name: str) -> pd.Series:
+        if name not in self.frame.columns:
+            raise ValueError(f"No column {name!r}; available: {', '.join(map(str, self.frame.columns))}")
+        return self.frame[name]
+
+    def points(self, node: Node) -> Tuple[np.ndarray, np.ndarray]:
+        key = repr(node)
+        if key not in self._points:
+            self._points[key] = _points(self.eval(node))
+        return self._points[key]
+
+    def truth(self, node: Node) -> pd.Series:
+        """A condition as a nullable boolean Series; NA means unknown (a NULL was compared)."""
+        values = self.eval(node)
+        if not isinstance(values, pd.Series):
+            return pd.Series(pd.NA if values is None else bool(values), index=self.frame.index, dtype="boolean")
+        return values.astype("boolean")
+
+    def mask(self, node: Node) -> pd.Series:
+        """Rows a filter keeps: unknown counts as false only here, after AND/OR/NOT are applied."""
+        return self.truth(node).fillna(False).astype(bool)
+
+    def eval(self, node: Node):
+        if node in self.resolved:
+            return self.resolved[node]
+        kind = node[0]
+        if kind == "lit":
+            return node[1]
+        if kind == "col":
+            return self.column(node[1])
+        # Three-valued logic, like SQL: NOT unknown is unknown, so `NOT (n > 4)` skips NULL n
+        if kind == "and":
+            return self.truth(node[1]) & self.truth(node[2])
+        if kind == "or":
+            return self.truth(node[1]) | self.truth(node[2])
+        if kind == "not":
+            return ~self.truth(node[1])
+        if kind == "isnull":
+            isnull = pd.isna(self.eval(node[1]))
+            return ~isnull if node[2] else isnull
+        if kind == "cmp":
+            left, right = _coerce_pair(self.eval(node[2]), self.eval(node[3]))
+            return _unknown_if_null(COMPARISONS[node[1]](left, right), left, right)
+        if kind == "in":
+            values = self.eval(node[1])
+            options = [self.eval(v) for v in node[2]]
+            if options and all(isinstance(o, (int, float)) and not isinstance(o, bool) for o in options):
+                values = _as_number(values)
+            elif pd.api.types.is_numeric_dtype(values):
+                options = [float(o) if isinstance(o, str) else o for o in options]
+            result = _unknown_if_null(values.isin(options), values)
+            return ~result if node[3] else result
+        if kind == "between":
+            values, lo = _coerce_pair(self.eval(node[1]), self.eval(node[2]))
+            values, hi = _coerce_pair(values, self.eval(node[3]))
+            result = _unknown_if_null((values >= lo) & (values <= hi), values, lo, hi)
+            return ~result if node[4] else result
+        if kind == "like":
+            values = self.eval(node[1])
+            result = _unknown_if_null(_like(values, self.eval(node[2])), values)
+            return ~result if node[3] else result
+        if kind == "arith":
+            op, left, right = node[1], self.eval(node[2]), self.eval(node[3])
+            if op == "||":
+                return left.astype("string") + (right if not isinstance(right, pd.Series) else right.astype("string"))
+            left = _as_number(left) if isinstance(left, pd.Series) else left
+            right = _as_number(right) if isinstance(right, pd.Series) else right
+            return ARITHMETIC[op](left, right)
+        if kind == "call":
+            return self.call(node[1], node[2])
+        if kind == "star":
+            raise ValueError("* is only allowed in $select and count(*)")
+        raise ValueError(f"Unsupported expression {node!r}")
+
+    def call(self, name: str, args: Tuple[Node, ...]):
+        if name in AGGREGATES:
+            raise ValueError(f"Aggregate {name}() outside a grouped query")
+        if name in DATE_TRUNC:
+            return _as_datetime(self.eval(args[0])).dt.to_period(DATE_TRUNC[name]).dt.start_time
+        if name in DATE_EXTRACT:
+            return getattr(_as_datetime(self.eval(args[0])).dt, DATE_EXTRACT[name]).astype("Int64")
+        if name == "date_extract_dow":
+            # Socrata counts from Sunday = 0; pandas from Monday = 0
+            return ((_as_datetime(self.eval(args[0])).dt.dayofweek + 1) % 7).astype("Int64")
+        if name in ("upper", "lower"):
+            values = self.eval(args[0]).astype("string")
+            return values.str.upper() if name == "upper" else values.str.lower()
+        if name == "starts_with":
+            return self.eval(args[0]).astype("string").str.startswith(self.eval(args[1]))
+        if name == "contains":
+            return self.eval(args[0]).astype("string").str.contains(self.eval(args[1]), regex=False)
+        if name == "coalesce":
+            result = self.eval(args[0])
+            for arg in args[1:]:
+                result = result.fillna(self.eval(arg)) if isinstance(result, pd.Series) else result
+            return result
+        if name == "within_circle":
+            lat, lon = self.points(args[0])
+            center_lat, center_lon, radius = (float(self.eval(a)) for a in args[1:4])
+            return pd.Series(haversine_m(center_lat, center_lon, lat, lon) <= radius, index=self.frame.index)
+        if name == "within_box":
+            lat, lon = self.points(args[0])
+            north, west, south, east = (float(self.eval(a)) for a in args[1:5])
+            inside = (lat <= north) & (lat >= south) & (lon >= west) & (lon <= east)
+            return pd.Series(inside, index=self.frame.index)
+        if name == "within_polygon":
+            lat, lon = self.points(args[0])
+            return pd.Series(_within_polygon(lat, lon, self.eval(args[1])), index=self.frame.index)
+        if name == "distance_in_meters":
+            lat, lon = self.points(args[0])
+            (point_lat,), (point_lon,) = _points(pd.Series([self.eval(args[1])]))
+            return pd.Series(haversine_m(point_lat, point_lon, lat, lon), index=self.frame.index)
+        raise ValueError(f"Unsupported SoQL function {name}()")
+
+
+def aggregate_values(values: Optional[pd.Series], func: str, codes: np.ndarray, n_groups: int) -> pd.Series:
+    """One aggregate per group code, computed with a single groupby."""
+    if values is None:
+        return pd.Series(np.bincount(codes, minlength=n_groups), dtype="int64")
+    if func == "count":
+        valid = values.notna().to_numpy()
+        return pd.Series(np.bincount(codes[valid], minlength=n_groups), dtype="int64")
+    if func in ("min", "max") and not pd.api.types.is_numeric_dtype(values):
+        numeric = pd.to_numeric(values, errors="coerce")
+        if numeric.notna().sum() == values.notna().sum() and not pd.api.types.is_datetime64_any_dtype(values):
+            values = numeric
+    elif func not in ("min", "max"):
+        values = _as_number(values)
+    grouped = pd.Series(values.to_numpy(), index=codes).groupby(level=0)
+    if func == "std_pop":
+        result = grouped.std(ddof=0)
+    else:
+        result = getattr(grouped, func)()
+    return result.reindex(range(n_groups)).reset_index(drop=True)
+
+
+def aggregate_rows(agg: Node, evaluator: "Evaluator", codes: np.ndarray, n_groups: int) -> pd.Series:
+    """An aggregate call (e.g. sum(amount)) over the rows of each group code."""
+    arg = agg[2][0] if agg[2] else ("star",)
+    values = None if arg == ("star",) else evaluator.eval(arg)
+    if values is not None and not isinstance(values, pd.Series):
+        values = pd.Series(values, index=evaluator.frame.index)
+    return aggregate_values(values, AGGREGATES[agg[1]], codes, n_groups)
+
+
+def group_scope(
+    evaluator: "Evaluator",
+    group: List[Node],
+    aggregates: List[Node],
+    having: Optional[Node],
+    aggregate: Callable[[Node, "Evaluator", np.ndarray, int], pd.Series] = aggregate_rows,
+) -> "Evaluator":
+    """Evaluator over one row per group, with group keys and aggregates precomputed."""
+    frame = evaluator.frame
+    resolved: Dict[Node, pd.Series] = {}
+    if group:
+        keys = pd.DataFrame({
+            i: value if isinstance(value, pd.Series) else pd.Series(value, index=frame.index)
+            for i, value in enumerate(evaluator.eval(g) for g in group)
+        })
+        codes = keys.groupby(list(keys.columns), dropna=False, sort=False).ngroup().to_numpy()
+        # Groups are numbered in order of first appearance
+        _, first = np.unique(codes, return_index=True)
+        n_groups = len(first)
+        for i, g in enumerate(group):
+            resolved[g] = keys[i].iloc[first].reset_index(drop=True)
+    else:
+        codes, n_groups = np.zeros(len(frame), dtype=np.int64), 1
+
+    for agg in aggregates:
+        resolved[agg] = aggregate(agg, evaluator, codes, n_groups)
+
+    scope = Evaluator(pd.DataFrame(index=pd.RangeIndex(n_groups)), resolved)
+    if having is None:
+        return scope
+    keep = scope.mask(having).to_numpy()
+    resolved = {node: values[keep].reset_index(drop=True) for node, values in resolved.items()}
+    return Evaluator(pd.DataFrame(index=pd.RangeIndex(int(keep.sum()))), resolved)
+
+
+class ParsedQuery:
+    """SoQL parameters parsed into ASTs, with select aliases resolved in $group, $having and $order."""
+
+    def __init__(self, params: Dict[str, Union[str, int]], columns: Sequence[str] = ()):
+        self.where = parse_expression(str(params["$where"])) if params.get("$where") else None
+        self.distinct, self.items = parse_select(str(params.get("$select", "*")))
+        # Aliases may appear anywhere inside an expression (e.g. `$having=total > 2 * n`)
+        aliases = {("col", alias): node for node, alias in self.items if alias and alias not in columns}
+
+        def unalias(node: Node) -> Node:
+            return replace_nodes(node, aliases)
+
+        self.group = [unalias(parse_expression(g)) for g in _split_top_level(str(params.get("$group", "")))]
+        self.having = unalias(parse_expression(str(params["$having"]))) if params.get("$having") else None
+        self.order = [(unalias(node), desc) for node, desc in parse_order(str(params.get("$order", "")))]
+        self.offset = int(params.get("$offset", 0) or 0)
+        self.limit = int(params["$limit"]) if params.get("$limit") is not None else None
+
+        nodes = [*(n for n, _ in self.items), *(n for n, _ in self.order), *([self.having] if self.having else [])]
+        self.aggregates = list(dict.fromkeys(a for node in nodes for a in _aggregates(node)))
+
+    @property
+    def grouped(self) -> bool:
+        return bool(self.group or self.aggregates)
+
+
+def project(scope: "Evaluator", query: ParsedQuery) -> pd.DataFrame:
+    """Select, de-duplicate, order and page rows in an evaluator's scope."""
+    columns: Dict[str, pd.Series] = {}
+    for node, alias in query.items:
+        if node == ("star",):
+            for col in scope.frame.columns:
+                columns[col] = scope.frame[col]
+            continue
+        value = scope.eval(node)
+        columns[alias or output_name(node)] = value if isinstance(value, pd.Series) else \
+            pd.Series([value] * len(scope.frame))
+    result = pd.DataFrame({name: values.reset_index(drop=True) for name, values in columns.items()})
+
+    if query.distinct:
+        result = result.drop_duplicates(ignore_index=True)
+    if query.order:
+        sort_columns, ascending = [], []
+        for i, (node, desc) in enumerate(query.order):
+            if node[0] == "col" and node[1] in result.columns:
+                sort_columns.append(node[1])
+            elif query.distinct:
+                raise ValueError("With DISTINCT, $order can only use selected columns")
+            else:
+                result[f"__order{i}"] = scope.eval(node).reset_index(drop=True)
+                sort_columns.append(f"__order{i}")
+            ascending.append(not desc)
+        result = result.sort_values(sort_columns, ascending=ascending, kind="stable", na_position="last")
+        result = result.drop(columns=[c for c in result.columns if c.startswith("__order")])
+    end = query.offset + query.limit if query.limit is not None else None
+    return result.iloc[query.offset:end].reset_index(drop=True)
+
+
+def execute(df: pd.DataFrame, params: Dict[str, Union[str, int]]) -> pd.DataFrame:
+    """
+    Run SoQL parameters ($select, $where, $group, $having, $order, $limit, $offset) on a DataFrame.
+
+    Args:
+        df: Table to query
+        params: SoQL parameters as passed to `socrata.query_dataset`
+
+    Returns:
+        Result DataFrame (columns named like the portal's: alias, column name,
+        or e.g. `count` / `sum_amount` for unaliased aggregates)
+    """
+    query = ParsedQuery(params, df.columns)
+    frame = df
+    if query.where is not None:
+        frame = frame[Evaluator(frame).mask(query.where).to_numpy()]
+    if query.grouped:
+        scope = group_scope(Evaluator(frame), query.group, query.aggregates, query.having)
+    else:
+        scope = Evaluator(frame.reset_index(drop=True))
+    return project(scope, query)
+
+
+# --- tables and joins ------------------------------------------------------
+
+def infer_types(df: pd.DataFrame, datatypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Copy of a text-valued frame (such as a snapshot) with numbers and timestamps decoded.
+
+    With `datatypes` ({fieldName: dataTypeName}, e.g. from
+    `socrata.column_types`), columns are converted exactly as the portal types
+    them: number/money/percent/double become numbers and date types become
+    timestamps, while text such as `beat` ("0111") or `ward` keeps its
+    leading zeros. Without it, only columns where every value is an ISO
+    timestamp are decoded; digit strings stay text, since they may be codes.
+    """
+    out = df.copy()
+    for col in out.columns:
+        values = out[col]
+        if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+            continue
+        present = values.dropna()
+        if present.empty or not isinstance(present.iloc[0], str):
+            continue
+        if datatypes is not None:
+            datatype = datatypes.get(col, "text")
+            if datatype in NUMBER_TYPES or datatype in DATE_TYPES:
+                out[col] = convert_column(values.astype("string"), datatype)
+        elif not ID_COLUMN_RE.match(str(col)) and present.head(100).str.match(ISO_DATE_RE).all():
+            dates = pd.to_datetime(values, errors="coerce", format="ISO8601")
+            if dates.notna().sum() == len(present):
+                out[col] = dates
+    return out
+
+
+def normalize_pin(values: pd.Series) -> pd.Series:
+    """
+    Cook County PINs as 14-digit strings.
+
+    Dashes and spaces are dropped, 10-digit PINs get the "0000" unit suffix,
+    and PINs that lost leading zeros (stored as numbers) are zero-padded.
+    """
+    digits = values.astype("string").str.replace(r"\D", "", regex=True)
+    digits = digits.mask(digits.str.len() == 10, digits + "0000")
+    return digits.str.zfill(14).mask(digits == "")
+
+
+NORMALIZERS: Dict[str, Callable[[pd.Series], pd.Series]] = {
+    "pin": normalize_pin,
+    "upper": lambda values: values.astype("string").str.strip().str.upper(),
+    "text": lambda values: values.astype("string").str.strip(),
+}
+
+
+class HashIndex:
+    """
+    Rows of a table grouped by a (normalized) key column, for repeated joins.
+
+    Keys are factorized once and row positions stored sorted by key code, so
+    a join probes each distinct key of the other side once and gathers rows.
+    """
+
+    def __init__(self, values: pd.Series, normalize: Optional[Callable[[pd.Series], pd.Series]] = None):
+        codes, uniques = pd.factorize(values)
+        if normalize is not None:
+            # Keys repeat (a PIN per assessment year or sale); normalize each distinct value once
+            remap, uniques = pd.factorize(normalize(pd.Series(uniques)))
+            codes = np.append(remap, -1)[codes]
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.keys = pd.Index(uniques)
+        self.positions = np.argsort(self.codes, kind="stable")
+        # Null keys (code -1) sort first and never match
+        self.counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.keys))
+        self.starts = np.cumsum(self.counts) - self.counts + int((self.codes < 0).sum())
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, probe_index: "HashIndex") -> Tuple[np.ndarray, np.ndarray]:
+        """(probe positions, build positions) of every pair of rows with equal keys."""
+        codes = np.append(self.keys.get_indexer(probe_index.keys), -1)[probe_index.codes]
+        matched = np.flatnonzero(codes >= 0)
+        counts = self.counts[codes[matched]]
+        probe = np.repeat(matched, counts)
+        # Offset of each pair within its key's run of build rows
+        run = np.arange(len(probe)) - np.repeat(np.cumsum(counts) - counts, counts)
+        build = self.positions[np.repeat(self.starts[codes[matched]], counts) + run]
+        return probe, build
+
+
+class LocalEngine:
+    """
+    Named tables plus cached join indexes, queried with SoQL parameters.
+
+    Register snapshots or DataFrames once, then `query` and `join` run
+    entirely in memory. Join indexes are built on first use per
+    (table, column, normalizer) and reused until the table is re-registered.
+    """
+
+    def __init__(self, store_dir: str = socrata_sync.DEFAULT_STORE):
+        self.store_dir = store_dir
+        self.tables: Dict[str, pd.DataFrame] = {}
+        self._indexes: Dict[tuple, HashIndex] = {}
+
+    def register(
+        self, name: str, df: pd.DataFrame, infer: bool = True, datatypes: Optional[Dict[str, str]] = None
+    ) -> pd.DataFrame:
+        """Add (or replace) a table; text columns are decoded with `infer_types(df, datatypes)` unless `infer=False`."""
+        self.tables[name] = infer_types(df, datatypes) if infer else df
+        self._indexes = {key: index for key, index in self._indexes.items() if key[0] != name}
+        return self.tables[name]
+
+    def register_snapshot(
+        self,
+        domain: str,
+        dataset_id: str,
+        name: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Register a `socrata_sync` snapshot as a table.
+
+        Columns are typed by the dataset's schema (`socrata_catalog.get_schema`,
+        saved after the first lookup), so results match the portal's.
+
+        Args:
+            domain: Portal domain the dataset was synced from
+            dataset_id: Dataset identifier (e.g., "uzyt-m557")
+            name: Table name for queries and joins (default: dataset_id)
+            columns: Load only these columns (Parquet is read column by column)
+
+        Returns:
+            The registered table
+        """
+        df = socrata_sync.load_snapshot(domain, dataset_id, self.store_dir, columns=columns)
+        if df.empty:
+            path = os.path.join(self.store_dir, domain, f"{dataset_id}.parquet")
+            raise FileNotFoundError(f"No snapshot at {path}; run socrata_sync.sync_dataset first")
+        try:
+            schema = socrata_catalog.get_schema(domain, dataset_id)
+        except Exception as exc:
+            print(f"Warning: no schema for {dataset_id} ({exc}); numbers stay text")
+            schema = []
+        datatypes = {c["fieldName"]: c.get("dataTypeName", "text") for c in schema}
+        datatypes.update({":id": "text", ":created_at": "fixed_timestamp", ":updated_at": "fixed_timestamp"})
+        return self.register(name or dataset_id, df, datatypes=datatypes)
+
+    def table(self, name: str) -> pd.DataFrame:
+        if name not in self.tables:
+            raise KeyError(f"No table {name!r}; registered: {', '.join(self.tables) or 'none'}")
+        return self.tables[name]
+
+    def index(self, table: str, column: str, normalize: Union[str, Callable, None] = None) -> HashIndex:
+        """Hash index on a table column, built once (see `NORMALIZERS` for named key normalizers)."""
+        key = (table, column, normalize)
+        if key not in self._indexes:
+            func = NORMALIZERS[normalize] if isinstance(normalize, str) else normalize
+            self._indexes[key] = HashIndex(self.table(table)[column], func)
+        return self._indexes[key]
+
+    def join(
+        self,
+        left: str,
+        right: str,
+        on: str,
+        right_on: Optional[str] = None,
+        how: str = "inner",
+        normalize: Union[str, Callable, None] = None,
+        name: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Hash join of two tables on a key column.
+
+        Both tables' key indexes are cached, so repeating a join (or joining
+        another table to the same one) skips hashing and normalizing keys.
+
+        Args:
+            left, right: Registered table names
+            on: Key column in `left` (and in `right` unless `right_on` is given)
+            right_on: Key column in `right`
+            how: "inner" or "left"
+            normalize: Key normalizer applied to both sides ("pin", "upper",
+                "text" or a function of a Series)
+            name: Register the result under this table name
+
+        Returns:
+            Joined DataFrame; right-table columns that clash with left ones get
+            a `_<right>` suffix
+        """
+        if how not in ("inner", "left"):
+            raise ValueError("how must be 'inner' or 'left'")
+        right_on = right_on or on
+        left_df, right_df = self.table(left), self.table(right)
+        probe, build = self.index(right, right_on, normalize).lookup(self.index(left, on, normalize))
+
+        if how == "left":
+            unmatched = np.setdiff1d(np.arange(len(left_df)), probe, assume_unique=False)
+            probe = np.concatenate([probe, unmatched])
+            build = np.concatenate([build, np.full(len(unmatched), -1)])
+            order = np.argsort(probe, kind="stable")
+            probe, build = probe[order], build[order]
+
+        out = left_df.iloc[probe].reset_index(drop=True)
+        right_columns = [c for c in right_df.columns if not (c == right_on and right_on == on)]
+        if how == "left":
+            matched = build >= 0
+            right_part = right_df[right_columns].iloc[np.where(matched, build, 0)].reset_index(drop=True)
+            right_part = right_part.where(pd.Series(matched), other=pd.NA) if len(right_part) else right_part
+        else:
+            right_part = right_df[right_columns].iloc[build].reset_index(drop=True)
+        for col in right_columns:
+            out[f"{col}_{right}" if col in out.columns else col] = right_part[col]
+
+        if name:
+            self.register(name, out, infer=False)
+        return out
+
+    def query(self, table: str, params: Dict[str, Union[str, int]]) -> pd.DataFrame:
+        """Run SoQL parameters against a registered table (see `execute`)."""
+        return execute(self.table(table), params)
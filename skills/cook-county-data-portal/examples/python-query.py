@@ -1,8 +1,11 @@
-"""Cook County Data Portal query examples using requests + pandas."""
+"""Cook County Data Portal query examples using pandas and the shared HTTP client."""
 
-import requests
 import pandas as pd
 
+import http_client
+import socrata
+import socrata_catalog
+
 # Optional: Set your app token for higher rate limits
 APP_TOKEN = None  # or "your-token-here"
 HEADERS = {"X-App-Token": APP_TOKEN} if APP_TOKEN else {}
@@ -13,7 +16,7 @@ BASE_URL = "https://datacatalog.cookcountyil.gov/resource"
 def query_dataset(dataset_id: str, params: dict) -> pd.DataFrame:
     """Query a Cook County dataset and return as DataFrame."""
     url = f"{BASE_URL}/{dataset_id}.json"
-    resp = requests.get(url, params=params, headers=HEADERS)
+    resp = http_client.get(url, params=params, headers=HEADERS)
     resp.raise_for_status()
     return pd.DataFrame(resp.json())
 
@@ -21,7 +24,7 @@ def query_dataset(dataset_id: str, params: dict) -> pd.DataFrame:
 def get_metadata(dataset_id: str) -> dict:
     """Fetch dataset metadata including columns."""
     url = f"https://datacatalog.cookcountyil.gov/api/views/{dataset_id}"
-    resp = requests.get(url, headers=HEADERS)
+    resp = http_client.get(url, headers=HEADERS)
     resp.raise_for_status()
     return resp.json()
 
@@ -85,51 +88,25 @@ def main():
     print(f"Sentences: {len(sentences)} rows")
 
 def get_all_pages(dataset_id: str, base_params: dict, page_size: int = 1000):
-    """Fetch all rows with pagination."""
-    all_data = []
-    offset = 0
-
-    # Ensure stable ordering for pagination
-    if "$order" not in base_params:
-        raise ValueError("Pagination requires $order parameter for stability")
+    """Fetch all rows with keyset pagination on :id (see socrata.py).
 
-    while True:
-        params = {**base_params, "$limit": page_size, "$offset": offset}
-        df = query_dataset(dataset_id, params)
-        if df.empty:
-            break
+    Each request continues from the last :id seen instead of using $offset,
+    so deep pages cost the same as the first and no row cap is needed.
+    """
+    all_data = []
+    fetched = 0
+    for df in socrata.iter_pages(socrata.COOK_COUNTY, dataset_id, base_params, page_size):
         all_data.append(df)
-        offset += page_size
-        print(f"Fetched {offset} rows...")
-
-        # Safety limit
-        if offset > 100000:
-            print("Reached 100k row limit. Use CSV export for larger datasets.")
-            break
+        fetched += len(df)
+        print(f"Fetched {fetched} rows...")
 
     return pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame()
 
 
 def search_datasets(query: str, limit: int = 10) -> list:
-    """Search Cook County datasets by keyword."""
-    url = "https://api.us.socrata.com/api/catalog/v1"
-    params = {
-        "domains": "datacatalog.cookcountyil.gov",
-        "q": query,
-        "limit": limit
-    }
-    resp = requests.get(url, params=params, headers=HEADERS)
-    resp.raise_for_status()
-
-    results = []
-    for item in resp.json().get("results", []):
-        resource = item.get("resource", {})
-        results.append({
-            "name": resource.get("name"),
-            "id": resource.get("id"),
-            "description": resource.get("description", "")[:200]
-        })
-    return results
+    """Search Cook County datasets by keyword in the local catalog index."""
+    results = socrata_catalog.get_index(socrata.COOK_COUNTY).search(query, limit)
+    return results[["name", "id", "description"]].to_dict("records")
 
 
 if __name__ == "__main__":
@@ -138,10 +115,13 @@ if __name__ == "__main__":
     # Example 7: Paginate through large results
     print("\nPagination example (commented out to avoid long runtime):")
     # all_2024_sales = get_all_pages("wvhk-k5uv", {
-    #     "$where": "sale_date >= '2024-01-01' AND sale_date < '2025-01-01'",
-    #     "$order": "sale_date, pin"
+    #     "$where": "sale_date >= '2024-01-01' AND sale_date < '2025-01-01'"
     # })
 
+    # For full assessor tables, stream the CSV export in chunks instead:
+    # for chunk in socrata.stream_export(socrata.COOK_COUNTY, "uzyt-m557", chunksize=100000):
+    #     chunk.to_csv("assessed_values.csv", mode="a", header=chunk.index[0] == 0, index=False)
+
     # Example 8: Using sodapy library (if installed)
     try:
         from sodapy import Socrata
@@ -152,7 +132,24 @@ if __name__ == "__main__":
     except ImportError:
         print("\nsodapy not installed. Using requests instead.")
 
-    # Example 9: Search for datasets
+    # Example 9: Run report queries together (concurrent, duplicates sent once)
+    from socrata_batch import run_batch
+
+    report, timings = run_batch(socrata.COOK_COUNTY, {
+        "deaths_by_manner": ("cjeq-bs86", {
+            "$select": "manner, count(*) as count",
+            "$where": "death_date >= '2024-01-01'",
+            "$group": "manner",
+        }),
+        "payroll_by_bureau": ("xu6t-uvny", {
+            "$select": "bureau, sum(base_pay) as total_pay, count(*) as employees",
+            "$where": "fiscal_year = 2024",
+            "$group": "bureau",
+        }),
+    })
+    print(timings[["name", "rows", "seconds"]])
+
+    # Example 10: Search for datasets
     print("\nSearching for property datasets:")
     property_datasets = search_datasets("property assessment")
     for ds in property_datasets[:5]:
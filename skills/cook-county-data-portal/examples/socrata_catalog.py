@@ -0,0 +1,211 @@
+"""Offline dataset catalog for the Socrata portals.
+
+Syncs a portal's listing from the Socrata Discovery API
+(`api.us.socrata.com/api/catalog/v1`) into a local JSON file once, then
+answers dataset lookups from an in-memory index (`dataset_index.py`) with no
+network round trip:
+
+    from socrata import COOK_COUNTY
+    from socrata_catalog import get_index, get_schema, prefetch_schemas
+
+    index = get_index(COOK_COUNTY)                # syncs on first use, then reads the file
+    index.search("parcel sales")                  # ranked over id, name, columns, description
+    index.contains("pin10")                       # substring match
+    prefetch_schemas(COOK_COUNTY)                 # column types for every dataset, concurrently
+    get_schema(COOK_COUNTY, "wvhk-k5uv")          # [{"fieldName", "name", "dataTypeName"}, ...]
+
+The catalog file lives under the query cache directory and is re-synced when
+older than `MAX_AGE` (or with `refresh=True`). `get_schema` fetches only the
+dataset it is asked about (no catalog sync), and a re-sync drops saved
+schemas of datasets whose metadata changed since they were fetched.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import http_client
+import query_cache
+import socrata
+from dataset_index import DatasetIndex
+
+CATALOG_DIR = os.path.join(query_cache.CACHE_DIR, "catalogs")
+
+# Re-sync the listing after a week; datasets are added far less often than that
+MAX_AGE = 7 * 24 * 3600
+
+# Results per Discovery API request
+CATALOG_PAGE_SIZE = 100
+
+_indexes: Dict[str, DatasetIndex] = {}
+
+
+def _catalog_path(domain: str) -> str:
+    return os.path.join(CATALOG_DIR, f"socrata_{domain}.json")
+
+
+def _write_atomic(catalog: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(catalog, f)
+    os.replace(tmp, path)
+
+
+def _record(item: dict) -> dict:
+    """Flatten one Discovery API result into an index record."""
+    resource = item.get("resource", {})
+    classification = item.get("classification", {})
+    return {
+        "id": resource.get("id"),
+        "name": resource.get("name") or "",
+        "description": resource.get("description") or "",
+        "type": resource.get("type"),
+        "updated_at": resource.get("updatedAt"),
+        "metadata_updated_at": resource.get("metadata_updated_at") or resource.get("updatedAt"),
+        "category": classification.get("domain_category"),
+        "columns": resource.get("columns_field_name") or [],
+        "column_names": resource.get("columns_name") or [],
+        "column_types": resource.get("columns_datatype") or [],
+    }
+
+
+def sync_catalog(domain: str) -> dict:
+    """Download the portal's full dataset listing and save it locally."""
+    records: List[dict] = []
+    offset = 0
+    while True:
+        params = {
+            "domains": domain,
+            "search_context": domain,
+            "only": "dataset",
+            "limit": CATALOG_PAGE_SIZE,
+            "offset": offset,
+        }
+        resp = http_client.get(socrata.CATALOG_URL, params=params, headers=socrata.get_headers(domain))
+        resp.raise_for_status()
+        results = resp.json().get("results", [])
+        records.extend(_record(item) for item in results)
+        if len(results) < CATALOG_PAGE_SIZE:
+            break
+        offset += CATALOG_PAGE_SIZE
+
+    old = load_catalog(domain) or {}
+    fetched_at = old.get("schema_fetched_at", {})
+    changed = {r["id"]: _timestamp(r.get("metadata_updated_at")) for r in records}
+    # Keep a saved schema only if the dataset still exists and its metadata is older than the schema
+    schemas = {
+        i: schema for i, schema in old.get("schemas", {}).items()
+        if i in changed and changed[i] <= fetched_at.get(i, 0)
+    }
+    catalog = {
+        "domain": domain, "synced_at": time.time(), "datasets": records,
+        "schemas": schemas, "schema_fetched_at": {i: fetched_at[i] for i in schemas if i in fetched_at},
+    }
+    _write_atomic(catalog, _catalog_path(domain))
+    _indexes.pop(domain, None)
+    return catalog
+
+
+def _timestamp(value: Optional[str]) -> float:
+    """Epoch seconds of a Discovery API timestamp; unknown counts as newest."""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return float("inf")
+
+
+def load_catalog(domain: str) -> Optional[dict]:
+    """The saved catalog for a portal, or None if it was never synced."""
+    path = _catalog_path(domain)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def get_index(domain: str, refresh: bool = False, max_age: int = MAX_AGE) -> DatasetIndex:
+    """
+    Search index over a portal's datasets, syncing the catalog when missing or stale.
+
+    Args:
+        domain: Portal domain (e.g., CHICAGO or COOK_COUNTY)
+        refresh: Re-sync from the Discovery API now
+        max_age: Seconds before a saved catalog is re-synced
+
+    Returns:
+        DatasetIndex, kept in memory for the rest of the process
+    """
+    if domain in _indexes and not refresh:
+        return _indexes[domain]
+    catalog = None if refresh else load_catalog(domain)
+    if catalog is None or time.time() - catalog.get("synced_at", 0) > max_age:
+        catalog = sync_catalog(domain)
+    _indexes[domain] = DatasetIndex(catalog["datasets"])
+    return _indexes[domain]
+
+
+def _schema(domain: str, dataset_id: str) -> List[dict]:
+    columns = socrata.get_metadata(domain, dataset_id).get("columns", [])
+    return [
+        {"fieldName": c["fieldName"], "name": c.get("name"), "dataTypeName": c.get("dataTypeName", "text")}
+        for c in columns
+    ]
+
+
+def prefetch_schemas(
+    domain: str,
+    dataset_ids: Optional[List[str]] = None,
+    max_workers: int = 8,
+    refresh: bool = False,
+) -> Dict[str, List[dict]]:
+    """
+    Fetch column schemas (`get_metadata`) for many datasets concurrently and save them.
+
+    Only fetching every dataset (`dataset_ids=None`) needs the catalog
+    listing; explicit ids are fetched without syncing it.
+
+    Args:
+        domain: Portal domain
+        dataset_ids: Datasets to fetch (default: every dataset in the catalog)
+        max_workers: Concurrent metadata requests
+        refresh: Re-fetch schemas that are already saved
+
+    Returns:
+        {dataset_id: [{"fieldName", "name", "dataTypeName"}, ...]}
+    """
+    if dataset_ids is None:
+        get_index(domain)
+    catalog = load_catalog(domain) or {"domain": domain, "synced_at": 0, "datasets": []}
+    schemas = catalog.setdefault("schemas", {})
+    fetched_at = catalog.setdefault("schema_fetched_at", {})
+    ids = dataset_ids or [r["id"] for r in catalog["datasets"]]
+    todo = [i for i in ids if refresh or i not in schemas]
+
+    def fetch(dataset_id: str):
+        try:
+            return dataset_id, _schema(domain, dataset_id)
+        except Exception as exc:
+            print(f"Warning: no schema for {dataset_id}: {exc}")
+            return dataset_id, None
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for dataset_id, schema in pool.map(fetch, todo):
+            if schema is not None:
+                schemas[dataset_id] = schema
+                fetched_at[dataset_id] = started
+    if todo:
+        _write_atomic(catalog, _catalog_path(domain))
+    return {i: schemas[i] for i in ids if i in schemas}
+
+
+def get_schema(domain: str, dataset_id: str) -> List[dict]:
+    """Column schema of one dataset, from the saved catalog or fetched (alone) and saved."""
+    catalog = load_catalog(domain)
+    if catalog and dataset_id in catalog.get("schemas", {}):
+        return catalog["schemas"][dataset_id]
+    return prefetch_schemas(domain, [dataset_id]).get(dataset_id, [])
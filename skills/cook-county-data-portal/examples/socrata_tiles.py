@@ -0,0 +1,306 @@
+"""Spatial tiling fetcher and local point index for Socrata point datasets.
+
+Pulling every crime or 311 point in the city through one `$where` means one
+long keyset-paged scan. This module splits a bounding box into quadtree tiles
+with `within_box`, subdividing any tile whose `count(*)` is over a threshold,
+fetches the leaf tiles concurrently over the pooled client, and loads the
+points into a grid index for radius lookups without going back to the server:
+
+    from socrata import CHICAGO
+    from socrata_tiles import CHICAGO_BBOX, PointIndex, fetch_tiles
+
+    thefts = fetch_tiles(CHICAGO, "ijzp-q8t2", {
+        "$select": "id, date, primary_type, latitude, longitude, location",
+        "$where": "year = 2024 AND primary_type = 'THEFT'",
+    }, bbox=CHICAGO_BBOX)
+
+    index = PointIndex(thefts)                            # latitude / longitude columns
+    index.within_radius(41.8781, -87.6298, 500)           # rows within 500 m, with distance_m
+    index.count_within(41.8781, -87.6298, 500)
+
+Boxes are (north, west, south, east) in degrees, the argument order of
+`within_box`. Rows without a location, or outside the box, are not fetched.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import socrata
+
+Box = Tuple[float, float, float, float]
+
+# City of Chicago and Cook County extents (north, west, south, east)
+CHICAGO_BBOX: Box = (42.0230, -87.9400, 41.6440, -87.5240)
+COOK_COUNTY_BBOX: Box = (42.1550, -88.2640, 41.4690, -87.5240)
+
+# Meters per degree of latitude; longitude is scaled by cos(latitude)
+METERS_PER_DEGREE = 111_320.0
+EARTH_RADIUS_M = 6_371_008.8
+
+
+def within_box(location_column: str, box: Box) -> str:
+    """SoQL `within_box` condition for a (north, west, south, east) box."""
+    north, west, south, east = box
+    return f"within_box({location_column}, {north!r}, {west!r}, {south!r}, {east!r})"
+
+
+def _and(*clauses: Optional[str]) -> Optional[str]:
+    parts = [f"({c})" for c in clauses if c]
+    return " AND ".join(parts) if parts else None
+
+
+def _quarters(box: Box) -> List[Box]:
+    north, west, south, east = box
+    mid_lat, mid_lon = (north + south) / 2, (west + east) / 2
+    return [
+        (north, west, mid_lat, mid_lon),
+        (north, mid_lon, mid_lat, east),
+        (mid_lat, west, south, mid_lon),
+        (mid_lat, mid_lon, south, east),
+    ]
+
+
+def plan_tiles(
+    domain: str,
+    dataset_id: str,
+    bbox: Box,
+    location_column: str = "location",
+    where: Optional[str] = None,
+    max_rows_per_tile: int = 50000,
+    max_depth: int = 8,
+    max_workers: int = 8,
+) -> List[Tuple[Box, int]]:
+    """
+    Split a bounding box into quadtree tiles holding at most `max_rows_per_tile` rows.
+
+    Each level of the tree is counted concurrently (one `count(*)` per tile);
+    tiles over the threshold are split into four and counted again, empty
+    tiles are dropped. Tiles still over the threshold at `max_depth` are kept
+    as they are and paged normally when fetched.
+
+    Args:
+        domain: Portal domain (e.g., socrata.CHICAGO)
+        dataset_id: 4x4 dataset ID
+        bbox: (north, west, south, east)
+        location_column: Point column used by `within_box`
+        where: Base filter applied to every tile
+        max_rows_per_tile: Split tiles with more rows than this
+        max_depth: Maximum number of splits
+        max_workers: Concurrent count requests (keep <= http_client.POOL_SIZE)
+
+    Returns:
+        List of (box, row count) leaf tiles
+    """
+    def count(box: Box) -> Tuple[Box, int]:
+        df = socrata.query_dataset(domain, dataset_id, {
+            "$select": "count(*) as n",
+            "$where": _and(where, within_box(location_column, box)),
+        })
+        return box, int(df["n"].iloc[0]) if not df.empty else 0
+
+    leaves: List[Tuple[Box, int]] = []
+    level = [bbox]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for depth in range(max_depth + 1):
+            split = []
+            for box, n in pool.map(count, level):
+                if n == 0:
+                    continue
+                if n > max_rows_per_tile and depth < max_depth:
+                    split.extend(_quarters(box))
+                else:
+                    leaves.append((box, n))
+            if not split:
+                break
+            level = split
+    return leaves
+
+
+def fetch_tiles(
+    domain: str,
+    dataset_id: str,
+    params: Optional[dict] = None,
+    bbox: Box = CHICAGO_BBOX,
+    location_column: str = "location",
+    max_rows_per_tile: int = 50000,
+    max_depth: int = 8,
+    max_workers: int = 8,
+    page_size: int = 10000,
+) -> pd.DataFrame:
+    """
+    Fetch a query's rows inside a bounding box as concurrently fetched quadtree tiles.
+
+    Leaf tiles from `plan_tiles` are paged with keyset pagination
+    (`socrata.get_all_pages`) on a bounded thread pool. `within_box` includes
+    tile edges, so rows on a shared edge are de-duplicated on `:id`.
+
+    Args:
+        domain: Portal domain (e.g., socrata.CHICAGO)
+        dataset_id: 4x4 dataset ID (e.g., "ijzp-q8t2")
+        params: SoQL parameters; `$select` and `$where` are honored
+        bbox: (north, west, south, east)
+        location_column: Point column used by `within_box`
+        max_rows_per_tile: Split tiles with more rows than this
+        max_depth: Maximum number of splits
+        max_workers: Concurrent requests (keep <= http_client.POOL_SIZE)
+        page_size: Rows per request within a tile
+
+    Returns:
+        DataFrame with all matching rows inside the box
+    """
+    params = dict(params or {})
+    where = params.pop("$where", None)
+    select = params.pop("$select", None)
+    keep_id = select is not None and ":id" in [c.strip() for c in select.split(",")]
+    params["$select"] = select if keep_id else f":id, {select or '*'}"
+
+    tiles = plan_tiles(domain, dataset_id, bbox, location_column, where,
+                       max_rows_per_tile, max_depth, max_workers)
+    if not tiles:
+        return pd.DataFrame()
+
+    def fetch_tile(tile: Tuple[Box, int]) -> pd.DataFrame:
+        tile_where = _and(where, within_box(location_column, tile[0]))
+        return socrata.get_all_pages(domain, dataset_id, {**params, "$where": tile_where}, page_size)
+
+    # Largest tiles first so the slowest ones don't start last
+    tiles.sort(key=lambda t: -t[1])
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tiles))) as pool:
+        frames = [df for df in pool.map(fetch_tile, tiles) if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True).drop_duplicates(":id", ignore_index=True)
+    return df if keep_id else df.drop(columns=":id")
+
+
+def coordinates(
+    df: pd.DataFrame,
+    lat_column: str = "latitude",
+    lon_column: str = "longitude",
+    location_column: str = "location",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Latitude and longitude arrays of a frame's rows (NaN where missing).
+
+    Uses `lat_column` / `lon_column` when present, otherwise the point column
+    (GeoJSON `{"coordinates": [lon, lat]}` or `{"latitude", "longitude"}`).
+    """
+    if lat_column in df.columns and lon_column in df.columns:
+        lat = pd.to_numeric(df[lat_column], errors="coerce")
+        lon = pd.to_numeric(df[lon_column], errors="coerce")
+        return lat.to_numpy(dtype="float64"), lon.to_numpy(dtype="float64")
+    if location_column not in df.columns:
+        raise ValueError(f"No {lat_column}/{lon_column} or {location_column} columns to locate rows")
+
+    def point(value) -> Tuple[float, float]:
+        if not isinstance(value, dict):
+            return math.nan, math.nan
+        if "coordinates" in value:
+            lon, lat = value["coordinates"][:2]
+            return float(lat), float(lon)
+        try:
+            return float(value["latitude"]), float(value["longitude"])
+        except (KeyError, TypeError, ValueError):
+            return math.nan, math.nan
+
+    points = np.array([point(v) for v in df[location_column]], dtype="float64").reshape(-1, 2)
+    return points[:, 0], points[:, 1]
+
+
+def haversine_m(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in meters (vectorized)."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+class PointIndex:
+    """
+    Uniform-grid spatial index over the points of a DataFrame.
+
+    Points are bucketed into square cells of `cell_meters` and sorted by cell,
+    so a radius lookup reads only the cells overlapping the circle's bounding
+    square and computes exact distances for those points.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        cell_meters: float = 250.0,
+        lat_column: str = "latitude",
+        lon_column: str = "longitude",
+        location_column: str = "location",
+    ):
+        lat, lon = coordinates(df, lat_column, lon_column, location_column)
+        located = ~(np.isnan(lat) | np.isnan(lon))
+        self.df = df.loc[located].reset_index(drop=True)
+        self.lat, self.lon = lat[located], lon[located]
+        self.cell_meters = cell_meters
+
+        # Equirectangular projection around the data's mean latitude
+        ref_lat = float(self.lat.mean()) if len(self.lat) else 0.0
+        self._lat_step = cell_meters / METERS_PER_DEGREE
+        self._lon_step = cell_meters / (METERS_PER_DEGREE * math.cos(math.radians(ref_lat)))
+
+        rows, cols = self._cells(self.lat, self.lon)
+        self._col_offset = int(cols.min()) if len(cols) else 0
+        self._width = int(cols.max()) - self._col_offset + 1 if len(cols) else 1
+        keys = rows * self._width + (cols - self._col_offset)
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def _cells(self, lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+        rows = np.floor(np.asarray(lat) / self._lat_step).astype("int64")
+        cols = np.floor(np.asarray(lon) / self._lon_step).astype("int64")
+        return rows, cols
+
+    def _candidates(self, lat: float, lon: float, meters: float) -> np.ndarray:
+        """Positions of points in cells overlapping the query circle's bounding square."""
+        dlat = meters / METERS_PER_DEGREE
+        dlon = meters / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        (row_lo, row_hi), (col_lo, col_hi) = self._cells([lat - dlat, lat + dlat], [lon - dlon, lon + dlon])
+        col_lo = max(int(col_lo) - self._col_offset, 0)
+        col_hi = min(int(col_hi) - self._col_offset, self._width - 1)
+        if col_lo > col_hi:
+            return np.empty(0, dtype="int64")
+
+        # Within one grid row, the overlapping cells are one contiguous run of keys
+        rows = np.arange(row_lo, row_hi + 1, dtype="int64")
+        starts = np.searchsorted(self._keys, rows * self._width + col_lo, side="left")
+        ends = np.searchsorted(self._keys, rows * self._width + col_hi, side="right")
+        spans = [self._order[s:e] for s, e in zip(starts, ends) if e > s]
+        return np.concatenate(spans) if spans else np.empty(0, dtype="int64")
+
+    def within_radius(self, lat: float, lon: float, meters: float, sort: bool = True) -> pd.DataFrame:
+        """
+        Rows within `meters` of a point, with a `distance_m` column.
+
+        Args:
+            lat, lon: Center in degrees
+            meters: Radius in meters
+            sort: Order by distance, nearest first
+        """
+        positions = self._candidates(lat, lon, meters)
+        distance = haversine_m(lat, lon, self.lat[positions], self.lon[positions])
+        hit = distance <= meters
+        positions, distance = positions[hit], distance[hit]
+        if sort:
+            order = np.argsort(distance, kind="stable")
+            positions, distance = positions[order], distance[order]
+        out = self.df.iloc[positions].reset_index(drop=True)
+        out["distance_m"] = distance.round(1)
+        return out
+
+    def count_within(self, lat: float, lon: float, meters: float) -> int:
+        """Number of rows within `meters` of a point."""
+        positions = self._candidates(lat, lon, meters)
+        distance = haversine_m(lat, lon, self.lat[positions], self.lon[positions])
+        return int((distance <= meters).sum())
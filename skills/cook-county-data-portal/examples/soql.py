@@ -0,0 +1,240 @@
+"""Typed SoQL query builder.
+
+Builds `$select` / `$where` / `$group` / `$having` / `$order` from Python
+calls instead of hand-written strings. Column names are checked against the
+dataset's cached schema (`socrata_catalog.get_schema`), literals are quoted
+according to each column's datatype, filters and aggregates are pushed to the
+server, and equivalent queries produce the same canonical parameters, so
+they also share one query-cache entry:
+
+    from socrata import CHICAGO
+    from soql import Query
+
+    q = (Query(CHICAGO, "ijzp-q8t2")
+         .where("year", "==", 2024)
+         .where("primary_type", "in", ["THEFT", "BATTERY"])
+         .group("primary_type", "ward")
+         .agg(total=("*", "count"))
+         .order("total", desc=True)
+         .limit(50))
+    q.params()     # {"$select": "`primary_type`, `ward`, count(*) AS total", "$where": ...}
+    df = q.run()
+
+Call `.prune(columns)` to drop selected columns a caller doesn't use.
+"""
+
+import difflib
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import pandas as pd
+
+import query_cache
+import socrata
+import socrata_catalog
+
+# Socrata system fields, always valid
+SYSTEM_FIELDS = {":id", ":created_at", ":updated_at"}
+
+NUMBER_TYPES = {"number", "money", "percent", "double"}
+DATE_TYPES = {"calendar_date", "floating_timestamp", "fixed_timestamp", "date"}
+
+COMPARISONS = {"==": "=", "=": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+# pandas-style aggregation names -> SoQL functions
+AGGREGATES = {
+    "count": "count", "size": "count", "sum": "sum", "mean": "avg", "avg": "avg",
+    "min": "min", "max": "max", "stddev": "stddev_samp", "std": "stddev_samp",
+}
+
+
+class Query:
+    """A SoQL query against one dataset, built step by step."""
+
+    def __init__(self, domain: str, dataset_id: str, validate: bool = True):
+        self.domain = domain
+        self.dataset_id = dataset_id
+        self._types: Optional[Dict[str, str]] = None
+        self._validate = validate
+        self._select: List[str] = []
+        self._aggregates: Dict[str, str] = {}
+        self._aggregate_types: Dict[str, Optional[str]] = {}
+        self._where: List[str] = []
+        self._group: List[str] = []
+        self._having: List[Tuple[str, str]] = []
+        self._order: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+
+    # --- schema -------------------------------------------------------------
+
+    @property
+    def types(self) -> Dict[str, str]:
+        """{fieldName: dataTypeName} from the cached schema."""
+        if self._types is None:
+            schema = socrata_catalog.get_schema(self.domain, self.dataset_id)
+            self._types = {c["fieldName"]: c.get("dataTypeName", "text") for c in schema}
+        return self._types
+
+    def _check(self, column: str) -> str:
+        if not self._validate or column in SYSTEM_FIELDS or column in self._aggregates:
+            return column
+        if column not in self.types:
+            close = difflib.get_close_matches(column, list(self.types), n=3)
+            hint = f"; did you mean {', '.join(close)}?" if close else ""
+            raise ValueError(f"{self.dataset_id} has no column {column!r}{hint}")
+        return column
+
+    def literal(self, column: str, value) -> str:
+        """Format a Python value as a SoQL literal for a column's datatype."""
+        if value is None:
+            return "NULL"
+        if column in self._aggregate_types:
+            datatype = self._aggregate_types[column]
+        else:
+            datatype = self.types.get(column, "text") if self._validate else None
+        if isinstance(value, bool) or datatype == "checkbox":
+            return "true" if value in (True, "true", "True") else "false"
+        if datatype in DATE_TYPES or isinstance(value, date):
+            return socrata.soql_quote(pd.Timestamp(value).strftime("%Y-%m-%dT%H:%M:%S"))
+        if datatype in NUMBER_TYPES or (datatype is None and isinstance(value, (int, float))):
+            number = float(value)
+            return str(int(number)) if number.is_integer() else repr(number)
+        return socrata.soql_quote(value)
+
+    # --- building -----------------------------------------------------------
+
+    def select(self, *columns: str) -> "Query":
+        """Columns to return (instead of every column)."""
+        for col in columns:
+            if col not in self._select:
+                self._select.append(self._check(col))
+        return self
+
+    def where(self, column: str, op: str = None, value=None) -> "Query":
+        """
+        Add a filter; all filters are ANDed.
+
+        Ops: ==, !=, <, <=, >, >=, in, not in, between (value=(lo, hi)),
+        isnull, notnull, startswith, contains. With only `column`, the
+        argument is taken as a raw SoQL condition.
+        """
+        if op is None:
+            self._where.append(column.strip())
+            return self
+        col = f"`{self._check(column)}`" if not column.startswith(":") else column
+        op = op.lower()
+        if op in COMPARISONS:
+            clause = f"{col} {COMPARISONS[op]} {self.literal(column, value)}"
+        elif op in ("in", "not in"):
+            values = ", ".join(self.literal(column, v) for v in sorted(set(value), key=str))
+            clause = f"{col} {op.upper()} ({values})"
+        elif op == "between":
+            lo, hi = value
+            clause = f"{col} BETWEEN {self.literal(column, lo)} AND {self.literal(column, hi)}"
+        elif op == "isnull":
+            clause = f"{col} IS NULL"
+        elif op == "notnull":
+            clause = f"{col} IS NOT NULL"
+        elif op in ("startswith", "contains"):
+            pattern = f"{value}%" if op == "startswith" else f"%{value}%"
+            clause = f"{col} like {socrata.soql_quote(pattern)}"
+        else:
+            raise ValueError(f"Unsupported operator {op!r}")
+        self._where.append(clause)
+        return self
+
+    def group(self, *columns: str) -> "Query":
+        """Group by columns; grouped columns are selected automatically."""
+        for col in columns:
+            if col not in self._group:
+                self._group.append(self._check(col))
+        return self
+
+    def agg(self, **aggregates: Tuple[str, str]) -> "Query":
+        """Add aggregates as alias=(column, func), e.g. total=("*", "count"), pay=("base_pay", "sum")."""
+        for alias, (column, func) in aggregates.items():
+            if func not in AGGREGATES:
+                raise ValueError(f"Unsupported aggregate {func!r}; use one of {', '.join(AGGREGATES)}")
+            target = "*" if column == "*" else f"`{self._check(column)}`"
+            self._aggregates[alias] = f"{AGGREGATES[func]}({target})"
+            # min/max keep the column's type; the other aggregates are numbers
+            if func in ("min", "max") and column != "*":
+                self._aggregate_types[alias] = self.types.get(column, "text") if self._validate else None
+            else:
+                self._aggregate_types[alias] = "number"
+        return self
+
+    def having(self, alias: str, op: str, value) -> "Query":
+        """Filter on an aggregate alias after grouping; `value` is quoted like in `where`."""
+        if alias not in self._aggregates:
+            raise ValueError(f"{alias!r} is not an aggregate alias")
+        if op not in COMPARISONS:
+            raise ValueError(f"Unsupported operator {op!r}")
+        literal = self.literal(alias, value)
+        self._having.append((alias, f"{self._aggregates[alias]} {COMPARISONS[op]} {literal}"))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "Query":
+        self._order.append((self._check(column), desc))
+        return self
+
+    def limit(self, n: int) -> "Query":
+        self._limit = int(n)
+        return self
+
+    def prune(self, used: Iterable[str]) -> "Query":
+        """Keep only the selected columns (and aggregates) a caller actually uses."""
+        used = set(used)
+        self._select = [c for c in self._select if c in used or c in self._group]
+        needed = used | {alias for alias, _ in self._having} | {c for c, _ in self._order}
+        self._aggregates = {a: e for a, e in self._aggregates.items() if a in needed}
+        self._aggregate_types = {a: t for a, t in self._aggregate_types.items() if a in needed}
+        return self
+
+    # --- output -------------------------------------------------------------
+
+    def params(self) -> Dict[str, str]:
+        """Canonical SoQL parameters: filters sorted and de-duplicated, no empty clauses."""
+        if (self._aggregates or self._group) and self._select:
+            extra = [c for c in self._select if c not in self._group]
+            if extra:
+                raise ValueError(f"Selected columns {extra} must be grouped or aggregated")
+
+        select = list(dict.fromkeys(self._group + self._select))
+        select = [f"`{c}`" if not c.startswith(":") else c for c in select]
+        select += [f"{expr} AS {alias}" for alias, expr in self._aggregates.items()]
+
+        params: Dict[str, str] = {}
+        if select:
+            params["$select"] = ", ".join(select)
+        where = sorted(set(self._where))
+        if where:
+            params["$where"] = " AND ".join(f"({w})" if len(where) > 1 else w for w in where)
+        if self._group:
+            params["$group"] = ", ".join(f"`{c}`" for c in self._group)
+        if self._having:
+            params["$having"] = " AND ".join(sorted({clause for _, clause in self._having}))
+        if self._order:
+            params["$order"] = ", ".join(
+                (c if c in self._aggregates or c.startswith(":") else f"`{c}`") + (" DESC" if d else " ASC")
+                for c, d in self._order
+            )
+        if self._limit is not None:
+            params["$limit"] = str(self._limit)
+        return params
+
+    def canonical(self) -> str:
+        """URL query string of the canonical parameters (stable across equivalent builds)."""
+        return urlencode(sorted(self.params().items()))
+
+    def cache_key(self) -> str:
+        """Query-cache key for this query (see `query_cache.cache_key`)."""
+        return query_cache.cache_key(self.domain, self.dataset_id, self.params())
+
+    def run(self, **kwargs) -> pd.DataFrame:
+        """Execute with `socrata.query_dataset` (cached); kwargs pass through."""
+        return socrata.query_dataset(self.domain, self.dataset_id, self.params(), **kwargs)
+
+    def __repr__(self) -> str:
+        return f"Query({self.domain!r}, {self.dataset_id!r}, {self.params()!r})"
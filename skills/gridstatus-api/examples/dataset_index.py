@@ -0,0 +1,169 @@
+"""In-memory search index over a dataset catalog.
+
+Used by the catalog sync modules (`socrata_catalog.py`, `gridstatus_catalog.py`)
+to answer dataset lookups locally instead of calling a search API each time:
+
+    index = DatasetIndex(records)      # dicts with id, name, description, columns
+    index.search("building permits")   # ranked token search, all terms must match
+    index.contains("permit")           # plain substring match
+    index.get("ydr8-5enu")             # one record by id
+
+Matches in the id and name count more than matches in column names, which
+count more than matches in the description.
+
+The ranking itself lives in `TokenIndex`, which the Census variable catalog
+(`census_catalog.py`) uses too, so both searches score the same way.
+"""
+
+import bisect
+import math
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+FIELD_WEIGHTS = {"id": 4.0, "name": 3.0, "columns": 2.0, "description": 1.0}
+
+RESULT_COLUMNS = ["id", "name", "description", "score"]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens of a name, description or query."""
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def _field_text(record: dict, field: str) -> str:
+    value = record.get(field) or ""
+    return " ".join(map(str, value)) if isinstance(value, (list, tuple)) else str(value)
+
+
+class TokenIndex:
+    """
+    Inverted token index with ranked multi-term search.
+
+    Each document is a list of (text, weight) fields. A query matches a
+    document when every term does (the last term may be a prefix), each term
+    scores its best field weight times an IDF factor so rare terms weigh
+    more, and documents containing the whole query as a phrase score double.
+    """
+
+    def __init__(self, documents: Iterable[Iterable[Tuple[str, float]]]):
+        # token -> {document index: best field weight}
+        self._index: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._text: List[str] = []
+        for i, fields in enumerate(documents):
+            tokens = []
+            for text, weight in fields:
+                field_tokens = tokenize(text)
+                tokens.extend(field_tokens)
+                for token in field_tokens:
+                    if weight > self._index[token].get(i, 0.0):
+                        self._index[token][i] = weight
+            self._text.append(" ".join(tokens))
+        self._tokens = sorted(self._index)
+
+    def __len__(self) -> int:
+        return len(self._text)
+
+    def _postings(self, token: str, allow_prefix: bool) -> Dict[int, float]:
+        """Index entries for a token, or for every token it prefixes (for the last query term)."""
+        if token in self._index or not allow_prefix:
+            return self._index.get(token, {})
+        merged: Dict[int, float] = {}
+        start = bisect.bisect_left(self._tokens, token)
+        for candidate in self._tokens[start:]:
+            if not candidate.startswith(token):
+                break
+            for i, weight in self._index[candidate].items():
+                merged[i] = max(merged.get(i, 0.0), weight)
+        return merged
+
+    def rank(
+        self, query: str, limit: Optional[int] = None, tiebreak: Optional[Callable[[int], object]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        (document index, score) pairs matching every query term, best first.
+
+        Equal scores are ordered by `tiebreak(index)` (default: the index).
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        postings = [self._postings(t, allow_prefix=(k == len(terms) - 1)) for k, t in enumerate(terms)]
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates &= p.keys()
+
+        total = len(self._text)
+        phrase = " ".join(terms)
+        tiebreak = tiebreak or (lambda i: i)
+        scored = []
+        for i in candidates:
+            score = sum(p[i] * math.log(1 + total / len(p)) for p in postings)
+            if phrase in self._text[i]:
+                score *= 2
+            scored.append((-score, tiebreak(i), i))
+        scored.sort()
+        return [(i, -score) for score, _, i in scored[:limit]]
+
+
+class DatasetIndex:
+    """Token and substring search over dataset records."""
+
+    def __init__(self, records: List[dict]):
+        self.records = list(records)
+        self._position = {r["id"]: i for i, r in enumerate(self.records)}
+        self._text = [
+            " ".join(_field_text(r, f) for f in FIELD_WEIGHTS).lower() for r in self.records
+        ]
+        self._index = TokenIndex(
+            [(_field_text(r, f), weight) for f, weight in FIELD_WEIGHTS.items()] for r in self.records
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, dataset_id: str) -> bool:
+        return dataset_id in self._position
+
+    def get(self, dataset_id: str) -> Optional[dict]:
+        """The record for a dataset id, or None."""
+        i = self._position.get(dataset_id)
+        return self.records[i] if i is not None else None
+
+    def search(self, query: str, limit: Optional[int] = 20) -> pd.DataFrame:
+        """
+        Ranked multi-term search; every term must match, the last may be a prefix.
+
+        Args:
+            query: Search terms (case-insensitive)
+            limit: Maximum number of results
+
+        Returns:
+            DataFrame of id, name, description and score, best first
+        """
+        if not tokenize(query):
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        ranked = self._index.rank(query, limit, tiebreak=lambda i: self.records[i]["id"])
+        return self._frame([i for i, _ in ranked], [score for _, score in ranked])
+
+    def contains(self, text: str, limit: Optional[int] = None) -> pd.DataFrame:
+        """Records whose id, name, description or column names contain `text`."""
+        needle = text.lower()
+        positions = [i for i, haystack in enumerate(self._text) if needle in haystack]
+        return self._frame(positions[:limit])
+
+    def _frame(self, positions: List[int], scores: Optional[List[float]] = None) -> pd.DataFrame:
+        df = pd.DataFrame({
+            "id": [self.records[i]["id"] for i in positions],
+            "name": [self.records[i].get("name", "") for i in positions],
+            "description": [self.records[i].get("description", "") for i in positions],
+        })
+        if scores is not None:
+            df["score"] = [round(s, 3) for s in scores]
+        return df
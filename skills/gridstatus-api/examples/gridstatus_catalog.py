@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+GridStatus API - Offline dataset catalog
+
+`client.list_datasets(filter_term=...)` downloads the dataset list on every
+lookup. This module saves it locally once and answers searches from an
+in-memory index (`dataset_index.py`):
+
+    from gridstatusio import GridStatusClient
+    from gridstatus_catalog import get_index, prefetch_schemas
+
+    client = GridStatusClient()
+    index = get_index(client)                  # syncs on first use, then reads the file
+    index.search("ercot real time spp")        # ranked over id, name, columns, description
+    index.contains("fuel_mix")                 # substring match
+    prefetch_schemas(["pjm_load", "ercot_load"])   # columns and available date range
+
+The catalog is saved as `gridstatus_store/catalog.json` and re-synced when
+older than `MAX_AGE` (or with `refresh=True`).
+
+Prerequisites:
+    pip install gridstatusio pandas
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import http_client
+from dataset_index import DatasetIndex
+from gridstatus_store import DEFAULT_STORE
+
+API_URL = "https://api.gridstatus.io/v1"
+CATALOG_PATH = os.path.join(DEFAULT_STORE, "catalog.json")
+
+# Re-sync the dataset list after a day
+MAX_AGE = 24 * 3600
+
+_index: Optional[DatasetIndex] = None
+
+
+def _field(item, name: str, default=None):
+    """Read a field from an SDK dataset object or a plain dict."""
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
+
+
+def _column_names(columns) -> List[str]:
+    return [c.get("name") if isinstance(c, dict) else str(c) for c in (columns or [])]
+
+
+def _record(item) -> dict:
+    return {
+        "id": _field(item, "id"),
+        "name": _field(item, "name") or "",
+        "description": _field(item, "description") or "",
+        "columns": _column_names(_field(item, "all_columns")),
+        "earliest_available_time_utc": _field(item, "earliest_available_time_utc"),
+        "latest_available_time_utc": _field(item, "latest_available_time_utc"),
+    }
+
+
+def _write_atomic(catalog: dict, path: str = CATALOG_PATH) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(catalog, f, default=str)
+    os.replace(tmp, path)
+
+
+def load_catalog(path: str = CATALOG_PATH) -> Optional[dict]:
+    """The saved catalog, or None if it was never synced."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def sync_catalog(client, path: str = CATALOG_PATH) -> dict:
+    """Download the full dataset list via `client.list_datasets` and save it."""
+    global _index
+    datasets = client.list_datasets(return_list=True)
+    old = load_catalog(path) or {}
+    catalog = {"synced_at": time.time(), "datasets": [_record(d) for d in datasets],
+               "schemas": old.get("schemas", {})}
+    _write_atomic(catalog, path)
+    _index = None
+    return catalog
+
+
+def get_index(client=None, refresh: bool = False, max_age: int = MAX_AGE) -> DatasetIndex:
+    """
+    Search index over GridStatus datasets, syncing when missing or stale.
+
+    Args:
+        client: gridstatusio.GridStatusClient (needed only when a sync is due)
+        refresh: Re-sync now
+        max_age: Seconds before the saved catalog is re-synced
+
+    Returns:
+        DatasetIndex, kept in memory for the rest of the process
+    """
+    global _index
+    if _index is not None and not refresh:
+        return _index
+    catalog = None if refresh else load_catalog()
+    if catalog is None or time.time() - catalog.get("synced_at", 0) > max_age:
+        if client is None:
+            raise ValueError("No fresh local catalog; pass a GridStatusClient to sync it")
+        catalog = sync_catalog(client)
+    _index = DatasetIndex(catalog["datasets"])
+    return _index
+
+
+def _fetch_metadata(dataset_id: str) -> dict:
+    headers = {"x-api-key": os.environ.get("GRIDSTATUS_API_KEY", "")}
+    r = http_client.get(f"{API_URL}/datasets/{dataset_id}", headers=headers)
+    r.raise_for_status()
+    meta = r.json()
+    return {
+        "columns": meta.get("all_columns", []),
+        "earliest_available_time_utc": meta.get("earliest_available_time_utc"),
+        "latest_available_time_utc": meta.get("latest_available_time_utc"),
+    }
+
+
+def prefetch_schemas(dataset_ids: List[str], max_workers: int = 4, refresh: bool = False) -> Dict[str, dict]:
+    """
+    Fetch dataset metadata (columns, available range) concurrently and save it.
+
+    Returns:
+        {dataset_id: {"columns": [...], "earliest_available_time_utc": ..., ...}}
+    """
+    catalog = load_catalog() or {"synced_at": 0, "datasets": []}
+    schemas = catalog.setdefault("schemas", {})
+    todo = [i for i in dataset_ids if refresh or i not in schemas]
+
+    def fetch(dataset_id: str):
+        try:
+            return dataset_id, _fetch_metadata(dataset_id)
+        except Exception as exc:
+            print(f"Warning: no metadata for {dataset_id}: {exc}")
+            return dataset_id, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for dataset_id, meta in pool.map(fetch, todo):
+            if meta is not None:
+                schemas[dataset_id] = meta
+    if todo:
+        _write_atomic(catalog)
+    return {i: schemas[i] for i in dataset_ids if i in schemas}
+
+
+def get_schema(dataset_id: str) -> dict:
+    """Saved metadata for one dataset, fetched and saved on first use."""
+    return prefetch_schemas([dataset_id]).get(dataset_id, {})
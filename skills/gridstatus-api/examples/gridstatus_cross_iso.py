@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+GridStatus API - Concurrent cross-ISO standardized data on one UTC hourly index
+
+The `<iso>_standardized_hourly` (and `_5_min`) datasets share a layout across
+ISOs. This module fetches any set of ISOs at once and lines them up:
+
+    from gridstatusio import GridStatusClient
+    from gridstatus_cross_iso import get_cross_iso
+
+    client = GridStatusClient()
+    wide = get_cross_iso(client, "2024-01-01", "2024-01-02")     # columns: (iso, variable)
+    load = wide.xs("load", axis=1, level="variable")             # one column per ISO
+    long = get_cross_iso(client, "2024-01-01", "2024-01-02", layout="long")
+
+Values are stored as float32 and ISO/variable labels as categoricals, so
+seven ISOs of hourly data stay small enough to refresh every few minutes.
+
+Prerequisites:
+    pip install gridstatusio pandas
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from gridstatus_store import get_dataset_cached
+
+ISOS = ["caiso", "ercot", "isone", "miso", "nyiso", "pjm", "spp"]
+
+TIME_COLUMN = "interval_start_utc"
+
+# Time and bookkeeping columns that are not measurements
+NON_VALUE_COLUMNS = {
+    "interval_start_utc", "interval_end_utc", "interval_start_local", "interval_end_local",
+    "time", "time_utc", "publish_time_utc", "iso",
+}
+
+
+def normalize_column(name: str) -> str:
+    """Lowercase, underscore-separated column name (dots for zones are kept)."""
+    return re.sub(r"[^a-z0-9_.]+", "_", str(name).strip().lower()).strip("_")
+
+
+def fetch_standardized(
+    client,
+    start,
+    end,
+    isos: Sequence[str] = ISOS,
+    frequency: str = "hourly",
+    max_workers: Optional[int] = None,
+    store_dir: Optional[str] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch `<iso>_standardized_<frequency>` for several ISOs concurrently.
+
+    Args:
+        client: gridstatusio.GridStatusClient
+        start: Range start
+        end: Range end (exclusive)
+        isos: ISO prefixes (default: all seven)
+        frequency: "hourly" or "5_min"
+        max_workers: Concurrent requests (default: one per ISO)
+        store_dir: Read through the local day store in `gridstatus_store.py`
+
+    Returns:
+        {iso: raw DataFrame}; ISOs that failed are reported and left out
+    """
+    def fetch(iso: str) -> pd.DataFrame:
+        dataset = f"{iso}_standardized_{frequency}"
+        if store_dir:
+            return get_dataset_cached(client, dataset, start, end, store_dir=store_dir)
+        return client.get_dataset(dataset=dataset, start=start, end=end)
+
+    isos = list(isos)
+    frames: Dict[str, pd.DataFrame] = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(isos)) as pool:
+        futures = {iso: pool.submit(fetch, iso) for iso in isos}
+        for iso, future in futures.items():
+            try:
+                frames[iso] = future.result()
+            except Exception as exc:
+                print(f"Warning: {iso}_standardized_{frequency} failed: {exc}")
+    return frames
+
+
+def _hourly_values(df: pd.DataFrame) -> pd.DataFrame:
+    """Numeric columns averaged onto a UTC hourly index, with normalized names."""
+    times = pd.to_datetime(df[TIME_COLUMN], utc=True).dt.floor("h")
+    values = df[[c for c in df.columns if c not in NON_VALUE_COLUMNS]]
+    values = values.apply(pd.to_numeric, errors="coerce").astype(np.float32)
+    values.columns = [normalize_column(c) for c in values.columns]
+    values = values.loc[:, ~values.columns.duplicated()].dropna(axis=1, how="all")
+    return values.groupby(times.to_numpy()).mean().rename_axis(TIME_COLUMN)
+
+
+def to_wide(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """One row per UTC hour, columns (iso, variable), gaps as NaN."""
+    pieces = {iso: _hourly_values(df) for iso, df in frames.items() if not df.empty}
+    if not pieces:
+        return pd.DataFrame()
+    wide = pd.concat(pieces, axis=1, names=["iso", "variable"])
+    start, end = wide.index.min(), wide.index.max()
+    wide = wide.reindex(pd.date_range(start, end, freq="h", name=TIME_COLUMN))
+    return wide.astype(np.float32).sort_index(axis=1)
+
+
+def to_long(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Tidy rows of (interval_start_utc, iso, variable, value)."""
+    wide = to_wide(frames)
+    if wide.empty:
+        return pd.DataFrame(columns=[TIME_COLUMN, "iso", "variable", "value"])
+    long = wide.stack(["iso", "variable"], future_stack=True).dropna().rename("value").reset_index()
+    long["iso"] = long["iso"].astype("category")
+    long["variable"] = long["variable"].astype("category")
+    return long
+
+
+def get_cross_iso(
+    client,
+    start,
+    end,
+    isos: Sequence[str] = ISOS,
+    layout: str = "wide",
+    frequency: str = "hourly",
+    max_workers: Optional[int] = None,
+    store_dir: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Standardized data for several ISOs, fetched concurrently and aligned on UTC hours.
+
+    Args:
+        layout: "wide" (columns (iso, variable)) or "long" (one value per row)
+        Other arguments: see `fetch_standardized`
+
+    Returns:
+        Aligned DataFrame; 5-minute data is averaged to hours
+    """
+    if layout not in ("wide", "long"):
+        raise ValueError('layout must be "wide" or "long"')
+    frames = fetch_standardized(client, start, end, isos, frequency, max_workers, store_dir)
+    return to_wide(frames) if layout == "wide" else to_long(frames)
+
+
+def columns_by_iso(frames: Dict[str, pd.DataFrame]) -> Dict[str, List[str]]:
+    """Normalized value columns each ISO provides, to find variables they share."""
+    return {
+        iso: sorted(normalize_column(c) for c in df.columns if c not in NON_VALUE_COLUMNS)
+        for iso, df in frames.items()
+    }
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+GridStatus API - Local resampling, peak buckets and DART
+
+Server-side `resample=` and DART datasets bill a new request for every
+aggregation of the same rows. Fetch the raw intervals once (ideally through
+`gridstatus_store.py`) and derive everything else locally:
+
+    from gridstatus_resample import dart, peak_summary, resample
+
+    rt = get_dataset_cached(client, "pjm_lmp_real_time_5_min", "2024-01-01", "2024-02-01",
+                            filter_column="location", filter_value="WESTERN HUB")
+    hourly_max = resample(rt, "1h", "max", by="location", iso="pjm")
+    daily_peak = peak_summary(rt, "lmp", iso="pjm", freq="1D")   # on_peak / off_peak columns
+    spread = dart(da, rt)                                         # DA - hourly-averaged RT
+
+Times are bucketed in the ISO's local time zone, so days and peak hours
+follow daylight saving time the way market settlements do.
+
+Prerequisites:
+    pip install pandas
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Market time zones (MISO settles on Eastern Standard Time all year)
+ISO_TIMEZONES = {
+    "ercot": "US/Central",
+    "caiso": "US/Pacific",
+    "pjm": "US/Eastern",
+    "miso": "Etc/GMT+5",
+    "nyiso": "US/Eastern",
+    "isone": "US/Eastern",
+    "spp": "US/Central",
+}
+
+TIME_COLUMN = "interval_start_utc"
+PRICE_COLUMNS = ["lmp", "spp", "price"]
+
+# Peak hours are hour-ending 7 through 22 (intervals starting 06:00-21:59 local)
+PEAK_START_HOUR = 6
+PEAK_END_HOUR = 22
+
+
+def _timezone(iso: Optional[str], tz: Optional[str]) -> str:
+    if tz:
+        return tz
+    if iso and iso.lower() in ISO_TIMEZONES:
+        return ISO_TIMEZONES[iso.lower()]
+    raise ValueError("Pass tz=... or iso= one of " + ", ".join(ISO_TIMEZONES))
+
+
+def local_times(df: pd.DataFrame, tz: str, time_column: str = TIME_COLUMN) -> pd.Series:
+    """Interval start times converted to a local time zone."""
+    return pd.to_datetime(df[time_column], utc=True).dt.tz_convert(tz)
+
+
+def nerc_holidays(years: Iterable[int]) -> List[date]:
+    """NERC off-peak holidays; Sunday holidays are observed the following Monday."""
+    days = []
+    for year in years:
+        fixed = [date(year, 1, 1), date(year, 7, 4), date(year, 12, 25)]
+        days += [d + timedelta(days=1) if d.weekday() == 6 else d for d in fixed]
+        may31 = date(year, 5, 31)
+        days.append(may31 - timedelta(days=may31.weekday()))                      # Memorial Day
+        sep1 = date(year, 9, 1)
+        days.append(sep1 + timedelta(days=(0 - sep1.weekday()) % 7))              # Labor Day
+        nov1 = date(year, 11, 1)
+        days.append(nov1 + timedelta(days=(3 - nov1.weekday()) % 7 + 21))         # Thanksgiving
+    return days
+
+
+def peak_buckets(times: pd.Series, peak_days: str = "5x16") -> pd.Series:
+    """
+    Label local interval start times with standard power-trading buckets.
+
+    Args:
+        times: tz-aware local times (see `local_times`)
+        peak_days: "5x16" (Mon-Fri, Eastern/Texas markets) or "6x16" (Mon-Sat, WECC)
+
+    Returns:
+        Categorical Series: "on_peak" for peak hours on peak days outside NERC
+        holidays, "off_peak_16" for the same hours on other days, "off_peak_8"
+        for nights (7x8)
+    """
+    if peak_days not in ("5x16", "6x16"):
+        raise ValueError('peak_days must be "5x16" or "6x16"')
+    last_peak_weekday = 4 if peak_days == "5x16" else 5
+
+    hour = times.dt.hour.to_numpy()
+    weekday = times.dt.weekday.to_numpy()
+    day = times.dt.normalize().dt.tz_localize(None)
+    holidays = pd.to_datetime(nerc_holidays(range(day.dt.year.min(), day.dt.year.max() + 1))) if len(day) else []
+
+    day_hours = (hour >= PEAK_START_HOUR) & (hour < PEAK_END_HOUR)
+    peak_day = (weekday <= last_peak_weekday) & ~day.isin(holidays).to_numpy()
+    labels = np.where(day_hours & peak_day, "on_peak", np.where(day_hours, "off_peak_16", "off_peak_8"))
+    return pd.Series(pd.Categorical(labels, categories=["on_peak", "off_peak_16", "off_peak_8"]), index=times.index)
+
+
+def resample(
+    df: pd.DataFrame,
+    freq: str = "1h",
+    how: Union[str, Dict[str, str]] = "mean",
+    by: Optional[Union[str, List[str]]] = None,
+    iso: Optional[str] = None,
+    tz: Optional[str] = None,
+    time_column: str = TIME_COLUMN,
+) -> pd.DataFrame:
+    """
+    Aggregate interval data to a coarser frequency in local market time.
+
+    Equivalent to get_dataset's `resample=` / `resample_function=` without
+    another request.
+
+    Args:
+        df: Raw intervals from get_dataset
+        freq: pandas frequency ("1h", "1D", "MS", ...)
+        how: Aggregation ("mean", "max", "sum", ...) or {column: aggregation}
+        by: Columns to keep separate (e.g. "location")
+        iso / tz: Market (e.g. "ercot") or explicit time zone for bucketing
+
+    Returns:
+        One row per (by..., interval_start_local)
+    """
+    tz = _timezone(iso, tz)
+    keys = [by] if isinstance(by, str) else list(by or [])
+    numeric = [c for c in df.select_dtypes("number").columns if c not in keys]
+    agg = how if isinstance(how, dict) else {c: how for c in numeric}
+
+    local = df[keys + list(agg)].assign(interval_start_local=local_times(df, tz, time_column))
+    grouper = pd.Grouper(key="interval_start_local", freq=freq)
+    return local.groupby(keys + [grouper], observed=True).agg(agg).reset_index()
+
+
+def peak_summary(
+    df: pd.DataFrame,
+    column: str,
+    freq: str = "1D",
+    how: str = "mean",
+    by: Optional[Union[str, List[str]]] = None,
+    iso: Optional[str] = None,
+    tz: Optional[str] = None,
+    peak_days: str = "5x16",
+    time_column: str = TIME_COLUMN,
+) -> pd.DataFrame:
+    """
+    Aggregate a column per period and on/off-peak bucket, one column per bucket.
+
+    Returns a frame indexed by (by..., period) with `on_peak`, `off_peak_16`,
+    `off_peak_8` and `off_peak` (all off-peak hours) columns.
+    """
+    tz = _timezone(iso, tz)
+    keys = [by] if isinstance(by, str) else list(by or [])
+    times = local_times(df, tz, time_column)
+    buckets = peak_buckets(times, peak_days)
+    frame = df[keys + [column]].assign(period=times, bucket=buckets)
+    period = pd.Grouper(key="period", freq=freq)
+
+    out = frame.groupby(keys + [period, "bucket"], observed=True)[column].agg(how).unstack("bucket")
+    out = out.reindex(columns=["on_peak", "off_peak_16", "off_peak_8"])
+    off = frame[buckets.to_numpy() != "on_peak"]
+    out["off_peak"] = off.groupby(keys + [period], observed=True)[column].agg(how)
+    return out
+
+
+def price_column(df: pd.DataFrame) -> str:
+    """Name of the price column in an LMP/SPP dataset."""
+    for col in PRICE_COLUMNS:
+        if col in df.columns:
+            return col
+    raise KeyError(f"No price column found; expected one of {PRICE_COLUMNS}")
+
+
+def dart(
+    da: pd.DataFrame,
+    rt: pd.DataFrame,
+    on: Union[str, List[str]] = "location",
+    time_column: str = TIME_COLUMN,
+) -> pd.DataFrame:
+    """
+    Day-ahead minus real-time spread from separately fetched DA and RT prices.
+
+    Real-time intervals (5- or 15-minute) are averaged to the day-ahead
+    interval (hourly) per location before the join.
+
+    Args:
+        da: Day-ahead hourly prices (e.g. pjm_lmp_day_ahead_hourly)
+        rt: Real-time prices (e.g. pjm_lmp_real_time_5_min)
+        on: Location column(s) to match on
+
+    Returns:
+        DataFrame with `price_da`, `price_rt` and `dart` per location and hour
+    """
+    keys = [on] if isinstance(on, str) else list(on)
+    da_col, rt_col = price_column(da), price_column(rt)
+
+    da_hourly = da[keys + [time_column, da_col]].assign(
+        **{time_column: pd.to_datetime(da[time_column], utc=True)}
+    ).rename(columns={da_col: "price_da"})
+    rt_hourly = (
+        rt[keys + [rt_col]]
+        .assign(hour=pd.to_datetime(rt[time_column], utc=True).dt.floor("h"))
+        .groupby(keys + ["hour"], observed=True)[rt_col].mean()
+        .rename("price_rt")
+        .reset_index()
+        .rename(columns={"hour": time_column})
+    )
+
+    out = da_hourly.merge(rt_hourly, on=keys + [time_column], how="inner")
+    out["dart"] = out["price_da"] - out["price_rt"]
+    return out.sort_values(keys + [time_column], ignore_index=True)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+GridStatus API - Local day-partitioned store with gap-fill fetching
+
+Dashboards ask for the same datasets over overlapping ranges all day, and
+every `get_dataset` call re-downloads (and bills) every row. This store keeps
+one Parquet file per dataset, query and UTC day. A request for [start, end)
+reads the days already on disk, downloads only the missing days, and merges
+them:
+
+    from gridstatusio import GridStatusClient
+    from gridstatus_store import get_dataset_cached
+
+    client = GridStatusClient()
+    df = get_dataset_cached(client, "ercot_load", "2024-01-01", "2024-02-01")
+    df = get_dataset_cached(client, "ercot_load", "2024-01-15", "2024-02-15")  # fetches Feb 1-14 only
+
+Layout: `<store>/<dataset>/<query key>/<YYYY-MM-DD>.parquet`, where the query
+key identifies the filters (e.g. one location). Days that haven't finished
+yet are returned but not stored, so today's partial data is always
+re-fetched. Requires pyarrow (`pip install pyarrow`).
+"""
+
+import hashlib
+import json
+import os
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from gridstatus_windows import TIME_COLUMNS, fetch_windowed
+
+DEFAULT_STORE = "gridstatus_store"
+
+# How long after a day ends before its data is considered final enough to store
+SETTLE_TIME = pd.Timedelta(hours=2)
+
+DAY = pd.Timedelta(days=1)
+
+
+def query_key(query: dict) -> str:
+    """Short stable name for a set of get_dataset filters ("all" when unfiltered)."""
+    if not query:
+        return "all"
+    payload = json.dumps({k: query[k] for k in sorted(query)}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _partition_dir(dataset: str, query: dict, store_dir: str) -> str:
+    return os.path.join(store_dir, dataset, query_key(query))
+
+
+def _utc(value) -> pd.Timestamp:
+    """Timestamp as naive UTC (naive input is taken to be UTC already)."""
+    ts = pd.Timestamp(value)
+    return ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo else ts
+
+
+def stored_days(dataset: str, store_dir: str = DEFAULT_STORE, **query) -> List[pd.Timestamp]:
+    """UTC days already on disk for a dataset and query."""
+    path = _partition_dir(dataset, query, store_dir)
+    if not os.path.isdir(path):
+        return []
+    return sorted(pd.Timestamp(name[:-len(".parquet")]) for name in os.listdir(path) if name.endswith(".parquet"))
+
+
+def missing_ranges(days: List[pd.Timestamp], have: set) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Group days not in `have` into contiguous [start, end) ranges."""
+    ranges: List[Tuple[pd.Timestamp, pd.Timestamp]] = []
+    for day in days:
+        if day in have:
+            continue
+        if ranges and ranges[-1][1] == day:
+            ranges[-1] = (ranges[-1][0], day + DAY)
+        else:
+            ranges.append((day, day + DAY))
+    return ranges
+
+
+def _time_column(df: pd.DataFrame) -> Optional[str]:
+    return next((c for c in TIME_COLUMNS if c in df.columns), None)
+
+
+def _utc_days(times: pd.Series, floor: bool = True) -> pd.Series:
+    """Naive-UTC timestamps (floored to the day by default) for a time column."""
+    times = pd.to_datetime(times, utc=True).dt.tz_localize(None)
+    return times.dt.floor("D") if floor else times
+
+
+def _write_atomic(df: pd.DataFrame, path: str) -> None:
+    """Write Parquet to a temp file and swap it in, so readers never see half a day."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def get_dataset_cached(
+    client,
+    dataset: str,
+    start,
+    end,
+    store_dir: str = DEFAULT_STORE,
+    max_workers: int = 4,
+    refresh: bool = False,
+    **query,
+) -> pd.DataFrame:
+    """
+    `client.get_dataset` backed by the local day-partitioned store.
+
+    Args:
+        client: gridstatusio.GridStatusClient
+        dataset: Dataset ID (e.g., "ercot_load")
+        start: Range start in UTC (inclusive)
+        end: Range end in UTC (exclusive)
+        store_dir: Root directory of the store
+        max_workers: Concurrent day downloads for missing ranges
+        refresh: Re-download every day in the range
+        **query: Other get_dataset filters (filter_column, filter_value, ...);
+            each distinct set is stored separately
+
+    Returns:
+        DataFrame for [start, end) in time order
+    """
+    for arg in ("limit", "timezone"):
+        if arg in query:
+            raise ValueError(f"{arg} isn't supported by the store; slice or convert the result instead")
+
+    start, end = _utc(start), _utc(end)
+    if end <= start:
+        raise ValueError("end must be after start")
+    days = list(pd.date_range(start.floor("D"), (end - pd.Timedelta(1, "ns")).floor("D"), freq="D"))
+    settled = _utc(pd.Timestamp.now(tz="UTC")) - SETTLE_TIME
+
+    path = _partition_dir(dataset, query, store_dir)
+    have = set() if refresh else set(stored_days(dataset, store_dir, **query))
+    fresh = {}
+
+    for range_start, range_end in missing_ranges(days, have):
+        df = fetch_windowed(client, dataset, range_start, range_end, window="1D",
+                            max_workers=max_workers, **query)
+        time_col = _time_column(df)
+        if time_col is None and not df.empty:
+            raise ValueError(f"{dataset} has no UTC time column to partition on")
+        day_of = _utc_days(df[time_col]) if time_col else pd.Series([], dtype="datetime64[ns]")
+
+        os.makedirs(path, exist_ok=True)
+        for day in pd.date_range(range_start, range_end - DAY, freq="D"):
+            part = df[(day_of == day).to_numpy()] if len(df) else df
+            fresh[day] = part
+            if day + DAY <= settled:
+                _write_atomic(part.reset_index(drop=True), os.path.join(path, f"{day:%Y-%m-%d}.parquet"))
+
+    frames = [
+        fresh[day] if day in fresh else pd.read_parquet(os.path.join(path, f"{day:%Y-%m-%d}.parquet"))
+        for day in days
+    ]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True)
+    time_col = _time_column(df)
+    times = _utc_days(df[time_col], floor=False)
+    return df[((times >= start) & (times < end)).to_numpy()].reset_index(drop=True)
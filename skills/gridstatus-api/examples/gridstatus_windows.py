@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+GridStatus API - Chunked, concurrent downloads with row-quota accounting
+
+A month of 15-minute prices across every settlement point is one huge,
+fragile `get_dataset` request that also eats into the monthly row quota
+without warning. This module splits a long range into time windows, checks
+the projected row count against `get_api_usage()` before spending quota,
+downloads the windows concurrently, and keeps finished windows so a failed
+run can be resumed:
+
+    from gridstatusio import GridStatusClient
+    from gridstatus_windows import WindowedDownload
+
+    client = GridStatusClient()
+    job = WindowedDownload(client, "ercot_spp_real_time_15_min",
+                           "2024-01-01", "2024-02-01", window="1D")
+    df = job.run(max_workers=4)     # raises if the projection exceeds the quota
+    # On a network failure, call job.run() again: only the failed windows are fetched
+
+Prerequisites:
+    pip install gridstatusio pandas
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Columns used to put the combined result in time order, first match wins
+TIME_COLUMNS = ["interval_start_utc", "time_utc", "interval_start_local", "time"]
+
+Window = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+class QuotaExceeded(RuntimeError):
+    """Raised when a download is projected to use more rows than the quota has left."""
+
+
+def split_windows(start, end, window: str = "1D") -> List[Window]:
+    """Split [start, end) into consecutive windows of length `window` (a pandas offset)."""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    if end <= start:
+        raise ValueError("end must be after start")
+    edges = list(pd.date_range(start, end, freq=window))
+    if edges[0] != start:
+        edges.insert(0, start)
+    if edges[-1] != end:
+        edges.append(end)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def remaining_rows(client) -> Optional[int]:
+    """Rows left in the current billing period, or None when the plan is unlimited."""
+    usage = client.get_api_usage()
+    limit = usage.get("limit", -1)
+    if limit is None or limit == -1:
+        return None
+    return max(0, int(limit) - int(usage.get("usage", 0)))
+
+
+class WindowedDownload:
+    """A `get_dataset` query split into time windows that can be fetched and resumed."""
+
+    def __init__(self, client, dataset: str, start, end, window: str = "1D", **query):
+        """
+        Args:
+            client: gridstatusio.GridStatusClient
+            dataset: Dataset ID (e.g., "ercot_spp_real_time_15_min")
+            start: Range start (inclusive)
+            end: Range end (exclusive)
+            window: Window length as a pandas offset ("6h", "1D", "7D", ...)
+            **query: Other get_dataset arguments (filter_column, filter_value, timezone, ...)
+        """
+        if "limit" in query:
+            raise ValueError("limit would apply to each window separately; filter or shorten the range instead")
+        self.client = client
+        self.dataset = dataset
+        self.query = query
+        self.windows = split_windows(start, end, window)
+        self.results: Dict[int, pd.DataFrame] = {}
+        self.errors: Dict[int, Exception] = {}
+
+    def pending(self) -> List[int]:
+        """Indexes of windows that have not been downloaded yet."""
+        return [i for i in range(len(self.windows)) if i not in self.results]
+
+    def projected_rows(self) -> Optional[int]:
+        """Rows the pending windows should return, extrapolated from finished ones."""
+        if not self.results:
+            return None
+        done_seconds = sum((self.windows[i][1] - self.windows[i][0]).total_seconds() for i in self.results)
+        done_rows = sum(len(df) for df in self.results.values())
+        todo_seconds = sum((self.windows[i][1] - self.windows[i][0]).total_seconds() for i in self.pending())
+        return math.ceil(done_rows / done_seconds * todo_seconds) if done_seconds else 0
+
+    def check_quota(self) -> None:
+        """Raise QuotaExceeded if the pending windows won't fit in the remaining quota."""
+        projected = self.projected_rows()
+        if projected is None:
+            return
+        remaining = remaining_rows(self.client)
+        if remaining is not None and projected > remaining:
+            raise QuotaExceeded(
+                f"{self.dataset}: ~{projected:,} more rows projected for {len(self.pending())} windows, "
+                f"but only {remaining:,} rows remain this period. Narrow the range or add filters."
+            )
+
+    def _fetch(self, index: int, retries: int) -> pd.DataFrame:
+        start, end = self.windows[index]
+        for attempt in range(retries + 1):
+            try:
+                return self.client.get_dataset(dataset=self.dataset, start=start, end=end, **self.query)
+            except Exception:
+                if attempt == retries:
+                    raise
+
+    def run(self, max_workers: int = 4, check_quota: bool = True, retries: int = 2) -> pd.DataFrame:
+        """
+        Download every pending window and return the full range in time order.
+
+        With `check_quota`, the first pending window is fetched alone as a
+        probe (unless some windows are already done), and the rest only start
+        if their projected row count fits the remaining quota.
+
+        Args:
+            max_workers: Windows downloaded at once
+            check_quota: Compare projected rows with `get_api_usage()` first
+            retries: Extra attempts per window before it counts as failed
+
+        Returns:
+            DataFrame of all windows
+
+        Raises:
+            QuotaExceeded: Projected rows exceed the remaining quota
+            RuntimeError: Some windows failed; call run() again to retry only those
+        """
+        self.errors = {}
+        pending = self.pending()
+        if check_quota and pending:
+            if not self.results:
+                self._store(pending[0], retries)
+            if not self.errors:
+                self.check_quota()
+            pending = [] if self.errors else self.pending()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(lambda i: self._store(i, retries), pending))
+
+        if self.errors:
+            failed = [f"{self.windows[i][0]} to {self.windows[i][1]}" for i in sorted(self.errors)]
+            raise RuntimeError(
+                f"{len(failed)} of {len(self.windows)} windows failed ({', '.join(failed[:3])}"
+                f"{', ...' if len(failed) > 3 else ''}); call run() again to resume"
+            ) from next(iter(self.errors.values()))
+        return self.frame()
+
+    def _store(self, index: int, retries: int) -> None:
+        try:
+            self.results[index] = self._fetch(index, retries)
+            self.errors.pop(index, None)
+        except Exception as exc:
+            self.errors[index] = exc
+
+    def frame(self) -> pd.DataFrame:
+        """Concatenate the downloaded windows in time order."""
+        frames = [self.results[i] for i in sorted(self.results) if not self.results[i].empty]
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True)
+        time_col = next((c for c in TIME_COLUMNS if c in df.columns), None)
+        if time_col:
+            df = df.sort_values(time_col, kind="stable", ignore_index=True)
+        return df
+
+
+def fetch_windowed(
+    client,
+    dataset: str,
+    start,
+    end,
+    window: str = "1D",
+    max_workers: int = 4,
+    check_quota: bool = True,
+    **query,
+) -> pd.DataFrame:
+    """One-call form of `WindowedDownload(...).run(...)`."""
+    job = WindowedDownload(client, dataset, start, end, window, **query)
+    return job.run(max_workers=max_workers, check_quota=check_quota)
@@ -223,17 +223,15 @@ def cross_iso_example():
     """Compare data across ISOs using standardized datasets."""
     print("\n=== Cross-ISO Comparison Example ===")
 
-    # Standardized hourly data from multiple ISOs
-    isos = ["ercot", "caiso", "pjm"]
+    # Standardized hourly data from multiple ISOs, fetched concurrently
+    # and aligned on one UTC hourly index with (iso, variable) columns
+    from gridstatus_cross_iso import get_cross_iso
 
-    for iso in isos:
-        df = client.get_dataset(
-            dataset=f"{iso}_standardized_hourly",
-            start="2024-01-01",
-            end="2024-01-02",
-            limit=24  # One day of hourly data
-        )
-        print(f"\n{iso.upper()} standardized columns: {list(df.columns)[:5]}...")
+    wide = get_cross_iso(client, "2024-01-01", "2024-01-02", isos=["ercot", "caiso", "pjm"])
+    load = wide.xs("load", axis=1, level="variable")
+    print(load.head())
+
+    return wide
 
 
 # =============================================================================
@@ -258,6 +256,24 @@ def forecast_example():
     return df
 
 
+# =============================================================================
+# Example 11: Dataset Metadata (REST, with retries)
+# =============================================================================
+def dataset_metadata_example(dataset_ids=("pjm_load", "ercot_load", "caiso_load")):
+    """Check available date ranges for several datasets."""
+    print("\n=== Dataset Metadata Example ===")
+
+    # http_client pools connections and retries 429/5xx responses with backoff
+    import http_client
+
+    headers = {"x-api-key": os.environ["GRIDSTATUS_API_KEY"]}
+    for dataset_id in dataset_ids:
+        r = http_client.get(f"https://api.gridstatus.io/v1/datasets/{dataset_id}", headers=headers)
+        r.raise_for_status()
+        meta = r.json()
+        print(f"{dataset_id}: {meta['earliest_available_time_utc']} to {meta['latest_available_time_utc']}")
+
+
 # =============================================================================
 # Main
 # =============================================================================
@@ -295,5 +311,8 @@ if __name__ == "__main__":
     # Forecasts
     # forecast_example()
 
+    # Metadata for several datasets
+    # dataset_metadata_example()
+
     print("\n" + "=" * 50)
     print("Examples complete!")
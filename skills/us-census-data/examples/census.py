@@ -0,0 +1,156 @@
+"""Importable US Census API helpers (the functions used by python-query.py).
+
+Query results are cached on disk as Parquet via `query_cache.py`, and variable
+lookups use the indexed catalog in `census_catalog.py`, so repeating a query
+within the cache TTL doesn't go back to the network. Network requests go
+through `http_client.py`, which retries throttled (429) and failed (5xx)
+requests instead of crashing:
+
+    from census import get_census_data
+
+    tracts = get_census_data(2022, "acs/acs5", ["NAME", "B01001_001E"],
+                             "tract:*", {"state": "17", "county": "031"})
+
+Pass `refresh=True` to force a fresh download or `use_cache=False` to bypass
+the cache entirely. Run from the `examples/` directory (or put it on
+`sys.path`) to import.
+"""
+
+import os
+from typing import Optional
+
+import pandas as pd
+
+import census_catalog
+import census_decode
+import http_client
+import query_cache
+
+
+# Load API key from environment or .env file
+def load_api_key() -> Optional[str]:
+    """Load Census API key from environment or .env file."""
+    key = os.environ.get("CENSUS_API_KEY")
+    if key:
+        return key
+
+    # Try loading from .env file
+    env_path = os.path.join(os.getcwd(), ".env")
+    if os.path.exists(env_path):
+        with open(env_path) as f:
+            for line in f:
+                if line.startswith("CENSUS_API_KEY="):
+                    return line.strip().split("=", 1)[1]
+
+    print("Warning: No CENSUS_API_KEY found. Register at https://api.census.gov/data/key_signup.html")
+    return None
+
+
+API_KEY = load_api_key()
+BASE_URL = "https://api.census.gov/data"
+
+
+def get_census_data(
+    year: int,
+    dataset: str,
+    variables: list,
+    geography: str,
+    filters: dict = None,
+    refresh: bool = False,
+    use_cache: bool = True,
+    typed: bool = True,
+) -> pd.DataFrame:
+    """
+    Query Census API and return results as DataFrame.
+
+    Args:
+        year: Data year (e.g., 2022)
+        dataset: Dataset path (e.g., "acs/acs5")
+        variables: List of variable codes (e.g., ["NAME", "B01001_001E"])
+        geography: Target geography (e.g., "county:*")
+        filters: Parent geography filters (e.g., {"state": "17", "county": "031"})
+        refresh: Ignore any cached result and re-download
+        use_cache: Set False to bypass the local cache
+        typed: Decode to numeric/categorical dtypes with sentinels as NA
+            (see `census_decode.py`); False returns raw strings. Column types
+            come from the variable catalog if it is already cached (e.g. after
+            `census_catalog.get_catalog`); otherwise `_E`/`_M` columns decode
+            as floats, other variables as numbers when all their values are
+            numeric, and nothing is downloaded
+
+    Returns:
+        DataFrame with Census data
+    """
+    def fetch() -> pd.DataFrame:
+        url = f"{BASE_URL}/{year}/{dataset}"
+
+        # Build query string manually to handle multiple 'in' parameters correctly
+        query_parts = [
+            f"get={','.join(variables)}",
+            f"for={geography}",
+        ]
+
+        # Census API requires separate &in= for each parent geography level
+        if filters:
+            for geo, code in filters.items():
+                query_parts.append(f"in={geo}:{code}")
+
+        if API_KEY:
+            query_parts.append(f"key={API_KEY}")
+
+        full_url = f"{url}?{'&'.join(query_parts)}"
+        response = http_client.get(full_url)
+        response.raise_for_status()
+
+        data = response.json()
+        return pd.DataFrame(data[1:], columns=data[0])
+
+    params = {"get": list(variables), "for": geography, "in": filters or {}}
+    # The cache keeps raw strings; decoding is a fast vectorized pass on the way out
+    df = query_cache.cached("census", f"{year}/{dataset}", params, fetch,
+                            refresh=refresh, use_cache=use_cache)
+    if not typed:
+        return df
+    return census_decode.decode_frame(df, year, dataset, census_decode.geography_columns(geography, filters))
+
+
+def search_variables(
+    year: int,
+    dataset: str,
+    keyword: str,
+    limit: Optional[int] = None,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """
+    Search for variables matching all words of a keyword, best matches first.
+
+    Uses the cached, indexed catalog in `census_catalog.py`, so only the
+    first search per dataset downloads `variables.json`.
+
+    Args:
+        year: Data year
+        dataset: Dataset path
+        keyword: Search terms (case-insensitive, e.g. "median household income")
+        limit: Maximum number of results
+        refresh: Re-download the variable catalog
+
+    Returns:
+        DataFrame of matching variables with name, label, concept, score
+    """
+    return census_catalog.get_catalog(year, dataset, refresh=refresh).search(keyword, limit)
+
+
+def get_table_variables(year: int, dataset: str, table: str, refresh: bool = False) -> pd.DataFrame:
+    """
+    Get all variables in a Census table.
+
+    Args:
+        year: Data year
+        dataset: Dataset path
+        table: Table code (e.g., "B19013")
+        refresh: Re-download the variable catalog
+
+    Returns:
+        DataFrame with variable codes, labels and concept
+    """
+    return census_catalog.get_catalog(year, dataset, refresh=refresh).table(table)
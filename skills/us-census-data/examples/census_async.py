@@ -0,0 +1,98 @@
+"""Async versions of the `census.py` helpers for asyncio applications.
+
+Same names and signatures as `census.py`, as coroutines. Requests share the
+pooled client in `http_async.py` (per-host concurrency limits, retries,
+adaptive rate limiting), and results use the same query cache and variable
+catalogs, so a service can fan out many Census lookups without blocking its
+event loop or paying for a thread per call:
+
+    import asyncio
+    import census_async
+
+    counties = await asyncio.gather(*(
+        census_async.get_census_data(2022, "acs/acs5", ["NAME", "B19013_001E"], "county:*", {"state": st})
+        for st in ["17", "18", "55"]
+    ))
+    income_vars = await census_async.search_variables(2022, "acs/acs5", "median household income")
+
+Cancelling a task cancels its request; nothing is written to the cache for it.
+Requires httpx (`pip install httpx`).
+"""
+
+import asyncio
+from typing import Optional
+
+import pandas as pd
+
+import census_catalog
+import census_decode
+import http_async
+import query_cache
+from census import API_KEY, BASE_URL
+
+
+async def get_catalog(year: int, dataset: str, refresh: bool = False) -> census_catalog.VariableCatalog:
+    """Load the variable catalog for a dataset, downloading it at most once (see `census_catalog.get_catalog`)."""
+    if not refresh:
+        catalog = await asyncio.to_thread(census_catalog.cached_catalog, year, dataset)
+        if catalog is not None:
+            return catalog
+    response = await http_async.get(f"{BASE_URL}/{year}/{dataset}/variables.json")
+    response.raise_for_status()
+    return await asyncio.to_thread(census_catalog.save_catalog, year, dataset, response.json()["variables"])
+
+
+async def get_census_data(
+    year: int,
+    dataset: str,
+    variables: list,
+    geography: str,
+    filters: dict = None,
+    refresh: bool = False,
+    use_cache: bool = True,
+    typed: bool = True,
+) -> pd.DataFrame:
+    """Query Census API and return results as DataFrame (see `census.get_census_data`)."""
+    params = {"get": list(variables), "for": geography, "in": filters or {}}
+    key = query_cache.cache_key("census", f"{year}/{dataset}", params)
+    df = None
+    if use_cache and not refresh:
+        df = await asyncio.to_thread(query_cache.get, key)
+
+    if df is None:
+        # Separate &in= per parent geography level, as in census.py
+        query_parts = [f"get={','.join(variables)}", f"for={geography}"]
+        for geo, code in (filters or {}).items():
+            query_parts.append(f"in={geo}:{code}")
+        if API_KEY:
+            query_parts.append(f"key={API_KEY}")
+
+        response = await http_async.get(f"{BASE_URL}/{year}/{dataset}?{'&'.join(query_parts)}")
+        response.raise_for_status()
+        data = response.json()
+        df = pd.DataFrame(data[1:], columns=data[0])
+        if use_cache:
+            await asyncio.to_thread(query_cache.put, key, df)
+
+    if not typed:
+        return df
+    # Same decoding as census.py: a cached catalog is used, never downloaded.
+    # Reading it from disk may block, so decode off the event loop.
+    geography_columns = census_decode.geography_columns(geography, filters)
+    return await asyncio.to_thread(census_decode.decode_frame, df, year, dataset, geography_columns)
+
+
+async def search_variables(
+    year: int,
+    dataset: str,
+    keyword: str,
+    limit: Optional[int] = None,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """Search for variables matching all words of a keyword, best matches first."""
+    return (await get_catalog(year, dataset, refresh=refresh)).search(keyword, limit)
+
+
+async def get_table_variables(year: int, dataset: str, table: str, refresh: bool = False) -> pd.DataFrame:
+    """Get all variables in a Census table."""
+    return (await get_catalog(year, dataset, refresh=refresh)).table(table)
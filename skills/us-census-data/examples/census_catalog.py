@@ -0,0 +1,172 @@
+"""Cached, indexed Census variable catalog.
+
+`variables.json` for `acs/acs5` holds tens of thousands of entries. Instead of
+downloading and scanning it on every search, each (year, dataset) catalog is
+saved to disk once, loaded lazily once per process, and indexed by token:
+
+    from census_catalog import get_catalog
+
+    catalog = get_catalog(2022, "acs/acs5")
+    catalog.search("median household income")   # ranked, all terms must match
+    catalog.table("B19013")                     # every variable in a table
+    catalog.prefix("B19013A")                   # variables by code prefix
+    catalog.predicate_types(["B19013_001E"])    # {"B19013_001E": "int"}
+
+`census.search_variables` and `census.get_table_variables` use this catalog.
+"""
+
+import bisect
+import json
+import os
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import http_client
+import query_cache
+# Shared with the dataset catalogs of the other skills, so both searches rank alike
+from dataset_index import TokenIndex, tokenize
+
+BASE_URL = "https://api.census.gov/data"
+CATALOG_DIR = os.path.join(query_cache.CACHE_DIR, "catalogs")
+
+# Matches in the table concept count more than matches deep in a label
+CONCEPT_WEIGHT = 1.5
+
+_catalogs: Dict[Tuple[int, str], "VariableCatalog"] = {}
+
+
+class VariableCatalog:
+    """Variables of one Census dataset with an inverted token index over label and concept."""
+
+    def __init__(self, variables: dict):
+        # Skip the for/in/ucgid pseudo-variables that describe geography predicates
+        items = sorted(
+            (name, info) for name, info in variables.items()
+            if name not in ("for", "in", "ucgid")
+        )
+        self.names = [name for name, _ in items]
+        self.labels = [info.get("label", "") for _, info in items]
+        self.concepts = [info.get("concept", "") for _, info in items]
+        self.groups = [info.get("group", "N/A") for _, info in items]
+        self.types = [info.get("predicateType", "string") for _, info in items]
+        self._position = {name: i for i, name in enumerate(self.names)}
+
+        self._by_group: Dict[str, List[int]] = defaultdict(list)
+        for i, group in enumerate(self.groups):
+            self._by_group[group].append(i)
+
+        # Concept hits outweigh label hits
+        self._index = TokenIndex(
+            [(label, 1.0), (concept, CONCEPT_WEIGHT)] for label, concept in zip(self.labels, self.concepts)
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Ranked multi-term search over labels and concepts.
+
+        Every query term must match (the last one may be a prefix, so "inc"
+        finds "income"). Rare terms weigh more than common ones, concept
+        matches more than label matches, and an exact phrase match ranks first.
+
+        Args:
+            query: Search terms (case-insensitive)
+            limit: Maximum number of results
+
+        Returns:
+            DataFrame of variable, label, concept and score, best first
+        """
+        if not tokenize(query):
+            return pd.DataFrame(columns=["variable", "label", "concept", "score"])
+        # Among equal scores, shorter (more general) labels first
+        ranked = self._index.rank(query, limit, tiebreak=lambda i: (len(self.labels[i]), self.names[i]))
+        df = self._frame([i for i, _ in ranked])
+        df["score"] = [round(score, 3) for _, score in ranked]
+        return df
+
+    def _frame(self, positions: List[int]) -> pd.DataFrame:
+        return pd.DataFrame({
+            "variable": [self.names[i] for i in positions],
+            "label": [self.labels[i] for i in positions],
+            "concept": [self.concepts[i] for i in positions],
+        })
+
+    def table(self, table: str) -> pd.DataFrame:
+        """All variables in a table (group), sorted by code."""
+        return self._frame(self._by_group.get(table.upper(), []))
+
+    def prefix(self, prefix: str) -> pd.DataFrame:
+        """All variables whose code starts with a prefix, sorted by code."""
+        start = bisect.bisect_left(self.names, prefix)
+        end = bisect.bisect_left(self.names, prefix + "\uffff")
+        return self._frame(list(range(start, end)))
+
+    def label(self, variable: str) -> Optional[str]:
+        """Label of a variable, or None if the dataset doesn't have it."""
+        i = self._position.get(variable)
+        return self.labels[i] if i is not None else None
+
+    def predicate_types(self, variables: List[str]) -> Dict[str, str]:
+        """`predicateType` (int, float, string, ...) of known variables."""
+        return {v: self.types[self._position[v]] for v in variables if v in self._position}
+
+    def __contains__(self, variable: str) -> bool:
+        return variable in self._position
+
+
+def _catalog_path(year: int, dataset: str) -> str:
+    return os.path.join(CATALOG_DIR, f"{year}_{dataset.replace('/', '_')}.json")
+
+
+def get_catalog(year: int, dataset: str, refresh: bool = False) -> VariableCatalog:
+    """
+    Load the variable catalog for a dataset, downloading it at most once.
+
+    The raw `variables.json` is kept under the query cache directory, and the
+    built index is kept in memory for the rest of the process.
+
+    Args:
+        year: Data year (e.g., 2022)
+        dataset: Dataset path (e.g., "acs/acs5")
+        refresh: Re-download `variables.json` and rebuild the index
+
+    Returns:
+        VariableCatalog for the dataset
+    """
+    if not refresh:
+        catalog = cached_catalog(year, dataset)
+        if catalog is not None:
+            return catalog
+
+    response = http_client.get(f"{BASE_URL}/{year}/{dataset}/variables.json")
+    response.raise_for_status()
+    return save_catalog(year, dataset, response.json()["variables"])
+
+
+def cached_catalog(year: int, dataset: str) -> Optional[VariableCatalog]:
+    """The catalog from memory or from the saved `variables.json`, or None if never downloaded."""
+    key = (int(year), dataset)
+    if key not in _catalogs:
+        path = _catalog_path(year, dataset)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            _catalogs[key] = VariableCatalog(json.load(f))
+    return _catalogs[key]
+
+
+def save_catalog(year: int, dataset: str, variables: dict) -> VariableCatalog:
+    """Save a downloaded `variables` mapping and index it (used by sync and async loaders)."""
+    path = _catalog_path(year, dataset)
+    os.makedirs(CATALOG_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(variables, f)
+    os.replace(tmp, path)
+
+    _catalogs[int(year), dataset] = VariableCatalog(variables)
+    return _catalogs[int(year), dataset]
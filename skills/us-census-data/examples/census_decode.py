@@ -0,0 +1,176 @@
+"""Typed, vectorized decoding of Census API responses.
+
+The API returns every value as a string, and ACS uses large negative
+sentinel codes for annotated values (e.g. -666666666 when an estimate can't
+be computed). Decoding here uses each variable's `predicateType` from the
+catalog (`census_catalog.py`) when it is already cached, so decoding never
+downloads the catalog. Without it, estimate/MOE codes are numeric and any
+other variable (decennial `P1_001N`, PEP `POP_2021`, ...) is numeric when all
+of its values are. The geography columns come from the request's `for`/`in`
+levels. All numeric columns are converted in one pass, sentinels become NA
+(except -555555555 in an MOE column: the estimate is controlled, so its MOE
+is 0) and compact dtypes are picked:
+
+    from census_decode import decode_frame, geography_columns
+
+    typed = decode_frame(raw_df, 2022, "acs/acs5", geography_columns("county:*", {"state": "17"}))
+
+`census.get_census_data` applies this by default (`typed=True`).
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import census_catalog
+
+# ACS annotation values that stand in for missing or non-computable estimates/MOEs
+SENTINELS = np.array([
+    -111111111,  # geography too small / not available
+    -222222222,  # MOE could not be computed (too few sample cases)
+    -333333333,  # median in an open-ended distribution interval
+    -666666666,  # estimate could not be computed
+    -888888888,  # not applicable / not available
+    -999999999,  # too few sample observations
+], dtype=np.float64)
+
+# In an MOE column: the estimate is controlled, so its MOE is exactly 0 (not
+# unknown). Anywhere else it is just another annotation and becomes NA.
+CONTROLLED = -555555555
+
+# Estimate/MOE codes such as B19013_001E, S1901_C01_012M or DP03_0062PE, used
+# when the catalog isn't cached or has no entry
+MEASURE_RE = re.compile(r"^[A-Z][A-Z0-9_]*_\d{3,4}P?[EM]$")
+MOE_RE = re.compile(r"^[A-Z][A-Z0-9_]*_\d{3,4}P?M$")
+
+# Text variables that are never measurements
+TEXT_COLUMNS = {"NAME", "GEO_ID", "GEOID", "UCGID", "SUMLEVEL", "GEOCOMP"}
+
+# A value with a leading zero ("050", "031") is a code, not a number
+CODE_RE = r"^-?0\d"
+
+INT32_MAX = np.iinfo(np.int32).max
+# float32 keeps ~7 significant digits; use it only for values that fit comfortably
+FLOAT32_SAFE = 1e6
+
+
+def geography_columns(geography: str, filters: Optional[dict] = None) -> List[str]:
+    """Columns the API adds for a request's `for=` level and `in=` parents (e.g. county, state)."""
+    return [geography.split(":", 1)[0]] + list(filters or {})
+
+
+def column_kinds(
+    columns: List[str], year: int, dataset: str, geography: Optional[Iterable[str]] = None
+) -> Dict[str, str]:
+    """
+    Classify columns as "int", "float", "string", "geography" or "auto".
+
+    Uses the catalog only if it is already in memory or on disk; without it,
+    estimate/MOE codes are "float" and other variables are "auto" (numeric if
+    their values are). `geography` names the `for`/`in` columns; if omitted,
+    lowercase column names are taken as geography, since variable codes are
+    uppercase.
+    """
+    catalog = census_catalog.cached_catalog(year, dataset)
+    types = catalog.predicate_types(columns) if catalog is not None else {}
+    geography = set(geography) if geography is not None else {c for c in columns if c == c.lower()}
+    kinds = {}
+    for col in columns:
+        predicate = types.get(col)
+        if col in geography:
+            kinds[col] = "geography"
+        elif col in TEXT_COLUMNS:
+            kinds[col] = "string"
+        elif predicate in ("int", "long"):
+            kinds[col] = "int"
+        elif predicate == "float":
+            kinds[col] = "float"
+        elif predicate is not None:
+            kinds[col] = "string"
+        elif MEASURE_RE.match(col):
+            kinds[col] = "float"
+        else:
+            kinds[col] = "auto"
+    return kinds
+
+
+def _is_numeric(values: pd.Series) -> bool:
+    """True if every non-empty value parses as a number and none looks like a zero-padded code."""
+    present = values[values.notna() & (values != "")].astype(str)
+    if present.empty:
+        return False
+    parsed = pd.to_numeric(present, errors="coerce")
+    return bool(parsed.notna().all()) and not present.str.match(CODE_RE).any()
+
+
+def _compact(values: np.ndarray, kind: str) -> pd.Series:
+    """Smallest safe dtype for a float64 column that may contain NaN."""
+    finite = values[~np.isnan(values)]
+    largest = np.abs(finite).max() if finite.size else 0.0
+    if kind == "int" and np.all(finite == np.round(finite)):
+        dtype = "Int32" if largest <= INT32_MAX else "Int64"
+        return pd.Series(values).astype(dtype)
+    return pd.Series(values.astype(np.float32 if largest < FLOAT32_SAFE else np.float64))
+
+
+def decode_frame(
+    df: pd.DataFrame, year: int, dataset: str, geography: Optional[Iterable[str]] = None
+) -> pd.DataFrame:
+    """
+    Convert a DataFrame of Census strings to typed columns.
+
+    All numeric columns are parsed together in one NumPy pass, sentinel codes
+    become NA (-555555555 in an MOE column, a controlled estimate's MOE,
+    becomes 0), integers become Int32 (Int64 if they don't fit), floats
+    become float32 where the values are small enough, and geography code
+    columns become categoricals.
+
+    Args:
+        df: Raw frame, e.g. `pd.DataFrame(data[1:], columns=data[0])`
+        year: Data year the variables belong to
+        dataset: Dataset path (e.g., "acs/acs5")
+        geography: The `for`/`in` columns (see `geography_columns`)
+
+    Returns:
+        New DataFrame with the same columns, typed
+    """
+    kinds = column_kinds(list(df.columns), year, dataset, geography)
+    for col in df.columns:
+        if kinds[col] == "auto":
+            kinds[col] = "int" if _is_numeric(df[col]) else "string"
+    numeric = [c for c in df.columns if kinds[c] in ("int", "float")]
+    moe = np.array([bool(MOE_RE.match(c)) for c in numeric])
+
+    out = {}
+    if numeric and len(df):
+        block = df[numeric].to_numpy(dtype=object, copy=True)
+        block[pd.isna(block) | (block == "")] = np.nan
+        parsed = block.astype(np.float64)
+        parsed[np.isin(parsed, SENTINELS)] = np.nan
+        controlled = parsed == CONTROLLED
+        parsed[controlled & moe] = 0.0
+        parsed[controlled & ~moe] = np.nan
+        for i, col in enumerate(numeric):
+            out[col] = _compact(parsed[:, i], kinds[col])
+
+    for col in df.columns:
+        if col in out:
+            out[col] = out[col].set_axis(df.index)
+        elif kinds[col] == "geography":
+            out[col] = df[col].astype("category")
+        elif kinds[col] in ("int", "float"):
+            out[col] = df[col].astype(np.float64)
+        else:
+            out[col] = df[col]
+    return pd.DataFrame(out, columns=df.columns, index=df.index)
+
+
+def decode_response(
+    data: list, year: int, dataset: str, geography: Optional[Iterable[str]] = None
+) -> pd.DataFrame:
+    """Build a typed DataFrame straight from the API's JSON array-of-arrays."""
+    if not data:
+        return pd.DataFrame()
+    return decode_frame(pd.DataFrame(data[1:], columns=data[0]), year, dataset, geography)
@@ -0,0 +1,229 @@
+"""Vectorized margin-of-error math for ACS results.
+
+Implements the aggregation and derived-estimate formulas from
+`references/datasets.md` (and the Census Bureau's ACS handbook) over whole
+DataFrames, using the estimate/MOE column pairs that `get_census_data`
+returns (`B19013_001E`/`B19013_001M`, `DP03_0062E`/`DP03_0062M`, ...). Every
+function names its outputs the same way, `<base>E`, `<base>M` and
+`<base>_CV`, so derived and aggregated estimates can be fed back in:
+
+    from census_moe import add_cv, aggregate, derive
+
+    df = add_cv(tracts)                                     # <base>_CV for every pair
+    df = derive(df, "pct_renter", ["B25003_003"], ["B25003_001"], kind="proportion")
+    hoods = aggregate(df, df["tract"].map(tract_to_hood), ["B25003_003", "B25003_001"])
+
+All MOEs are at the 90% confidence level, like the API's.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+Z90 = 1.645
+# An estimate column `<base>E` pairs with `<base>M`, e.g. B19013_001E, DP03_0062PE or pct_renterE
+PAIR_RE = re.compile(r"^(.+)([EM])$")
+
+# CV thresholds (percent) from references/datasets.md
+RELIABILITY_BINS = [0, 12, 40, np.inf]
+RELIABILITY_LABELS = ["high", "medium", "low"]
+
+
+def pair_columns(df: pd.DataFrame) -> Dict[str, Tuple[str, str]]:
+    """Map each variable base (e.g. "B19013_001") to its (estimate, MOE) columns."""
+    found: Dict[str, Dict[str, str]] = {}
+    for col in df.columns:
+        match = PAIR_RE.match(str(col))
+        if match:
+            found.setdefault(match.group(1), {})[match.group(2)] = col
+    return {base: (cols["E"], cols["M"]) for base, cols in found.items() if "E" in cols and "M" in cols}
+
+
+def _values(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """2-D float64 array of columns, with NA as NaN (works with Int32/float32 inputs)."""
+    return df[list(columns)].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _base(pairs: Dict[str, Tuple[str, str]], name: str) -> str:
+    """Variable base for a base or an estimate/MOE column name ("B19013_001E" -> "B19013_001")."""
+    if name not in pairs and PAIR_RE.match(name) and name[:-1] in pairs:
+        return name[:-1]
+    return name
+
+
+def _resolve(df: pd.DataFrame, bases: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """Estimate and MOE column names for variable bases (or their estimate column names)."""
+    pairs = pair_columns(df)
+    est, moe = [], []
+    for base in bases:
+        base = _base(pairs, base)
+        if base not in pairs:
+            raise KeyError(f"No estimate/MOE pair for {base!r}; request both {base}E and {base}M")
+        est.append(pairs[base][0])
+        moe.append(pairs[base][1])
+    return est, moe
+
+
+def cv(estimate: np.ndarray, moe: np.ndarray) -> np.ndarray:
+    """Coefficient of variation in percent: (MOE / 1.645) / estimate * 100."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(estimate != 0, (moe / Z90) / np.abs(estimate) * 100, np.nan)
+
+
+def reliability(cvs: Union[np.ndarray, pd.Series]) -> pd.Categorical:
+    """Label CVs as high (< 12%), medium (12-40%) or low (>= 40%) reliability."""
+    return pd.cut(np.asarray(cvs, dtype=np.float64), RELIABILITY_BINS, labels=RELIABILITY_LABELS, right=False)
+
+
+def moe_sum(estimates: np.ndarray, moes: np.ndarray) -> np.ndarray:
+    """
+    MOE of a sum, row-wise over the last axis: sqrt(MOE_1² + ... + MOE_n²).
+
+    Following Census guidance, among components whose estimate is zero only
+    the largest MOE is included, so many empty cells don't inflate the result.
+    A component MOE that is NA (could not be computed) makes the result NA.
+    """
+    zero = estimates == 0
+    squared = np.where(zero, 0.0, moes ** 2)
+    largest_zero = np.max(np.where(zero, moes, 0.0), axis=-1)
+    # Zero-estimate components drop out of `squared`, but their NA MOEs still count
+    unknown = np.isnan(moes).any(axis=-1)
+    return np.where(unknown, np.nan, np.sqrt(np.sum(squared, axis=-1) + largest_zero ** 2))
+
+
+def moe_ratio(num: np.ndarray, num_moe: np.ndarray, den: np.ndarray, den_moe: np.ndarray) -> np.ndarray:
+    """MOE of a ratio X/Y where X is not a subset of Y."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = num / den
+        return np.sqrt(num_moe ** 2 + r ** 2 * den_moe ** 2) / den
+
+
+def moe_proportion(num: np.ndarray, num_moe: np.ndarray, den: np.ndarray, den_moe: np.ndarray) -> np.ndarray:
+    """MOE of a proportion X/Y where X is a subset of Y.
+
+    Falls back to the ratio formula where the radicand is negative, as the
+    Census Bureau recommends.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = num / den
+        radicand = num_moe ** 2 - p ** 2 * den_moe ** 2
+        return np.where(
+            radicand < 0,
+            moe_ratio(num, num_moe, den, den_moe),
+            np.sqrt(np.maximum(radicand, 0)) / den,
+        )
+
+
+def add_cv(df: pd.DataFrame, with_reliability: bool = False) -> pd.DataFrame:
+    """Add a `<base>_CV` column (and optionally `<base>_RELIABILITY`) for every E/M pair."""
+    pairs = pair_columns(df)
+    if not pairs:
+        return df.copy()
+    est_cols = [e for e, _ in pairs.values()]
+    moe_cols = [m for _, m in pairs.values()]
+    cvs = cv(_values(df, est_cols), _values(df, moe_cols))
+
+    new = {f"{base}_CV": cvs[:, i] for i, base in enumerate(pairs)}
+    if with_reliability:
+        new.update({f"{base}_RELIABILITY": reliability(cvs[:, i]) for i, base in enumerate(pairs)})
+    return pd.concat([df, pd.DataFrame(new, index=df.index)], axis=1)
+
+
+def derive(
+    df: pd.DataFrame,
+    name: str,
+    numerator: Sequence[str],
+    denominator: Optional[Sequence[str]] = None,
+    kind: str = "sum",
+    scale: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Add a derived estimate with its MOE and CV as `<name>E`, `<name>M`, `<name>_CV`.
+
+    Args:
+        df: Frame with E/M column pairs
+        name: Prefix for the new columns
+        numerator: Variable bases summed into the numerator (e.g. ["B25003_003"])
+        denominator: Variable bases summed into the denominator (ratio/proportion)
+        kind: "sum", "ratio" or "proportion" (numerator is a subset of denominator)
+        scale: Multiply the result, e.g. 100 for percentages
+
+    Returns:
+        Copy of df with the three new columns
+    """
+    num_e, num_m = _resolve(df, numerator)
+    x = _values(df, num_e)
+    x_moe = moe_sum(x, _values(df, num_m))
+    x = x.sum(axis=1)
+
+    if kind == "sum":
+        est, moe = x, x_moe
+    elif kind in ("ratio", "proportion"):
+        if not denominator:
+            raise ValueError(f"kind={kind!r} needs a denominator")
+        den_e, den_m = _resolve(df, denominator)
+        y = _values(df, den_e)
+        y_moe = moe_sum(y, _values(df, den_m))
+        y = y.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            est = x / y
+        moe = (moe_ratio if kind == "ratio" else moe_proportion)(x, x_moe, y, y_moe)
+    else:
+        raise ValueError("kind must be 'sum', 'ratio' or 'proportion'")
+
+    out = df.copy()
+    out[f"{name}E"] = est * scale
+    out[f"{name}M"] = moe * scale
+    out[f"{name}_CV"] = cv(est, moe)
+    return out
+
+
+def aggregate(
+    df: pd.DataFrame,
+    by: Union[str, List[str], pd.Series],
+    bases: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Roll geographies up to larger areas (e.g. tracts to neighborhoods) in one groupby.
+
+    Estimates are summed and MOEs combined by root-sum-of-squares (with the
+    zero-estimate rule from `moe_sum`); a group with any NA MOE gets an NA
+    MOE and CV. Only additive estimates (counts) should be aggregated this
+    way; medians and averages can't be summed.
+
+    Args:
+        df: Frame with E/M column pairs
+        by: Column name(s) or a Series aligned to df mapping rows to groups
+        bases: Variable bases to aggregate (default: every E/M pair)
+
+    Returns:
+        One row per group with `_E`, `_M` and `_CV` columns
+    """
+    pairs = pair_columns(df)
+    bases = [_base(pairs, b) for b in bases] if bases is not None else list(pairs)
+    est_cols, moe_cols = _resolve(df, bases)
+
+    if isinstance(by, str):
+        keys = df[by]
+    elif isinstance(by, list):
+        keys = [df[col] for col in by]
+    else:
+        keys = by
+    est = pd.DataFrame(_values(df, est_cols), columns=bases, index=df.index)
+    moe = pd.DataFrame(_values(df, moe_cols), columns=bases, index=df.index)
+    zero = est == 0
+
+    est_sum = est.groupby(keys, observed=True).sum(min_count=1)
+    sq_sum = (moe ** 2).where(~zero, 0.0).groupby(keys, observed=True).sum()
+    largest_zero = moe.where(zero).groupby(keys, observed=True).max().fillna(0.0)
+    unknown = moe.isna().groupby(keys, observed=True).any()
+    moe_total = np.sqrt(sq_sum + largest_zero ** 2).mask(unknown)
+
+    out = {}
+    for base in bases:
+        out[f"{base}E"] = est_sum[base]
+        out[f"{base}M"] = moe_total[base]
+        out[f"{base}_CV"] = cv(est_sum[base].to_numpy(), moe_total[base].to_numpy())
+    return pd.DataFrame(out, index=est_sum.index)
@@ -0,0 +1,199 @@
+"""Multi-year Census panels with vintage checks.
+
+Trend analysis needs the same variables for the same geographies across many
+years, but variable codes come and go between vintages and a code is
+occasionally reused for a different measure. `get_census_panel` checks every
+variable against each year's cached catalog, fetches all years concurrently
+(each through `census_planner.get_census_data_planned`, so wide variable lists
+and nationwide tracts work too) and returns one long, typed frame indexed by
+(GEOID, year):
+
+    from census_panel import check_vintages, get_census_panel
+
+    cook_tracts = get_census_panel(range(2013, 2023), "acs/acs5", ["B19013_001E", "B25064"],
+                                   "tract:*", {"state": "17", "county": "031"})
+    cook_tracts.loc["17031010100"]                     # one tract, one row per year
+    cook_tracts["B19013_001E"].unstack("year")         # wide: tracts x years
+
+    check_vintages(range(2013, 2023), "acs/acs5", ["B19013_001E"])   # presence and label changes
+
+Bare table codes (e.g. "B25064") expand to the whole table, like `group(B25064)`.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+import requests
+
+import census_catalog
+import census_planner
+from census_planner import GEOGRAPHY_VARIABLES
+from census_tigerweb import add_geoid
+
+# A table code such as B19013, B25064 or B01001A
+TABLE_RE = re.compile(r"^[A-Z]\d{5}[A-Z]{0,3}$")
+
+# Years and inflation-adjustment notes differ between vintages of the same variable
+YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+
+
+def _normalize_label(label: str) -> str:
+    return " ".join(census_catalog.tokenize(YEAR_RE.sub("", label or "")))
+
+
+def _as_requested(variables: List[str]) -> List[str]:
+    """Bare table codes become `group(TABLE)`; everything else passes through."""
+    return [f"group({v})" if TABLE_RE.match(v) else v for v in variables]
+
+
+def _catalogs(years: List[int], dataset: str, max_workers: int) -> Dict[int, Optional[census_catalog.VariableCatalog]]:
+    """Catalog per year, None for years the dataset doesn't exist."""
+    def load(year: int):
+        try:
+            return year, census_catalog.get_catalog(year, dataset)
+        except requests.HTTPError as exc:
+            if exc.response is not None and exc.response.status_code == 404:
+                return year, None
+            raise
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(pool.map(load, years))
+
+
+def check_vintages(
+    years: Iterable[int],
+    dataset: str,
+    variables: List[str],
+    max_workers: int = 8,
+) -> pd.DataFrame:
+    """
+    Check variables against each year's catalog.
+
+    Args:
+        years: Data years (e.g., range(2013, 2023))
+        dataset: Dataset path (e.g., "acs/acs5")
+        variables: Variable codes, `group(TABLE)` or bare table codes
+        max_workers: Concurrent catalog downloads (first use per year only)
+
+    Returns:
+        DataFrame with one row per (variable, year): available, label, and
+        label_changed (True where the label differs from the variable's
+        first available year, ignoring years such as "2022 inflation-adjusted")
+    """
+    years = sorted(int(y) for y in years)
+    catalogs = _catalogs(years, dataset, max_workers)
+    requested = _as_requested(variables)
+
+    per_year = {
+        year: census_planner.expand_variables(year, dataset, requested) if catalog is not None else []
+        for year, catalog in catalogs.items()
+    }
+    codes = list(dict.fromkeys(v for year in years for v in per_year[year]))
+    codes += [v for v in requested if v not in codes and not v.lower().startswith("group(")]
+
+    rows = []
+    for var in codes:
+        first = None
+        for year in years:
+            catalog = catalogs[year]
+            available = catalog is not None and (var in GEOGRAPHY_VARIABLES or var in catalog)
+            label = catalog.label(var) if catalog is not None else None
+            normalized = _normalize_label(label) if label else None
+            if first is None and normalized:
+                first = normalized
+            rows.append({
+                "variable": var,
+                "year": year,
+                "available": available,
+                "label": label,
+                "label_changed": bool(normalized and normalized != first),
+            })
+    return pd.DataFrame(rows, columns=["variable", "year", "available", "label", "label_changed"])
+
+
+def get_census_panel(
+    years: Iterable[int],
+    dataset: str,
+    variables: List[str],
+    geography: str,
+    filters: Optional[Dict[str, str]] = None,
+    max_workers: int = 8,
+    strict: bool = False,
+    typed: bool = True,
+) -> pd.DataFrame:
+    """
+    Fetch the same variables and geographies for many years as one long frame.
+
+    Years run concurrently, each split into planned sub-requests (see
+    `census_planner.py`); total concurrency stays around `max_workers`.
+    Variables missing from a year's catalog are left out of that year's
+    request and come back as NA.
+
+    Args:
+        years: Data years (e.g., range(2013, 2023))
+        dataset: Dataset path (e.g., "acs/acs5")
+        variables: Variable codes, `group(TABLE)` or bare table codes
+        geography: Target geography (e.g., "tract:*")
+        filters: Parent geography filters (e.g., {"state": "17", "county": "031"})
+        max_workers: Maximum concurrent requests (keep <= http_client.POOL_SIZE)
+        strict: Raise instead of warning when a variable is missing from a
+            year, its label changed, or the dataset doesn't exist for a year
+        typed: Decode each year with its own catalog (see `census_decode.py`)
+
+    Returns:
+        DataFrame indexed by (GEOID, year), one column per variable plus the
+        geography code columns (as categoricals)
+    """
+    years = sorted(int(y) for y in years)
+    report = check_vintages(years, dataset, variables, max_workers)
+
+    problems = []
+    # Catalogs are in memory after check_vintages
+    missing_years = [y for y, catalog in _catalogs(years, dataset, max_workers).items() if catalog is None]
+    if missing_years:
+        problems.append(f"{dataset} is not available for {', '.join(map(str, missing_years))}")
+    gaps = report[~report["available"] & ~report["year"].isin(missing_years)]
+    for var, group in gaps.groupby("variable", sort=False):
+        problems.append(f"{var} missing in {', '.join(map(str, group['year']))}")
+    changed = report[report["label_changed"]]
+    for var, group in changed.groupby("variable", sort=False):
+        problems.append(f"{var} label changed in {', '.join(map(str, group['year']))}")
+    if problems and strict:
+        raise ValueError("Vintage check failed: " + "; ".join(problems))
+    for problem in problems:
+        print(f"Warning: {problem}")
+
+    available = report[report["available"]]
+    per_year = {
+        year: list(available.loc[available["year"] == year, "variable"])
+        for year in years if year not in missing_years
+    }
+    per_year = {year: codes for year, codes in per_year.items() if codes}
+    if not per_year:
+        return pd.DataFrame()
+
+    outer = min(len(per_year), max_workers)
+    inner = max(1, max_workers // outer)
+
+    def fetch(year: int) -> pd.DataFrame:
+        df = census_planner.get_census_data_planned(
+            year, dataset, per_year[year], geography, filters, max_workers=inner, typed=typed
+        )
+        return df.assign(year=year)
+
+    with ThreadPoolExecutor(max_workers=outer) as pool:
+        frames = [df for df in pool.map(fetch, per_year) if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    codes = list(dict.fromkeys(available["variable"]))
+    geo_columns = [c for c in frames[0].columns if c not in codes and c != "year"]
+    panel = pd.concat(frames, ignore_index=True)
+    panel = add_geoid(panel, parts=geo_columns)
+    for col in geo_columns:
+        panel[col] = panel[col].astype("category")
+
+    columns = [c for c in codes if c in panel.columns] + geo_columns
+    return panel.set_index(["GEOID", "year"])[columns].sort_index()
@@ -0,0 +1,190 @@
+"""Census request planner for wide variable lists and nationwide small geographies.
+
+The Census API caps a request at 50 variables, and small geographies such as
+tracts or block groups have to be requested inside specific parent
+geographies (see `references/geographies.md`). This module plans the
+sub-requests, runs them concurrently through the shared client in
+`http_client.py`, and joins the pieces back on the geography columns:
+
+    from census_planner import get_census_data_planned
+
+    # Every tract in the country, full B25001 + B19013 tables: one call
+    tracts = get_census_data_planned(
+        2022, "acs/acs5", ["NAME", "group(B19013)", "group(B25001)"], "tract:*"
+    )
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import census
+import census_catalog
+import census_decode
+
+# Census API limit on variables per request
+MAX_VARIABLES = 50
+
+# Parents that must be given as specific codes (not `*`) for each level
+REQUIRED_PARENTS = {
+    "tract": ["state"],
+    "block group": ["state", "county"],
+    "block": ["state", "county", "tract"],
+    "county subdivision": ["state", "county"],
+    "school district (unified)": ["state"],
+    "school district (elementary)": ["state"],
+    "school district (secondary)": ["state"],
+}
+
+# Variables that describe the geography rather than a measurement
+GEOGRAPHY_VARIABLES = {"NAME", "GEO_ID"}
+
+SubRequest = Tuple[List[str], Dict[str, str]]
+
+
+def expand_variables(year: int, dataset: str, variables: List[str]) -> List[str]:
+    """Replace `group(TABLE)` entries with the table's variables from the catalog."""
+    expanded = []
+    for var in variables:
+        if var.lower().startswith("group(") and var.endswith(")"):
+            table = var[len("group("):-1]
+            expanded.extend(census_catalog.get_catalog(year, dataset).table(table)["variable"])
+        else:
+            expanded.append(var)
+    return list(dict.fromkeys(expanded))
+
+
+def batch_variables(variables: List[str], size: int = MAX_VARIABLES) -> List[List[str]]:
+    """Split variables into batches of at most `size`; NAME/GEO_ID only go in the first."""
+    geo = [v for v in variables if v in GEOGRAPHY_VARIABLES]
+    data = [v for v in variables if v not in GEOGRAPHY_VARIABLES]
+    if not data:
+        return [geo]
+    first = size - len(geo)
+    batches = [geo + data[:first]]
+    for i in range(first, len(data), size):
+        batches.append(data[i:i + size])
+    return batches
+
+
+def _list_codes(year: int, dataset: str, level: str, parents: Dict[str, str]) -> List[str]:
+    """Codes of every geography at `level` inside `parents`."""
+    listing = census.get_census_data(year, dataset, ["NAME"], f"{level}:*", parents or None, typed=False)
+    return sorted(listing[level].unique()) if not listing.empty else []
+
+
+def expand_parents(
+    year: int,
+    dataset: str,
+    level: str,
+    filters: Optional[Dict[str, str]],
+    max_workers: int = 8,
+) -> List[Dict[str, str]]:
+    """
+    Fan `*` or missing parent geographies out into one filter dict per parent.
+
+    For example `tract:*` with no filters becomes one `{"state": ...}` per
+    state, and `block group:*` in state 17 becomes one `{"state": "17",
+    "county": ...}` per Illinois county.
+    """
+    required = REQUIRED_PARENTS.get(level, [])
+    filters = {k: str(v) for k, v in (filters or {}).items()}
+    extras = {k: v for k, v in filters.items() if k not in required}
+    combos = [{p: filters[p] for p in required if filters.get(p, "*") != "*"}]
+
+    for depth, parent in enumerate(required):
+        ready = [c for c in combos if parent in c]
+        todo = [c for c in combos if parent not in c]
+        if not todo:
+            continue
+
+        def children(combo: Dict[str, str]) -> List[Dict[str, str]]:
+            ancestors = {p: combo[p] for p in required[:depth]}
+            return [{**ancestors, parent: code, **{p: combo[p] for p in combo if p not in ancestors}}
+                    for code in _list_codes(year, dataset, parent, ancestors)]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            expanded = [child for group in pool.map(children, todo) for child in group]
+        combos = ready + expanded
+
+    # Census wants `in=` clauses in hierarchy order
+    return [{**{p: c[p] for p in required}, **extras} for c in combos]
+
+
+def plan_requests(
+    year: int,
+    dataset: str,
+    variables: List[str],
+    geography: str,
+    filters: Optional[Dict[str, str]] = None,
+    max_workers: int = 8,
+) -> List[SubRequest]:
+    """List the (variables, filters) sub-requests needed for a query."""
+    level = geography.split(":", 1)[0]
+    batches = batch_variables(expand_variables(year, dataset, variables))
+    parents = expand_parents(year, dataset, level, filters, max_workers)
+    return [(batch, combo) for combo in parents for batch in batches]
+
+
+def get_census_data_planned(
+    year: int,
+    dataset: str,
+    variables: List[str],
+    geography: str,
+    filters: Optional[Dict[str, str]] = None,
+    max_workers: int = 8,
+    typed: bool = True,
+) -> pd.DataFrame:
+    """
+    Query any number of variables for any geography in one call.
+
+    Variables are split into batches of at most 50, `*` parent geographies are
+    fanned out (e.g. tracts state by state), the sub-requests run concurrently
+    through `census.get_census_data`, and the pieces are joined back on the
+    geography columns.
+
+    Args:
+        year: Data year (e.g., 2022)
+        dataset: Dataset path (e.g., "acs/acs5")
+        variables: Variable codes; `group(TABLE)` expands to the whole table
+        geography: Target geography (e.g., "tract:*")
+        filters: Parent geography filters (e.g., {"state": "17"})
+        max_workers: Maximum concurrent requests (keep <= http_client.POOL_SIZE)
+        typed: Decode the joined result once (see `census_decode.py`)
+
+    Returns:
+        DataFrame with one row per geography and every requested variable
+    """
+    plan = plan_requests(year, dataset, variables, geography, filters, max_workers)
+    if not plan:
+        return pd.DataFrame()
+
+    def run(request: SubRequest) -> pd.DataFrame:
+        batch, combo = request
+        return census.get_census_data(year, dataset, batch, geography, combo or None, typed=False)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = list(pool.map(run, plan))
+
+    # Regroup by parent geography: join variable batches side by side on the geography columns
+    per_parent: Dict[Tuple, List[Tuple[List[str], pd.DataFrame]]] = {}
+    for (batch, combo), df in zip(plan, frames):
+        if not df.empty:
+            per_parent.setdefault(tuple(sorted(combo.items())), []).append((batch, df))
+
+    pieces = []
+    for parts in per_parent.values():
+        keys = [c for c in parts[0][1].columns if c not in parts[0][0]]
+        joined = reduce(lambda a, b: a.merge(b, on=keys, how="outer"), [df for _, df in parts])
+        pieces.append(joined[[c for c in joined.columns if c not in keys] + keys])
+
+    if not pieces:
+        return pd.DataFrame()
+    result = pd.concat(pieces, ignore_index=True)
+    if not typed:
+        return result
+    geo = set(census_decode.geography_columns(geography, filters))
+    geo.update(key for _, combo in plan for key in combo)
+    return census_decode.decode_frame(result, year, dataset, geo)
@@ -0,0 +1,294 @@
+"""TIGERweb boundaries with a local cache and vectorized point-in-polygon joins.
+
+Pages a TIGERweb layer (e.g. the tracts of one county) into GeoJSON once,
+simplified on the server, and keeps it on disk under the query cache
+directory. `BoundaryIndex` then assigns GEOIDs to any number of lat/lon
+points locally, so point data such as Chicago crimes or 311 requests can be
+joined to `get_census_data` output without a TIGERweb request per area:
+
+    from census_tigerweb import TRACTS, add_geoid, get_index
+
+    tracts = get_index(TRACTS, state="17", county="031")      # Cook County tracts
+    crimes["GEOID"] = tracts.assign(crimes["latitude"], crimes["longitude"])
+
+    income = add_geoid(get_census_data(2022, "acs/acs5", ["B19013_001E"], "tract:*",
+                                       {"state": "17", "county": "031"}))
+    crimes.merge(income, on="GEOID", how="left")
+
+Layer IDs and parameters follow `references/tigerweb.md`. Pass
+`service="tigerWMS_ACS2023"` (or another vintage) to match the data year.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import http_client
+import query_cache
+
+BASE_URL = "https://tigerweb.geo.census.gov/arcgis/rest/services/TIGERweb"
+SERVICE = "tigerWMS_Current"
+BOUNDARY_DIR = os.path.join(query_cache.CACHE_DIR, "tigerweb")
+
+# Layer IDs in tigerWMS_Current
+STATES = 84
+COUNTIES = 86
+TRACTS = 8
+BLOCK_GROUPS = 10
+PLACES = 28
+ZCTAS = 2
+
+# Features per request; TIGERweb caps pages at a few thousand
+PAGE_SIZE = 1000
+
+# Server-side simplification in degrees (~10 m); boundaries stay well inside tract accuracy
+MAX_OFFSET = 0.0001
+
+# Geography columns returned by the Census API, in GEOID order
+GEOID_PARTS = ["state", "county", "tract", "block group"]
+
+# Points x edges evaluated per numpy block in the point-in-polygon test
+BLOCK_ELEMENTS = 4_000_000
+
+_indexes: Dict[str, "BoundaryIndex"] = {}
+
+
+def _layer_url(layer: int, service: str) -> str:
+    return f"{BASE_URL}/{service}/MapServer/{layer}/query"
+
+
+def _where(state: Optional[str], county: Optional[str], where: Optional[str]) -> str:
+    clauses = [f"STATE='{state}'"] if state else []
+    if county:
+        clauses.append(f"COUNTY='{county}'")
+    if where:
+        clauses.append(f"({where})")
+    return " AND ".join(clauses) or "1=1"
+
+
+def _cache_path(layer: int, service: str, params: dict) -> str:
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+    return os.path.join(BOUNDARY_DIR, f"{service}_{layer}_{digest}.geojson")
+
+
+def _query(layer: int, service: str, params: dict) -> dict:
+    resp = http_client.get(_layer_url(layer, service), params=params)
+    resp.raise_for_status()
+    data = resp.json()
+    if "error" in data:
+        raise RuntimeError(f"TIGERweb error: {data['error']}")
+    return data
+
+
+def get_boundaries(
+    layer: int = TRACTS,
+    state: Optional[str] = None,
+    county: Optional[str] = None,
+    where: Optional[str] = None,
+    fields: Sequence[str] = ("GEOID", "NAME"),
+    service: str = SERVICE,
+    max_offset: float = MAX_OFFSET,
+    refresh: bool = False,
+    max_workers: int = 4,
+) -> dict:
+    """
+    GeoJSON FeatureCollection for a TIGERweb layer, from the local cache or paged from the server.
+
+    One `returnCountOnly` request sizes the download, then pages of
+    `PAGE_SIZE` features (ordered by GEOID) are fetched concurrently. The
+    result is saved as GeoJSON; boundaries change yearly, so there is no TTL.
+
+    Args:
+        layer: Layer ID (TRACTS, BLOCK_GROUPS, COUNTIES, ...)
+        state: State FIPS filter (e.g., "17")
+        county: County FIPS filter (e.g., "031")
+        where: Extra TIGERweb `where` clause
+        fields: Attribute fields to keep (GEOID is always included)
+        service: Map service / vintage (e.g., "tigerWMS_ACS2023")
+        max_offset: Server-side simplification tolerance in degrees (0 for full detail)
+        refresh: Re-download even if cached
+        max_workers: Concurrent page requests
+
+    Returns:
+        GeoJSON FeatureCollection in WGS 84 (EPSG:4326)
+    """
+    out_fields = ",".join(dict.fromkeys(["GEOID", *fields]))
+    base = {"where": _where(state, county, where), "outFields": out_fields, "outSR": 4326, "f": "geojson"}
+    if max_offset:
+        base["maxAllowableOffset"] = max_offset
+
+    path = _cache_path(layer, service, base)
+    if os.path.exists(path) and not refresh:
+        with open(path) as f:
+            return json.load(f)
+
+    count = _query(layer, service, {"where": base["where"], "returnCountOnly": "true", "f": "json"})["count"]
+
+    def page(offset: int) -> List[dict]:
+        # A layer's maxRecordCount may be below PAGE_SIZE; keep going until the page is full
+        wanted = min(PAGE_SIZE, count - offset)
+        features: List[dict] = []
+        while len(features) < wanted:
+            params = {**base, "returnGeometry": "true", "orderByFields": "GEOID",
+                      "resultOffset": offset + len(features), "resultRecordCount": wanted - len(features)}
+            batch = _query(layer, service, params).get("features", [])
+            if not batch:
+                break
+            features.extend(batch)
+        return features
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pages = list(pool.map(page, range(0, count, PAGE_SIZE)))
+    features = [f for p in pages for f in p]
+    if len(features) != count:
+        print(f"Warning: TIGERweb returned {len(features)} of {count} features for layer {layer}")
+
+    collection = {"type": "FeatureCollection", "features": features}
+    os.makedirs(BOUNDARY_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(collection, f)
+    os.replace(tmp, path)
+    return collection
+
+
+def _rings(geometry: dict) -> List[np.ndarray]:
+    """Every ring (outer and holes) of a Polygon or MultiPolygon as (n, 2) lon/lat arrays."""
+    if not geometry:
+        return []
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return []
+    return [np.asarray(ring, dtype="float64")[:, :2] for polygon in polygons for ring in polygon if len(ring) >= 3]
+
+
+class BoundaryIndex:
+    """
+    Point-in-polygon lookup over a set of boundaries.
+
+    Points are sorted by longitude once; each boundary then tests only the
+    points inside its bounding box, all at once, with an even-odd ray cast
+    over every edge of its rings (so holes and multi-part shapes work).
+    """
+
+    def __init__(self, features: List[dict], id_field: str = "GEOID"):
+        self.ids: List[str] = []
+        self._edges: List[np.ndarray] = []
+        bounds = []
+        for feature in features:
+            rings = _rings(feature.get("geometry"))
+            if not rings:
+                continue
+            # Edge k runs from vertex k to k + 1 within each (closed) ring
+            edges = np.concatenate([np.hstack([r[:-1], r[1:]]) for r in rings])
+            points = np.concatenate(rings)
+            self.ids.append(str(feature["properties"][id_field]))
+            self._edges.append(edges)
+            bounds.append([points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max()])
+        self.bounds = np.asarray(bounds, dtype="float64").reshape(-1, 4)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _inside(edges: np.ndarray, lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """Even-odd test of points against one boundary's edges, in blocks of points."""
+        x0, y0, x1, y1 = edges.T
+        inside = np.zeros(len(lon), dtype=bool)
+        step = max(1, BLOCK_ELEMENTS // max(len(edges), 1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for start in range(0, len(lon), step):
+                px = lon[start:start + step, None]
+                py = lat[start:start + step, None]
+                crosses = (y0 > py) != (y1 > py)
+                x_cross = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+                inside[start:start + step] = np.count_nonzero(crosses & (px < x_cross), axis=1) % 2 == 1
+        return inside
+
+    def assign(self, lat, lon) -> np.ndarray:
+        """
+        Boundary id (GEOID) containing each point, or None outside every boundary.
+
+        Args:
+            lat, lon: Arrays or Series of coordinates in degrees (NaN allowed)
+
+        Returns:
+            Object array of ids, aligned with the input
+        """
+        lat = pd.to_numeric(pd.Series(np.asarray(lat)), errors="coerce").to_numpy(dtype="float64")
+        lon = pd.to_numeric(pd.Series(np.asarray(lon)), errors="coerce").to_numpy(dtype="float64")
+        result = np.full(len(lat), None, dtype=object)
+
+        valid = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        order = valid[np.argsort(lon[valid], kind="stable")]
+        sorted_lon = lon[order]
+        unassigned = np.ones(len(lat), dtype=bool)
+
+        for i, (west, south, east, north) in enumerate(self.bounds):
+            lo = np.searchsorted(sorted_lon, west, side="left")
+            hi = np.searchsorted(sorted_lon, east, side="right")
+            candidates = order[lo:hi]
+            candidates = candidates[unassigned[candidates]]
+            candidates = candidates[(lat[candidates] >= south) & (lat[candidates] <= north)]
+            if not len(candidates):
+                continue
+            hit = candidates[self._inside(self._edges[i], lon[candidates], lat[candidates])]
+            result[hit] = self.ids[i]
+            unassigned[hit] = False
+        return result
+
+    def assign_frame(
+        self,
+        df: pd.DataFrame,
+        lat_column: str = "latitude",
+        lon_column: str = "longitude",
+        column: str = "GEOID",
+    ) -> pd.DataFrame:
+        """Copy of `df` with a column of containing boundary ids."""
+        out = df.copy()
+        out[column] = pd.Series(self.assign(df[lat_column], df[lon_column]), index=df.index, dtype="string")
+        return out
+
+
+def get_index(
+    layer: int = TRACTS,
+    state: Optional[str] = None,
+    county: Optional[str] = None,
+    where: Optional[str] = None,
+    service: str = SERVICE,
+    max_offset: float = MAX_OFFSET,
+    refresh: bool = False,
+) -> BoundaryIndex:
+    """BoundaryIndex over a layer (see `get_boundaries`), kept in memory for the process."""
+    key = json.dumps([layer, state, county, where, service, max_offset])
+    if key not in _indexes or refresh:
+        collection = get_boundaries(layer, state, county, where, ("GEOID",), service, max_offset, refresh)
+        _indexes[key] = BoundaryIndex(collection["features"])
+    return _indexes[key]
+
+
+def add_geoid(df: pd.DataFrame, column: str = "GEOID", parts: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Copy of a `get_census_data` frame with a GEOID built from its geography columns.
+
+    Concatenates state, county, tract and block group codes (whichever are
+    present, in that order), e.g. "17" + "031" + "010100" -> "17031010100".
+    Pass `parts` for other levels, e.g. ["state", "place"].
+    """
+    parts = parts or [c for c in GEOID_PARTS if c in df.columns]
+    if not parts:
+        raise ValueError(f"No geography columns ({', '.join(GEOID_PARTS)}) to build a GEOID from")
+    out = df.copy()
+    geoid = out[parts[0]].astype("string")
+    for col in parts[1:]:
+        geoid = geoid + out[col].astype("string")
+    out[column] = geoid
+    return out
@@ -0,0 +1,169 @@
+"""Shared asyncio HTTP client, the async counterpart of `http_client.py`.
+
+For services that run inside an event loop: requests go through one pooled
+`httpx.AsyncClient` per loop, so hundreds of concurrent lookups share
+keep-alive connections without a thread per request. It keeps the behavior
+of the sync client:
+
+- Retries on 429 and 5xx responses (and dropped connections) with exponential
+  backoff and jitter, honoring the server's `Retry-After` header
+- A per-host token bucket that halves its rate when the server throttles and
+  creeps back up while requests succeed
+
+and adds a per-host cap on requests in flight (`HOST_LIMITS`, default
+`http_client.POOL_SIZE`):
+
+    import http_async
+
+    resp = await http_async.get("https://api.census.gov/data/2022/acs/acs5", params={...})
+    resp.raise_for_status()
+
+    http_async.set_host_limit("data.cityofchicago.org", 4)
+    await http_async.aclose()                     # on shutdown
+
+Cancelling the calling task cancels the in-flight request (or the wait for a
+slot or a retry) and releases its slot. Requires httpx (`pip install httpx`).
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+import http_client
+from http_client import (
+    INITIAL_RATE, MAX_RATE, MIN_RATE, POOL_SIZE, RETRY_STATUSES, TIMEOUT, backoff_delay, retry_after,
+)
+
+# Requests in flight per host; override one host with set_host_limit()
+HOST_CONCURRENCY = int(os.environ.get("HTTP_HOST_CONCURRENCY", POOL_SIZE))
+HOST_LIMITS: Dict[str, int] = {}
+
+# Connections kept open across all hosts
+MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 100))
+
+
+class AsyncTokenBucket:
+    """Token bucket for one event loop whose rate adapts to throttling (AIMD)."""
+
+    def __init__(self, rate: float = INITIAL_RATE, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or float(POOL_SIZE)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self) -> None:
+        self.rate = min(MAX_RATE, self.rate + 0.1)
+
+    def on_throttle(self) -> None:
+        self.rate = max(MIN_RATE, self.rate / 2)
+        self._tokens = min(self._tokens, 0.0)
+
+
+class AsyncHttpClient:
+    """One pooled `httpx.AsyncClient` plus per-host limits and rate limiters."""
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS, max_retries: int = http_client.MAX_RETRIES):
+        self.max_retries = max_retries
+        self._client = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, AsyncTokenBucket] = {}
+
+    def _host(self, host: str):
+        if host not in self._slots:
+            limit = HOST_LIMITS.get(host, HOST_CONCURRENCY)
+            self._slots[host] = asyncio.Semaphore(limit)
+            self._buckets[host] = AsyncTokenBucket(capacity=limit)
+        return self._slots[host], self._buckets[host]
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET with pooling, per-host limits, rate limiting and retries.
+
+        Accepts the same keyword arguments as `httpx.AsyncClient.get`. Returns
+        the final response; callers still call `raise_for_status()` on it.
+        """
+        url = http_client.resolve(url)
+        slots, bucket = self._host(urlsplit(url).netloc)
+        for attempt in range(self.max_retries + 1):
+            async with slots:
+                await bucket.acquire()
+                try:
+                    resp = await self._client.get(url, **kwargs)
+                except httpx.TransportError:
+                    if attempt == self.max_retries:
+                        raise
+                    resp = None
+
+            if resp is None:
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            if resp.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                if resp.status_code == 429:
+                    bucket.on_throttle()
+                elif resp.is_success:
+                    bucket.on_success()
+                return resp
+
+            if resp.status_code == 429:
+                bucket.on_throttle()
+            # Wait outside the host slot so other requests can use it
+            delay = retry_after(resp)
+            await asyncio.sleep(delay if delay is not None else backoff_delay(attempt))
+
+        raise RuntimeError("unreachable")
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# httpx clients and asyncio primitives belong to the loop that created them
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpClient]" = weakref.WeakKeyDictionary()
+
+
+def get_client() -> AsyncHttpClient:
+    """The client shared by all helpers on the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _clients:
+        _clients[loop] = AsyncHttpClient()
+    return _clients[loop]
+
+
+def set_host_limit(host: str, limit: int) -> None:
+    """Cap requests in flight to a host; applies to requests started afterwards."""
+    HOST_LIMITS[host] = limit
+    for client in list(_clients.values()):
+        client._slots.pop(host, None)
+        client._buckets.pop(host, None)
+
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    """GET through the running loop's shared client (see `AsyncHttpClient.get`)."""
+    return await get_client().get(url, **kwargs)
+
+
+async def aclose() -> None:
+    """Close the running loop's client, e.g. on application shutdown."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -1,143 +1,11 @@
 """US Census API query examples using requests + pandas."""
 
-import os
-import requests
 import pandas as pd
-from typing import Optional, List, Dict
 
-# Load API key from environment or .env file
-def load_api_key() -> Optional[str]:
-    """Load Census API key from environment or .env file."""
-    key = os.environ.get("CENSUS_API_KEY")
-    if key:
-        return key
-
-    # Try loading from .env file
-    env_path = os.path.join(os.getcwd(), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                if line.startswith("CENSUS_API_KEY="):
-                    return line.strip().split("=", 1)[1]
-
-    print("Warning: No CENSUS_API_KEY found. Register at https://api.census.gov/data/key_signup.html")
-    return None
-
-API_KEY = load_api_key()
-BASE_URL = "https://api.census.gov/data"
-
-
-def get_census_data(
-    year: int,
-    dataset: str,
-    variables: list,
-    geography: str,
-    filters: dict = None
-) -> pd.DataFrame:
-    """
-    Query Census API and return results as DataFrame.
-
-    Args:
-        year: Data year (e.g., 2022)
-        dataset: Dataset path (e.g., "acs/acs5")
-        variables: List of variable codes (e.g., ["NAME", "B01001_001E"])
-        geography: Target geography (e.g., "county:*")
-        filters: Parent geography filters (e.g., {"state": "17", "county": "031"})
-
-    Returns:
-        DataFrame with Census data
-    """
-    url = f"{BASE_URL}/{year}/{dataset}"
-
-    # Build query string manually to handle multiple 'in' parameters correctly
-    query_parts = [
-        f"get={','.join(variables)}",
-        f"for={geography}",
-    ]
-
-    # Census API requires separate &in= for each parent geography level
-    if filters:
-        for geo, code in filters.items():
-            query_parts.append(f"in={geo}:{code}")
-
-    if API_KEY:
-        query_parts.append(f"key={API_KEY}")
-
-    full_url = f"{url}?{'&'.join(query_parts)}"
-    response = requests.get(full_url)
-    response.raise_for_status()
-
-    data = response.json()
-    return pd.DataFrame(data[1:], columns=data[0])
-
-
-def search_variables(
-    year: int,
-    dataset: str,
-    keyword: str
-) -> pd.DataFrame:
-    """
-    Search for variables containing a keyword.
-
-    Args:
-        year: Data year
-        dataset: Dataset path
-        keyword: Search term (case-insensitive)
-
-    Returns:
-        DataFrame of matching variables with name, label, concept
-    """
-    url = f"{BASE_URL}/{year}/{dataset}/variables.json"
-    response = requests.get(url)
-    response.raise_for_status()
-
-    variables = response.json()["variables"]
-
-    results = []
-    keyword_lower = keyword.lower()
-
-    for name, info in variables.items():
-        label = info.get("label", "")
-        concept = info.get("concept", "")
-
-        if keyword_lower in label.lower() or keyword_lower in concept.lower():
-            results.append({
-                "variable": name,
-                "label": label,
-                "concept": concept
-            })
-
-    return pd.DataFrame(results)
-
-
-def get_table_variables(year: int, dataset: str, table: str) -> pd.DataFrame:
-    """
-    Get all variables in a Census table.
-
-    Args:
-        year: Data year
-        dataset: Dataset path
-        table: Table code (e.g., "B19013")
-
-    Returns:
-        DataFrame with variable codes and labels
-    """
-    url = f"{BASE_URL}/{year}/{dataset}/groups/{table}.json"
-    response = requests.get(url)
-    response.raise_for_status()
-
-    data = response.json()
-    variables = data.get("variables", {})
-
-    results = []
-    for name, info in variables.items():
-        if not name.endswith("_"):  # Skip internal variables
-            results.append({
-                "variable": name,
-                "label": info.get("label", "")
-            })
-
-    return pd.DataFrame(results).sort_values("variable")
+# Query helpers live in census.py so they can be imported and share the local cache.
+# Results come back typed (numbers as Int32/float32, annotation codes as NA),
+# so no pd.to_numeric pass is needed.
+from census import get_census_data, search_variables, get_table_variables
 
 
 # Example 1: State-level population
@@ -148,7 +16,6 @@ states = get_census_data(
     variables=["NAME", "B01001_001E"],
     geography="state:*"
 )
-states["B01001_001E"] = pd.to_numeric(states["B01001_001E"])
 print(states.head(10))
 print()
 
@@ -162,8 +29,6 @@ income = get_census_data(
     geography="county:*",
     filters={"state": "17"}
 )
-income["B19013_001E"] = pd.to_numeric(income["B19013_001E"])
-income["B19013_001M"] = pd.to_numeric(income["B19013_001M"])
 print(income.sort_values("B19013_001E", ascending=False).head(10))
 print()
 
@@ -177,8 +42,6 @@ tracts = get_census_data(
     geography="tract:*",
     filters={"state": "17", "county": "031"}
 )
-tracts["B01001_001E"] = pd.to_numeric(tracts["B01001_001E"])
-tracts["B25001_001E"] = pd.to_numeric(tracts["B25001_001E"])
 print(f"Found {len(tracts)} tracts")
 print(tracts.head(10))
 print()
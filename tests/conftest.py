@@ -0,0 +1,16 @@
+"""Make the skills' example modules importable by name, as the examples import each other.
+
+The Socrata and Census skills ship identical copies of the shared modules
+(`http_client.py`, `query_cache.py`, ...), so the first copy on the path is
+the one under test.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for skill in ("chicago-data-portal", "us-census-data"):
+    path = os.path.join(ROOT, "skills", skill, "examples")
+    if path not in sys.path:
+        sys.path.append(path)
@@ -0,0 +1,44 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("httpx")
+
+import census
+import census_async
+import census_catalog
+import http_async
+import http_client
+
+DATA = [["NAME", "B19013_001E", "B19013_001M", "state"], ["A", "50000", "-555555555", "17"], ["B", "-666666666", "900", "18"]]
+
+
+class Response:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return DATA
+
+
+def test_typed_results_match_sync_without_catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(census_catalog, "CATALOG_DIR", str(tmp_path / "catalogs"))
+    monkeypatch.setattr(census_catalog, "_catalogs", {})
+    urls = []
+
+    def fake_get(url, *args, **kwargs):
+        urls.append(url)
+        return Response()
+
+    async def fake_async_get(url, *args, **kwargs):
+        return fake_get(url)
+
+    monkeypatch.setattr(http_client, "get", fake_get)
+    monkeypatch.setattr(http_async, "get", fake_async_get)
+
+    sync = census.get_census_data(2022, "acs/acs5", DATA[0][:3], "state:*", use_cache=False)
+    result = asyncio.run(census_async.get_census_data(2022, "acs/acs5", DATA[0][:3], "state:*", use_cache=False))
+
+    pd.testing.assert_frame_equal(result, sync)
+    assert not any("variables.json" in url for url in urls)
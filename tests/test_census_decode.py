@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import census_catalog
+import census_decode
+
+VARIABLES = {
+    "NAME": {"label": "Geographic Area Name", "predicateType": "string", "group": "N/A"},
+    "B19013_001E": {"label": "Estimate!!Median household income", "predicateType": "int", "group": "B19013"},
+    "B19013_001M": {"label": "Margin of Error!!Median household income", "predicateType": "int", "group": "B19013"},
+}
+
+
+@pytest.fixture(autouse=True)
+def catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(census_catalog, "CATALOG_DIR", str(tmp_path))
+    monkeypatch.setattr(census_catalog, "_catalogs", {})
+    census_catalog.save_catalog(2022, "acs/acs5", VARIABLES)
+
+
+def test_sentinels():
+    raw = pd.DataFrame({
+        "NAME": ["A", "B", "C", "D"],
+        "B19013_001E": ["50000", "-666666666", "250001", "81000"],
+        "B19013_001M": ["1200", "-222222222", "-333333333", "-555555555"],
+        "state": ["17", "17", "18", "18"],
+    })
+    df = census_decode.decode_frame(raw, 2022, "acs/acs5")
+
+    assert str(df["B19013_001E"].dtype) == "Int32"
+    assert df["B19013_001E"].isna().tolist() == [False, True, False, False]
+    # Non-computable MOEs stay unknown; a controlled estimate's MOE is exactly 0
+    assert df["B19013_001M"].isna().tolist() == [False, True, True, False]
+    assert df["B19013_001M"].iloc[3] == 0
+    assert isinstance(df["state"].dtype, pd.CategoricalDtype)
+    assert df["NAME"].tolist() == ["A", "B", "C", "D"]
+
+
+def test_decode_response_keeps_index_and_columns():
+    data = [["NAME", "B19013_001E", "state"], ["A", "1", "17"], ["B", "", "18"]]
+    df = census_decode.decode_response(data, 2022, "acs/acs5")
+    assert list(df.columns) == ["NAME", "B19013_001E", "state"]
+    assert df["B19013_001E"].isna().tolist() == [False, True]
+    assert np.isclose(df["B19013_001E"].iloc[0], 1)
+
+
+def test_without_cached_catalog_uses_suffix_rule(tmp_path, monkeypatch):
+    monkeypatch.setattr(census_catalog, "CATALOG_DIR", str(tmp_path / "empty"))
+    monkeypatch.setattr(census_catalog, "_catalogs", {})
+
+    def no_download(*args, **kwargs):
+        raise AssertionError("decoding must not download the catalog")
+
+    monkeypatch.setattr(census_catalog, "get_catalog", no_download)
+    raw = pd.DataFrame({
+        "NAME": ["A", "B"],
+        "S1901_C01_012E": ["50000", "-666666666"],
+        "S1901_C01_012M": ["1200", "-555555555"],
+        "county": ["031", "043"],
+    })
+    df = census_decode.decode_frame(raw, 2022, "acs/acs5/subject")
+
+    assert df["S1901_C01_012E"].dtype == np.float32
+    assert df["S1901_C01_012E"].isna().tolist() == [False, True]
+    assert df["S1901_C01_012M"].tolist() == [1200.0, 0.0]
+    assert isinstance(df["county"].dtype, pd.CategoricalDtype)
+
+
+def test_non_acs_variables_without_catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(census_catalog, "CATALOG_DIR", str(tmp_path / "empty"))
+    monkeypatch.setattr(census_catalog, "_catalogs", {})
+    raw = pd.DataFrame({
+        "NAME": ["A", "B"],
+        "P1_001N": ["5194675", "-666666666"],
+        "POP_2021": ["12.5", "-555555555"],
+        "B01001_001EA": ["null", "-"],
+        "SUMLEVEL": ["050", "050"],
+        "county": ["031", "043"],
+        "state": ["17", "17"],
+    })
+    df = census_decode.decode_frame(raw, 2020, "dec/pl", census_decode.geography_columns("county:*", {"state": "17"}))
+
+    assert str(df["P1_001N"].dtype) == "Int32"
+    assert df["P1_001N"].isna().tolist() == [False, True]
+    # -555555555 only means "MOE is 0" in an MOE column
+    assert df["POP_2021"].iloc[0] == 12.5 and pd.isna(df["POP_2021"].iloc[1])
+    assert df["B01001_001EA"].tolist() == ["null", "-"]
+    assert df["SUMLEVEL"].tolist() == ["050", "050"]
+    assert isinstance(df["county"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["state"].dtype, pd.CategoricalDtype)
+
+
+def test_controlled_code_only_zeroes_moe_columns():
+    raw = pd.DataFrame({
+        "B19013_001E": ["-555555555", "50000"],
+        "B19013_001M": ["-555555555", "1200"],
+        "state": ["17", "18"],
+    })
+    df = census_decode.decode_frame(raw, 2022, "acs/acs5", ["state"])
+    assert df["B19013_001M"].tolist() == [0, 1200]
+    assert pd.isna(df["B19013_001E"].iloc[0])
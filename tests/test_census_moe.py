@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+import census_moe
+
+TRACTS = pd.DataFrame({
+    "county": ["031", "031", "031", "043"],
+    "hood": ["Loop", "Loop", "Uptown", "Loop"],
+    "B01003_001E": [100.0, 0.0, 50.0, 0.0],
+    "B01003_001M": [30.0, 20.0, 10.0, 0.0],
+})
+
+
+def test_moe_sum_zero_estimate_rule():
+    # Only the largest MOE among zero estimates counts
+    est = np.array([100.0, 0.0, 0.0])
+    moe = np.array([30.0, 20.0, 15.0])
+    assert census_moe.moe_sum(est, moe) == np.sqrt(30.0 ** 2 + 20.0 ** 2)
+
+
+def test_moe_sum_propagates_unknown_moe():
+    est = np.array([[100.0, 50.0], [100.0, 0.0], [100.0, 50.0]])
+    moe = np.array([[30.0, np.nan], [30.0, np.nan], [30.0, 0.0]])
+    result = census_moe.moe_sum(est, moe)
+    assert np.isnan(result[0]) and np.isnan(result[1])
+    assert result[2] == 30.0
+
+
+def test_aggregate_multiple_keys():
+    out = census_moe.aggregate(TRACTS, ["county", "hood"])
+
+    assert list(out.index) == [("031", "Loop"), ("031", "Uptown"), ("043", "Loop")]
+    assert out["B01003_001E"].tolist() == [100.0, 50.0, 0.0]
+    assert out.loc[("031", "Loop"), "B01003_001M"] == np.sqrt(30.0 ** 2 + 20.0 ** 2)
+    assert out.loc[("043", "Loop"), "B01003_001M"] == 0.0
+
+
+def test_aggregate_propagates_unknown_moe():
+    df = TRACTS.assign(B01003_001M=[30.0, 20.0, np.nan, 0.0])
+    out = census_moe.aggregate(df, "hood")
+
+    assert np.isnan(out.loc["Uptown", "B01003_001M"])
+    assert np.isnan(out.loc["Uptown", "B01003_001_CV"])
+    assert out.loc["Loop", "B01003_001M"] == np.sqrt(30.0 ** 2 + 20.0 ** 2)
+
+
+def test_pairs_profile_and_subject_codes():
+    df = pd.DataFrame({
+        "DP03_0062E": [70000.0], "DP03_0062M": [1500.0],
+        "DP03_0062PE": [12.5], "DP03_0062PM": [0.4],
+        "S1901_C01_012E": [65000.0], "S1901_C01_012M": [900.0],
+        "NAME": ["Cook County"],
+    })
+    assert census_moe.pair_columns(df) == {
+        "DP03_0062": ("DP03_0062E", "DP03_0062M"),
+        "DP03_0062P": ("DP03_0062PE", "DP03_0062PM"),
+        "S1901_C01_012": ("S1901_C01_012E", "S1901_C01_012M"),
+    }
+    assert "DP03_0062_CV" in census_moe.add_cv(df).columns
+
+
+def test_derived_estimates_feed_back_in():
+    df = census_moe.derive(TRACTS, "pop2", ["B01003_001"], kind="sum", scale=2)
+
+    assert {"pop2E", "pop2M", "pop2_CV"} <= set(df.columns)
+    assert "pop2" in census_moe.pair_columns(df)
+    assert "pop2_CV" in census_moe.add_cv(df.drop(columns="pop2_CV")).columns
+    out = census_moe.aggregate(df, "hood", ["pop2E"])
+    assert out.loc["Uptown", "pop2E"] == 100.0
+    assert out.loc["Uptown", "pop2M"] == 20.0
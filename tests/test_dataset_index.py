@@ -0,0 +1,43 @@
+import census_catalog
+from dataset_index import DatasetIndex, TokenIndex
+
+RECORDS = [
+    {"id": "ydr8-5enu", "name": "Building Permits", "description": "Permits issued", "columns": ["permit_type"]},
+    {"id": "abcd-1234", "name": "Permit Fees", "description": "Fees for building permits", "columns": []},
+    {"id": "wxyz-9876", "name": "Crimes", "description": "Reported incidents", "columns": ["ward"]},
+]
+
+
+def test_rank_requires_every_term_and_prefixes_last():
+    index = TokenIndex([[("median household income", 1.0)], [("household size", 1.0)], [("income", 1.0)]])
+
+    assert [i for i, _ in index.rank("household inc")] == [0]
+    assert [i for i, _ in index.rank("household")] == [0, 1]
+    assert index.rank("") == []
+
+
+def test_phrase_match_scores_double():
+    index = TokenIndex([[("household median income", 1.0)], [("median household income", 1.0)]])
+    (first, phrase_score), (_, other_score) = index.rank("median household")
+    assert first == 1 and phrase_score == 2 * other_score
+
+
+def test_dataset_search():
+    df = DatasetIndex(RECORDS).search("building permits")
+    # Name matches outweigh description matches
+    assert df["id"].tolist() == ["ydr8-5enu", "abcd-1234"]
+    assert df["score"].iloc[0] > df["score"].iloc[1]
+
+
+def test_variable_search_uses_same_ranking():
+    variables = {
+        "B25001_001E": {"label": "Estimate!!Total:", "concept": "HOUSING UNITS"},
+        "B25003_002E": {"label": "Estimate!!Total:!!Owner occupied", "concept": "TENURE"},
+        "B25003_003E": {"label": "Estimate!!Total:!!Renter occupied", "concept": "TENURE"},
+    }
+    catalog = census_catalog.VariableCatalog(variables)
+    index = TokenIndex([(v["label"], 1.0), (v["concept"], census_catalog.CONCEPT_WEIGHT)] for v in variables.values())
+
+    df = catalog.search("total occ")
+    assert df["variable"].tolist() == ["B25003_002E", "B25003_003E"]
+    assert df["score"].tolist() == [round(score, 3) for _, score in index.rank("total occ")]
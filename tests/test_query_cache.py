@@ -0,0 +1,88 @@
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import query_cache
+
+DF = pd.DataFrame({"ward": ["1", "2"], "n": [3, 4]})
+
+
+def _age(path, seconds):
+    """Backdate a cache file's write time (mtime), as the TTL check sees it."""
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_get_expires_after_ttl(tmp_path):
+    key = query_cache.cache_key("example.org", "abcd-1234", {"$limit": 2})
+    query_cache.put(key, DF, cache_dir=str(tmp_path))
+
+    pd.testing.assert_frame_equal(query_cache.get(key, ttl=60, cache_dir=str(tmp_path)), DF)
+    _age(query_cache._path(key, str(tmp_path)), 120)
+    assert query_cache.get(key, ttl=60, cache_dir=str(tmp_path)) is None
+    assert query_cache.get(key, ttl=300, cache_dir=str(tmp_path)) is not None
+
+
+def test_get_keeps_write_time(tmp_path):
+    key = query_cache.cache_key("example.org", "abcd-1234", None)
+    query_cache.put(key, DF, cache_dir=str(tmp_path))
+    path = query_cache._path(key, str(tmp_path))
+    _age(path, 100)
+
+    # A hit refreshes the access time (for LRU) but not the age used for the TTL
+    query_cache.get(key, ttl=300, cache_dir=str(tmp_path))
+    assert time.time() - os.path.getmtime(path) >= 100
+    assert time.time() - os.path.getatime(path) < 100
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    keys = [query_cache.cache_key("example.org", "abcd-1234", {"$offset": i}) for i in range(3)]
+    for i, key in enumerate(keys):
+        query_cache.put(key, DF, cache_dir=str(tmp_path))
+        path = query_cache._path(key, str(tmp_path))
+        os.utime(path, (time.time() - 100 + i, time.time()))
+
+    size = os.path.getsize(query_cache._path(keys[0], str(tmp_path)))
+    assert query_cache.evict(max_bytes=2 * size, cache_dir=str(tmp_path)) == 1
+    assert not os.path.exists(query_cache._path(keys[0], str(tmp_path)))
+    assert os.path.exists(query_cache._path(keys[2], str(tmp_path)))
+
+
+def test_cached_fetches_once_per_normalized_query(tmp_path, monkeypatch):
+    monkeypatch.setattr(query_cache, "get", functools.partial(query_cache.get, cache_dir=str(tmp_path)))
+    monkeypatch.setattr(query_cache, "put", functools.partial(query_cache.put, cache_dir=str(tmp_path)))
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return DF
+
+    query_cache.cached("example.org", "abcd-1234", {"$where": "a = 1", "$limit": 5}, fetch)
+    query_cache.cached("example.org", "abcd-1234", {"$limit": 5, "$where": "a = 1"}, fetch)
+    query_cache.cached("example.org", "abcd-1234", {"$limit": 5, "$where": "a = 1"}, fetch, ttl=-1)
+    assert len(calls) == 2
+
+
+def test_evict_skips_files_removed_concurrently(tmp_path, monkeypatch):
+    key = query_cache.cache_key("example.org", "abcd-1234", None)
+    query_cache.put(key, DF, cache_dir=str(tmp_path))
+    listdir = os.listdir
+    # Another eviction removed "gone.parquet" between our listdir and stat
+    monkeypatch.setattr(os, "listdir", lambda path: listdir(path) + ["gone.parquet"])
+
+    assert query_cache.evict(max_bytes=0, cache_dir=str(tmp_path)) == 1
+    assert query_cache.evict(max_bytes=0, cache_dir=str(tmp_path)) == 0
+
+
+def test_concurrent_puts_of_one_key(tmp_path):
+    key = query_cache.cache_key("example.org", "abcd-1234", None)
+    frames = [DF.assign(n=[i, i]) for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda df: query_cache.put(key, df, cache_dir=str(tmp_path)), frames))
+
+    hit = query_cache.get(key, cache_dir=str(tmp_path))
+    assert hit is not None and hit["n"].nunique() == 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
@@ -0,0 +1,53 @@
+import pytest
+
+import socrata
+import socrata_catalog
+
+COLUMNS = [{"fieldName": "ward", "name": "Ward", "dataTypeName": "text"}]
+
+
+@pytest.fixture(autouse=True)
+def catalog_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(socrata_catalog, "CATALOG_DIR", str(tmp_path))
+    monkeypatch.setattr(socrata_catalog, "_indexes", {})
+
+
+def test_get_schema_fetches_only_that_dataset(monkeypatch):
+    fetched = []
+
+    def get_metadata(domain, dataset_id):
+        fetched.append(dataset_id)
+        return {"columns": COLUMNS}
+
+    def sync_catalog(domain):
+        raise AssertionError("looking up one schema must not sync the catalog")
+
+    monkeypatch.setattr(socrata, "get_metadata", get_metadata)
+    monkeypatch.setattr(socrata_catalog, "sync_catalog", sync_catalog)
+
+    assert socrata_catalog.get_schema("example.org", "abcd-1234") == COLUMNS
+    assert socrata_catalog.get_schema("example.org", "abcd-1234") == COLUMNS
+    assert fetched == ["abcd-1234"]
+
+
+def test_resync_expires_schemas_with_newer_metadata(monkeypatch):
+    monkeypatch.setattr(socrata, "get_metadata", lambda domain, dataset_id: {"columns": COLUMNS})
+    socrata_catalog.prefetch_schemas("example.org", ["aaaa-1111", "bbbb-2222", "cccc-3333"])
+
+    listing = [
+        {"resource": {"id": "aaaa-1111", "name": "A", "metadata_updated_at": "2020-01-01T00:00:00.000Z"}},
+        {"resource": {"id": "bbbb-2222", "name": "B", "metadata_updated_at": "2999-01-01T00:00:00.000Z"}},
+    ]
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"results": listing}
+
+    monkeypatch.setattr(socrata_catalog.http_client, "get", lambda *args, **kwargs: Response())
+    socrata_catalog.sync_catalog("example.org")
+
+    # Changed since fetched (bbbb) or gone from the portal (cccc): fetched again on demand
+    assert list(socrata_catalog.load_catalog("example.org")["schemas"]) == ["aaaa-1111"]
@@ -0,0 +1,29 @@
+import pandas as pd
+
+import socrata
+import socrata_parallel
+
+# Each range comes back in :id order, not order-column order
+PAGES = {
+    "lo": pd.DataFrame({"id": ["a", "b", "c"], "amount": ["9", "10", "2"]}),
+    "hi": pd.DataFrame({"id": ["d", "e", "f"], "amount": ["100", None, "11"]}),
+}
+
+
+def test_fetch_parallel_sorts_by_order_column(monkeypatch):
+    monkeypatch.setattr(socrata_parallel, "plan_ranges", lambda *args, **kwargs: ["lo", "hi"])
+    monkeypatch.setattr(socrata, "get_all_pages", lambda domain, dataset_id, params, page_size: PAGES[params["$where"]])
+
+    df = socrata_parallel.fetch_parallel("example.org", "abcd-1234", order_column="amount")
+
+    assert df["id"].tolist() == ["c", "a", "b", "f", "d", "e"]
+    assert df.index.tolist() == list(range(6))
+
+
+def test_fetch_parallel_keeps_order_without_column(monkeypatch):
+    monkeypatch.setattr(socrata_parallel, "plan_ranges", lambda *args, **kwargs: ["lo", "hi"])
+    monkeypatch.setattr(socrata, "get_all_pages", lambda domain, dataset_id, params, page_size: PAGES[params["$where"]])
+
+    df = socrata_parallel.fetch_parallel("example.org", "abcd-1234", order_column=":id")
+
+    assert df["id"].tolist() == ["a", "b", "c", "d", "e", "f"]
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+import socrata
+import soql_local
+import socrata_rollup
+from socrata_rollup import Cube
+
+ROWS = pd.DataFrame({
+    ":id": [f"row-{i:04d}" for i in range(8)],
+    ":updated_at": ["2024-01-01T00:00:00.000"] * 8,
+    "primary_type": ["THEFT", "THEFT", "THEFT", "BATTERY", "BATTERY", "ASSAULT", "THEFT", "BATTERY"],
+    "ward": ["1", "2", "1", "1", "3", "2", "2", "1"],
+    "date": ["2024-01-05T10:00:00.000", "2024-01-05T11:00:00.000", "2024-01-06T09:00:00.000",
+             "2024-01-06T12:00:00.000", "2024-02-01T00:00:00.000", "2024-02-02T00:00:00.000",
+             "2024-02-03T00:00:00.000", "2024-02-03T05:00:00.000"],
+    "beat": ["111", "222", "111", "333", "444", "222", "222", "111"],
+})
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    def iter_pages(domain, dataset_id, params=None, page_size=1000, max_rows=None, typed=False):
+        df = ROWS if not params.get("$where") else soql_local.execute(ROWS, {"$where": params["$where"]})
+        yield df[[c.strip() for c in params["$select"].split(",")]].reset_index(drop=True)
+
+    def query_dataset(*args, **kwargs):
+        raise AssertionError("the cube should have answered without the API")
+
+    monkeypatch.setattr(socrata, "iter_pages", iter_pages)
+    monkeypatch.setattr(socrata, "query_dataset", query_dataset)
+    Cube("d", "crimes", "type_ward_day", ["primary_type", "ward", "date_trunc_ymd(date) AS day"],
+         values=["beat"], store_dir=str(tmp_path)).build()
+    return str(tmp_path)
+
+
+def test_count_by_dimension(store):
+    result = socrata_rollup.query("d", "crimes", {
+        "$select": "primary_type, count(*) AS n", "$group": "primary_type", "$order": "n DESC",
+    }, store_dir=store)
+    assert result.to_dict("list") == {"primary_type": ["THEFT", "BATTERY", "ASSAULT"], "n": [4, 3, 1]}
+
+
+def test_having_on_aggregate_alias(store):
+    result = socrata_rollup.query("d", "crimes", {
+        "$select": "primary_type, count(*) AS n",
+        "$group": "primary_type",
+        "$having": "n > 1",
+        "$order": "primary_type",
+    }, store_dir=store)
+    assert result.to_dict("list") == {"primary_type": ["BATTERY", "THEFT"], "n": [3, 4]}
+
+
+def test_rolls_up_values_and_dimension_alias(store):
+    result = socrata_rollup.query("d", "crimes", {
+        "$select": "ward, avg(beat) AS avg_beat, max(beat) AS top",
+        "$where": "day >= '2024-02-01'",
+        "$group": "ward",
+        "$having": "top > 200",
+        "$order": "ward",
+    }, store_dir=store)
+    assert result["ward"].tolist() == ["2", "3"]
+    assert result["avg_beat"].tolist() == [222.0, 444.0]
+
+
+def test_uncovered_order_falls_back_typed(store, monkeypatch):
+    calls = []
+
+    def query_dataset(domain, dataset_id, params, **kwargs):
+        calls.append(kwargs)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(socrata, "query_dataset", query_dataset)
+    params = {"$select": "primary_type, count(*) AS n", "$group": "primary_type", "$order": "date"}
+    cube = Cube.load("d", "crimes", "type_ward_day", store)
+    assert not cube.covers(cube._parse(params))
+    socrata_rollup.query("d", "crimes", params, store_dir=store, use_cache=False)
+    assert calls == [{"use_cache": False, "typed": True}]
@@ -0,0 +1,46 @@
+from datetime import date
+
+import pytest
+
+import socrata_catalog
+from soql import Query
+
+SCHEMA = [
+    {"fieldName": "primary_type", "dataTypeName": "text"},
+    {"fieldName": "ward", "dataTypeName": "number"},
+    {"fieldName": "date", "dataTypeName": "floating_timestamp"},
+]
+
+
+@pytest.fixture(autouse=True)
+def schema(monkeypatch):
+    monkeypatch.setattr(socrata_catalog, "get_schema", lambda domain, dataset_id: SCHEMA)
+
+
+def test_where_quotes_by_datatype():
+    params = (Query("example.org", "abcd-1234")
+              .where("ward", "==", "3")
+              .where("primary_type", "in", ["THEFT", "BATTERY"])
+              .params())
+    assert params["$where"] == "(`primary_type` IN ('BATTERY', 'THEFT')) AND (`ward` = 3)"
+
+
+def test_having_formats_values_like_where():
+    q = (Query("example.org", "abcd-1234")
+         .group("primary_type")
+         .agg(total=("*", "count"), first=("date", "min"), top=("primary_type", "max"))
+         .having("total", ">", "10")
+         .having("first", ">=", date(2024, 1, 1))
+         .having("top", "!=", "O'HARE"))
+    having = q.params()["$having"]
+    assert "count(*) > 10" in having
+    assert "min(`date`) >= '2024-01-01T00:00:00'" in having
+    assert "max(`primary_type`) != 'O''HARE'" in having
+
+
+def test_having_without_schema():
+    q = (Query("example.org", "abcd-1234", validate=False)
+         .group("ward")
+         .agg(total=("*", "count"))
+         .having("total", ">", 2.5))
+    assert q.params()["$having"] == "count(*) > 2.5"
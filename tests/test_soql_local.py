@@ -0,0 +1,117 @@
+import pandas as pd
+import pytest
+
+import soql_local
+
+
+@pytest.fixture
+def crimes():
+    return pd.DataFrame({
+        "primary_type": ["THEFT", "THEFT", "BATTERY", "ASSAULT", "BATTERY", "THEFT"],
+        "ward": [1, 2, 1, 3, 2, 1],
+        "amount": [10.0, 20.0, 5.0, None, 15.0, 30.0],
+        "date": pd.to_datetime(["2024-01-05", "2024-02-01", "2024-01-20", "2023-12-31", "2024-03-10", "2024-03-11"]),
+    })
+
+
+def test_select_where_order_limit(crimes):
+    result = soql_local.execute(crimes, {
+        "$select": "primary_type, ward, amount",
+        "$where": "amount > 5 AND primary_type IN ('THEFT', 'BATTERY')",
+        "$order": "amount DESC",
+        "$limit": 2,
+    })
+    assert list(result.columns) == ["primary_type", "ward", "amount"]
+    assert result["amount"].tolist() == [30.0, 20.0]
+
+
+def test_group_names_unaliased_aggregates(crimes):
+    result = soql_local.execute(crimes, {
+        "$select": "primary_type, count(*), sum(amount)",
+        "$group": "primary_type",
+        "$order": "primary_type",
+    })
+    assert list(result.columns) == ["primary_type", "count", "sum_amount"]
+    assert result["count"].tolist() == [1, 2, 3]
+    assert result["sum_amount"].tolist()[1:] == [20.0, 60.0]
+
+
+def test_having_on_aggregate_alias(crimes):
+    result = soql_local.execute(crimes, {
+        "$select": "primary_type, sum(amount) AS total",
+        "$group": "primary_type",
+        "$having": "total > 25",
+        "$order": "primary_type",
+    })
+    assert result.to_dict("list") == {"primary_type": ["THEFT"], "total": [60.0]}
+
+
+def test_aliases_nested_in_having_and_order(crimes):
+    result = soql_local.execute(crimes, {
+        "$select": "primary_type, sum(amount) AS total, count(*) AS n",
+        "$group": "primary_type",
+        "$having": "total >= 10 * n",
+        "$order": "total - n DESC",
+    })
+    assert result["primary_type"].tolist() == ["THEFT", "BATTERY"]
+
+
+def test_group_by_expression_alias(crimes):
+    result = soql_local.execute(crimes, {
+        "$select": "date_trunc_y(date) AS year, count(*) AS n",
+        "$group": "year",
+        "$order": "year",
+    })
+    assert result["n"].tolist() == [1, 5]
+    assert result["year"].dt.year.tolist() == [2023, 2024]
+
+
+def test_alias_does_not_shadow_real_column(crimes):
+    # `ward` is a column, so $where and $order keep meaning the column
+    result = soql_local.execute(crimes, {
+        "$select": "primary_type, ward * 10 AS ward",
+        "$where": "ward = 1",
+        "$order": "ward",
+    })
+    assert result["ward"].tolist() == [10, 10, 10]
+
+
+def test_unknown_column_raises(crimes):
+    with pytest.raises(ValueError, match="No column 'nope'"):
+        soql_local.execute(crimes, {"$where": "nope > 1"})
+
+
+def test_not_keeps_null_unknown():
+    df = pd.DataFrame({"id": ["a", "b", "c", "d"], "n": [1.0, 5.0, None, 3.0]})
+
+    assert soql_local.execute(df, {"$where": "NOT (n > 4)"})["id"].tolist() == ["a", "d"]
+    assert soql_local.execute(df, {"$where": "NOT (n > 4) OR id = 'c'"})["id"].tolist() == ["a", "c", "d"]
+    assert soql_local.execute(df, {"$where": "n NOT IN (1, 5)"})["id"].tolist() == ["d"]
+    assert soql_local.execute(df, {"$where": "n IS NULL OR n < 2"})["id"].tolist() == ["a", "c"]
+
+
+def test_snapshot_typed_by_schema(monkeypatch):
+    raw = pd.DataFrame({
+        ":id": ["row-1", "row-2"],
+        "beat": ["0111", "0222"],
+        "district": ["001", "002"],
+        "amount": ["12.50", "100"],
+        "date": ["2024-01-05T10:00:00.000", "2024-02-01T00:00:00.000"],
+    })
+    schema = [
+        {"fieldName": "beat", "dataTypeName": "text"},
+        {"fieldName": "district", "dataTypeName": "text"},
+        {"fieldName": "amount", "dataTypeName": "number"},
+        {"fieldName": "date", "dataTypeName": "floating_timestamp"},
+    ]
+    monkeypatch.setattr(soql_local.socrata_sync, "load_snapshot", lambda *args, **kwargs: raw)
+    monkeypatch.setattr(soql_local.socrata_catalog, "get_schema", lambda domain, dataset_id: schema)
+
+    engine = soql_local.LocalEngine()
+    table = engine.register_snapshot("example.org", "abcd-1234", name="t")
+
+    assert table["beat"].tolist() == ["0111", "0222"]
+    assert table["district"].tolist() == ["001", "002"]
+    assert table["amount"].tolist() == [12.5, 100.0]
+    assert pd.api.types.is_datetime64_any_dtype(table["date"])
+    assert engine.query("t", {"$where": "beat = '0111' AND amount < 50"})[":id"].tolist() == ["row-1"]